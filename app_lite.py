@@ -1,5 +1,7 @@
 import streamlit as st
 
+from castelo.regras import REPROVADO, avaliar
+
 st.set_page_config(page_title="Castelo Forte", page_icon="🏰", layout="centered")
 
 # CSS Limpo
@@ -42,12 +44,14 @@ menu = st.radio("Menu", ["Oráculo VFP", "Planos"])
 if menu == "Oráculo VFP":
     st.header("🔮 Oráculo")
     st.markdown("O sistema que previne a ruína antes dela acontecer.")
+    renda = st.number_input("Renda Mensal (R$)", value=10000.0)
     val = st.number_input("Valor da Compra (R$)", 0.0)
     if st.button("Consultar Guardião"):
-        if val > 2000:
-            st.error("🚫 BLOQUEADO: Risco ao Castelo detectado.")
+        veredito = avaliar(val, renda)
+        if veredito.status == REPROVADO:
+            st.error(f"🚫 BLOQUEADO: Risco ao Castelo detectado. {veredito.mensagem}")
         else:
-            st.success("✅ APROVADO: Compra segura.")
+            st.success(f"✅ {veredito.status}: {veredito.mensagem}")
 
 elif menu == "Planos":
     st.header("💎 Planos")
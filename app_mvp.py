@@ -2,11 +2,16 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 
+from castelo.categorias import Categorizador
+from castelo.importador import AgregadorFalso, IndiceHashes, Importador, ler_pluggy
+from castelo.ledger import Ledger
+from castelo.regras import REPROVADO, avaliar
+
 # --- CONFIGURAÇÃO DA PÁGINA ---
 st.set_page_config(
     page_title="Castelo Forte",
     page_icon="🏰",
-    layout="mobile",
+    layout="centered",
     initial_sidebar_state="collapsed"
 )
 
@@ -22,8 +27,9 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- STATE ---
-if 'data' not in st.session_state:
-    st.session_state.data = pd.DataFrame(columns=['Data', 'Descrição', 'Categoria', 'Valor', 'Tipo'])
+if 'ledger' not in st.session_state:
+    st.session_state.ledger = Ledger()
+    st.session_state.hashes = IndiceHashes(st.session_state.ledger)
 if 'plano_atual' not in st.session_state:
     st.session_state.plano_atual = "Castelo Digital (App)"
 
@@ -38,7 +44,10 @@ if menu == "🏰 Dashboard":
     # Simulação Pluggy
     if st.button("🔗 Conectar Conta Bancária (Pluggy)"):
         st.toast("Iniciando conexão segura com Pluggy...", icon="🔒")
-        st.info("Aqui abrirá o widget da Pluggy para o cliente digitar a senha do banco.")
+        # Agregador local no lugar da Pluggy até a integração real.
+        importador = Importador(st.session_state.ledger, st.session_state.hashes, Categorizador(usar_modelo=False))
+        stats = importador.importar(ler_pluggy(AgregadorFalso(), "conta-demo"))
+        st.info(f"{stats['inseridas']} transações sincronizadas ({stats['duplicadas']} já existiam).")
     
     st.markdown("---")
     
@@ -58,7 +67,11 @@ if menu == "🏰 Dashboard":
 # --- PÁGINA 2: LANÇAMENTOS ---
 elif menu == "💰 Lançamentos":
     st.title("Extrato Unificado")
-    st.info("💡 Com o Pluggy conectado, seus gastos aparecerão aqui automaticamente.")
+    ledger = st.session_state.ledger
+    if len(ledger):
+        st.dataframe(ledger.to_frame(recentes_primeiro=True), use_container_width=True, height=400)
+    else:
+        st.info("💡 Com o Pluggy conectado, seus gastos aparecerão aqui automaticamente.")
     
     with st.expander("Adicionar Manualmente"):
         with st.form("manual"):
@@ -74,11 +87,12 @@ elif menu == "🔮 Oráculo VFP":
     renda = st.number_input("Renda Mensal", value=10000.0)
     parcela = st.number_input("Parcela do Projeto", value=3500.0)
     if st.button("Analisar"):
-        comp = (parcela/renda)*100
-        if comp > 30:
-            st.error(f"❌ Risco Alto: {comp}% da renda comprometida.")
+        veredito = avaliar(parcela, renda)
+        comp = veredito.impacto_parcela
+        if veredito.status == REPROVADO:
+            st.error(f"❌ Risco Alto: {comp:.1f}% da renda comprometida.")
         else:
-            st.success(f"✅ Aprovado: {comp}% da renda.")
+            st.success(f"✅ Aprovado: {comp:.1f}% da renda.")
 
 # --- PÁGINA 4: VITRINE DE PLANOS (UPSELL) ---
 elif menu == "💎 Planos & Serviços":
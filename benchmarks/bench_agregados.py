@@ -0,0 +1,53 @@
+# Leitura dos KPIs do dashboard: agregados mantidos vs. máscaras/groupby por rerun.
+#
+#   python benchmarks/bench_agregados.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench_ledger import lote  # noqa: E402
+from castelo.agregados import Agregados  # noqa: E402
+from castelo.ledger import Ledger  # noqa: E402
+
+TAMANHOS = [10_000, 100_000, 1_000_000]
+REPS = 20
+
+
+def recalculo_completo(df):
+    receitas = df[df['Valor'] > 0]['Valor'].sum()
+    despesas = abs(df[df['Valor'] < 0]['Valor'].sum())
+    df_despesas = df[df['Valor'] < 0].copy()
+    df_despesas['Valor'] = df_despesas['Valor'].abs()
+    return receitas, despesas, df_despesas.groupby("Categoria")['Valor'].sum()
+
+
+def leitura_agregada(agg):
+    return agg.receitas(), agg.despesas(), agg.gastos_por_categoria()
+
+
+def cronometrar(fn, *args):
+    t0 = time.perf_counter()
+    for _ in range(REPS):
+        fn(*args)
+    return (time.perf_counter() - t0) / REPS * 1e3
+
+
+def main():
+    print(f"{'linhas':>10} | {'recálculo (ms)':>15} | {'agregados (ms)':>15} | conferência")
+    for n in TAMANHOS:
+        ledger = Ledger()
+        agg = Agregados(ledger)
+        ledger.extend(lote(n))
+        for i in range(100):
+            ledger.append("2026-02-06", "Uber", "Transporte", -24.90, "Nubank", "Pago")
+
+        t_full = cronometrar(recalculo_completo, ledger.to_frame())
+        t_agg = cronometrar(leitura_agregada, agg)
+        status = "ok" if not agg.conferir(ledger) else "DIVERGENTE"
+        print(f"{n:>10,} | {t_full:>15.2f} | {t_agg:>15.4f} | {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Partida a frio e latência por tela sobre 1M de transações sintéticas no SQLite.
+#
+#   python benchmarks/bench_armazenamento.py [linhas]
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench_ledger import lote  # noqa: E402
+from castelo.armazenamento import Armazenamento  # noqa: E402
+
+
+def medir(rotulo, fn):
+    t0 = time.perf_counter()
+    resultado = fn()
+    print(f"  {rotulo:<42} {(time.perf_counter() - t0) * 1e3:>10.1f} ms")
+    return resultado
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "bench.db")
+        arm = Armazenamento(caminho)
+        print(f"{n:,} transações")
+        medir("carga inicial (inserir em lote)", lambda: arm.inserir(lote(n)))
+        arm.fechar()
+
+        print("partida a frio")
+        arm = medir("abrir banco", lambda: Armazenamento(caminho))
+        medir("agregados do dashboard (tabela totais)", arm.carregar_agregados)
+        inicio, fim = medir("período do extrato (MIN/MAX)", arm.periodo)
+
+        print("consultas por tela")
+        ultimo_mes = fim - __import__("pandas").Timedelta(days=30)
+        df = medir("extrato: último mês", lambda: arm.consultar(ultimo_mes, fim))
+        print(f"    -> {len(df):,} linhas")
+        df = medir("extrato: último mês, conta Nubank", lambda: arm.consultar(ultimo_mes, fim, conta="Nubank"))
+        print(f"    -> {len(df):,} linhas")
+        medir("extrato: categoria Lazer (tudo)", lambda: arm.consultar(categoria="Lazer"))
+
+        print("materialização completa")
+        medir("carregar_ledger (SQLite)", arm.carregar_ledger)
+        try:
+            snapshot = os.path.join(pasta, "bench.parquet")
+            medir("salvar_snapshot (Parquet)", lambda: arm.salvar_snapshot(snapshot))
+            medir("carregar_snapshot (Parquet)", lambda: arm.carregar_snapshot(snapshot))
+        except ImportError:
+            print("  pyarrow ausente: snapshot Parquet ignorado")
+        arm.fechar()
+
+
+if __name__ == "__main__":
+    main()
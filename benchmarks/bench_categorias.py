@@ -0,0 +1,79 @@
+# Categorizador automático: acurácia por camada e vazão (linhas/s) num corpus sintético.
+#
+#   python benchmarks/bench_categorias.py [linhas]
+#
+# O corpus mistura lojas cobertas pelas palavras-chave, lojas locais que só o
+# histórico do usuário conhece e filiais novas dessas lojas (só o modelo acerta).
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from castelo.categorias import Categorizador  # noqa: E402
+
+LOJAS = {
+    "UBER *TRIP": "Transporte", "99APP *CORRIDA": "Transporte", "POSTO IPIRANGA": "Transporte",
+    "NETFLIX.COM": "Lazer", "SPOTIFY BR": "Lazer", "CINEMARK": "Lazer",
+    "SUPERMERCADO EXTRA": "Alimentação", "IFOOD *PEDIDO": "Alimentação", "PADARIA REAL": "Alimentação",
+    "DROGASIL": "Saúde", "DROGA RAIA": "Saúde",
+    "ALUGUEL APTO": "Moradia", "ENEL SP": "Moradia",
+    # Lojas locais: nenhuma palavra-chave, só o histórico resolve.
+    "EMPORIO DONA ROSA": "Alimentação", "ARMAZEM BOM PRECO": "Alimentação", "BAR DO TONHO": "Lazer",
+    "AUTO ELETRICA SILVA": "Transporte", "ODONTO SORRISO": "Saúde", "IMOBILIARIA LAR": "Moradia",
+}
+CIDADES = np.array(["SAO PAULO", "CAMPINAS", "SANTOS", "BH", ""], dtype=object)
+FILIAIS = np.array(["CENTRO", "SHOPPING", "NORTE", "SUL", "EXPRESS"], dtype=object)
+
+
+def corpus(n, semente=0):
+    rng = np.random.default_rng(semente)
+    nomes = np.array(list(LOJAS), dtype=object)
+    cats = np.array(list(LOJAS.values()), dtype=object)
+    idx = rng.integers(0, len(nomes), n)
+    codigo = pd.Series(rng.integers(0, 10_000, n)).astype(str).to_numpy(dtype=object)
+    cidade = CIDADES[rng.integers(0, len(CIDADES), n)]
+    descr = nomes[idx] + " " + codigo + " " + cidade
+    # ~20% das linhas são filiais que não aparecem no histórico.
+    filial = rng.random(n) < 0.2
+    descr[filial] = nomes[idx[filial]] + " " + FILIAIS[rng.integers(0, len(FILIAIS), filial.sum())]
+    return descr, cats[idx], filial
+
+
+def medir(rotulo, cat, descr, verdade):
+    t0 = time.perf_counter()
+    prev = cat(descr)
+    frio = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    cat(descr)
+    quente = time.perf_counter() - t0
+    acerto = (prev == verdade).mean()
+    print(f"{rotulo:<28} acurácia {acerto:6.1%}  frio {len(descr) / frio:>12,.0f} linhas/s  "
+          f"cache {len(descr) / quente:>12,.0f} linhas/s")
+    return prev
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    hist_descr, hist_cat, hist_filial = corpus(50_000, semente=1)
+    # O histórico só tem as lojas "de sempre"; as filiais novas ficam para o teste.
+    hist_descr, hist_cat = hist_descr[~hist_filial], hist_cat[~hist_filial]
+    descr, verdade, filial = corpus(n)
+    distintas = len(pd.unique(descr))
+    print(f"{n:,} linhas, {distintas:,} descrições distintas; histórico de {len(hist_descr):,} linhas")
+
+    medir("palavras-chave", Categorizador(usar_modelo=False), descr, verdade)
+    medir("+ tabela do histórico", Categorizador(usar_modelo=False).treinar(hist_descr, hist_cat), descr, verdade)
+    t0 = time.perf_counter()
+    completo = Categorizador().treinar(hist_descr, hist_cat)
+    print(f"treino (tabela + modelo): {(time.perf_counter() - t0) * 1e3:.0f} ms, "
+          f"{len(completo.tabela):,} descrições, {len(completo.modelo):,} palavras")
+    prev = medir("+ modelo local", completo, descr, verdade)
+    print(f"filiais novas: acurácia {(prev[filial] == verdade[filial]).mean():.1%}")
+    print(f"camadas (descrições distintas): {completo.metricas}")
+
+
+if __name__ == "__main__":
+    main()
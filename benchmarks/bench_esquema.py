@@ -0,0 +1,51 @@
+# Bytes por linha do extrato: esquema antigo (object/float64) vs. tipado.
+#
+#   python benchmarks/bench_esquema.py [linhas,...]
+#
+# "antes" é o DataFrame de colunas object e Valor float64, como o extrato era
+# guardado, medido com memory_usage(deep=True) a partir das linhas lidas do
+# SQLite (um objeto str por célula, como o sqlite3 devolve). "depois" é o
+# Ledger tipado (códigos int32 + dicionários, centavos int64) e o DataFrame
+# categórico que ele entrega às telas. A última coluna é o erro da soma em
+# float64 das receitas em relação à soma exata em centavos.
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from gerador import gravar  # noqa: E402
+from castelo.agregados import Agregados  # noqa: E402
+from castelo.armazenamento import Armazenamento  # noqa: E402
+from castelo.ledger import CATEGORICAS  # noqa: E402
+
+TAMANHOS = [100_000, 1_000_000]
+
+
+def main():
+    tamanhos = [int(x) for x in sys.argv[1].split(",")] if len(sys.argv) > 1 else TAMANHOS
+    print(f"{'linhas':>10} | {'antes (B/linha)':>15} | {'Ledger (B/linha)':>16} | {'frame categórico':>16} | "
+          f"{'carga (s)':>9} | erro float (centavos)")
+    for n in tamanhos:
+        with tempfile.TemporaryDirectory() as pasta:
+            arm = Armazenamento(gravar(os.path.join(pasta, "bench.db"), n))
+            antes = arm.consultar()
+            antes = antes.astype({c: object for c in CATEGORICAS})
+            t0 = time.perf_counter()
+            ledger = arm.carregar_ledger()
+            carga = time.perf_counter() - t0
+            arm.fechar()
+        b_antes = antes.memory_usage(deep=True, index=False).sum() / n
+        b_ledger = ledger.memoria() / n
+        b_frame = ledger.to_frame().memory_usage(deep=True, index=False).sum() / n
+        agg = Agregados(ledger)
+        valores = antes["Valor"].to_numpy()
+        soma_float = 0.0
+        for v in valores[valores > 0].tolist():
+            soma_float += v
+        erro = abs(soma_float - agg.receitas()) * 100
+        print(f"{n:>10,} | {b_antes:>15.1f} | {b_ledger:>16.1f} | {b_frame:>16.1f} | {carga:>9.2f} | {erro:.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# Exportação em lote (castelo.exportacao) para muitos clientes sintéticos.
+#
+#   python benchmarks/bench_exportacao.py [--clientes 1000] [--linhas 5000] [--processos 1,4]
+#       [--formatos parquet,csv,relatorio] [--todos] [--dados /tmp/castelo-bench-clientes]
+#
+# Os bancos dos clientes (gerador.gravar, uma semente por cliente) ficam em
+# cache em --dados. Cada configuração do pool roda num processo próprio, do
+# qual sai o pico de memória: o maior RSS entre o processo principal e os
+# trabalhadores. "cliente p50/p95" é o tempo de um cliente dentro do trabalhador.
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+from gerador import gravar  # noqa: E402
+from castelo.exportacao import FORMATOS, bancos, estatico_disponivel, exportar_lote  # noqa: E402
+
+
+def _gravar(tarefa, linhas):
+    caminho, semente = tarefa
+    return gravar(caminho, linhas, semente)
+
+
+def clientes(pasta, n, linhas):
+    # Gera em paralelo só os bancos que ainda não estão no cache.
+    os.makedirs(pasta, exist_ok=True)
+    caminhos = [os.path.join(pasta, f"castelo-{linhas}-{i:05d}.db") for i in range(n)]
+    faltando = [(c, i) for i, c in enumerate(caminhos) if not os.path.exists(c)]
+    if faltando:
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor() as pool:
+            list(pool.map(partial(_gravar, linhas=linhas), faltando, chunksize=16))
+        print(f"{len(faltando)} bancos gerados em {time.perf_counter() - t0:.0f} s ({pasta})")
+    return caminhos
+
+
+def medir(pasta, n, linhas, processos, formatos, todos):
+    caminhos = bancos([pasta])
+    caminhos = [c for c in caminhos if os.path.basename(c).startswith(f"castelo-{linhas}-")][:n]
+    saida = tempfile.mkdtemp(prefix="castelo-exportacao-")
+    try:
+        t0 = time.perf_counter()
+        resultados = list(exportar_lote(caminhos, saida, processos, todos=todos, formatos=formatos))
+        segundos = time.perf_counter() - t0
+    finally:
+        shutil.rmtree(saida)
+    proprio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    filhos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    por_cliente = [r["segundos"] for r in resultados if not r["erro"]]
+    return {
+        "segundos": segundos,
+        "linhas": sum(r["linhas"] for r in resultados),
+        "meses": sum(r["meses"] for r in resultados),
+        "mb": sum(r["bytes"] for r in resultados) / 2**20,
+        "cliente_p50_ms": float(np.percentile(por_cliente, 50)) * 1e3 if por_cliente else 0.0,
+        "cliente_p95_ms": float(np.percentile(por_cliente, 95)) * 1e3 if por_cliente else 0.0,
+        "pico_mb": max(proprio, filhos) / 1024,
+        "erros": [r["erro"] for r in resultados if r["erro"]],
+    }
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--filho":
+        pasta, n, linhas, processos, formatos, todos = sys.argv[2:8]
+        print(json.dumps(medir(pasta, int(n), int(linhas), int(processos), tuple(formatos.split(",")), todos == "1")))
+        return
+
+    p = argparse.ArgumentParser(description="Vazão da exportação mensal em lote.")
+    p.add_argument("--clientes", type=int, default=1000)
+    p.add_argument("--linhas", type=int, default=5000)
+    p.add_argument("--processos", default=f"1,{os.cpu_count() or 1}")
+    p.add_argument("--formatos", default=",".join(FORMATOS))
+    p.add_argument("--todos", action="store_true", help="todos os meses de cada cliente, não só o último")
+    p.add_argument("--dados", default=os.path.join(tempfile.gettempdir(), "castelo-bench-clientes"))
+    args = p.parse_args()
+
+    clientes(args.dados, args.clientes, args.linhas)
+    relatorio = "HTML" if not estatico_disponivel() else "PDF+PNG"
+    print(f"{args.clientes} clientes × {args.linhas:,} linhas · {args.formatos} · relatório em {relatorio} · "
+          f"{'todos os meses' if args.todos else 'último mês'}")
+    print(f"{'processos':>9} {'total':>8} {'clientes/s':>11} {'linhas/s':>10} {'saída':>9} "
+          f"{'cliente p50':>12} {'p95':>8} {'pico':>8}")
+    falhou = False
+    for processos in dict.fromkeys(int(x) for x in args.processos.split(",")):
+        saida = subprocess.run(
+            [sys.executable, __file__, "--filho", args.dados, str(args.clientes), str(args.linhas),
+             str(processos), args.formatos, "1" if args.todos else "0"],
+            capture_output=True, text=True, cwd=RAIZ,
+        )
+        if saida.returncode != 0:
+            print(f"{processos:>9} ERRO: {saida.stderr.strip().splitlines()[-1:]}")
+            falhou = True
+            continue
+        m = json.loads(saida.stdout.strip().splitlines()[-1])
+        erro = f"  {len(m['erros'])} erros: {m['erros'][0]}" if m["erros"] else ""
+        falhou = falhou or bool(m["erros"])
+        print(f"{processos:>9} {m['segundos']:>7.1f}s {args.clientes / m['segundos']:>11.1f} "
+              f"{m['linhas'] / m['segundos']:>10,.0f} {m['mb']:>7.0f}MB {m['cliente_p50_ms']:>10.0f}ms "
+              f"{m['cliente_p95_ms']:>6.0f}ms {m['pico_mb']:>6.0f}MB{erro}", flush=True)
+    sys.exit(1 if falhou else 0)
+
+
+if __name__ == "__main__":
+    main()
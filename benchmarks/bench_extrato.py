@@ -0,0 +1,54 @@
+# Extrato paginado vs. estilizar o DataFrame inteiro célula a célula.
+#
+#   python benchmarks/bench_extrato.py
+#
+# Reporta tempo de preparo do Styler (incluindo o render para HTML, que força
+# o cálculo dos estilos) e o payload Arrow enviado ao navegador.
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench_ledger import lote  # noqa: E402
+from castelo.extrato import PaginasExtrato, tamanho_payload  # noqa: E402
+from castelo.indices import IndicesExtrato  # noqa: E402
+from castelo.ledger import Ledger  # noqa: E402
+
+TAMANHOS = [10_000, 100_000]
+PAGINA = 50
+
+
+def color_val(val):
+    color = '#e74c3c' if val < 0 else '#2ecc71'
+    return f'color: {color}; font-weight: bold;'
+
+
+def main():
+    print(f"{'linhas':>8} | {'modo':<18} | {'preparo (ms)':>12} | {'payload (KB)':>12}")
+    for n in TAMANHOS:
+        ledger = Ledger()
+        ledger.extend(lote(n))
+        posicoes = IndicesExtrato(ledger).filtrar()
+
+        df = ledger.take(posicoes)
+        t0 = time.perf_counter()
+        df.style.map(color_val, subset=['Valor'])._compute()
+        t_full = (time.perf_counter() - t0) * 1e3
+        print(f"{n:>8,} | {'completo (map)':<18} | {t_full:>12.1f} | {tamanho_payload(df) / 1024:>12.1f}")
+
+        paginas = PaginasExtrato()
+        t0 = time.perf_counter()
+        pag = paginas.pagina(ledger, posicoes, (), 1, PAGINA)
+        pag["styler"]._compute()
+        t_pag = (time.perf_counter() - t0) * 1e3
+        print(f"{n:>8,} | {f'página ({PAGINA})':<18} | {t_pag:>12.2f} | {pag['payload'] / 1024:>12.1f}")
+
+        t0 = time.perf_counter()
+        paginas.pagina(ledger, posicoes, (), 1, PAGINA)
+        t_hit = (time.perf_counter() - t0) * 1e3
+        print(f"{n:>8,} | {'página (cache)':<18} | {t_hit:>12.3f} | {pag['payload'] / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Motor de faturas: carga inicial, inclusões incrementais e consulta por cartão.
+#
+#   python benchmarks/bench_faturas.py [linhas]
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench_ledger import lote  # noqa: E402
+from castelo.faturas import Faturas  # noqa: E402
+from castelo.ledger import Ledger  # noqa: E402
+
+CARDS = [
+    {"nome": "Nubank Roxinho", "limite": 15000.0, "fechamento": 5, "vencimento": 12, "conta": "Nubank"},
+    {"nome": "Itaú Black", "limite": 35000.0, "fechamento": 20, "vencimento": 28, "conta": "Itaú"},
+]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    dados = lote(n)
+    rng = np.random.default_rng(0)
+    # ~5% das compras parceladas, como vêm na fatura ("LOJA 01/10").
+    parcelada = rng.random(n) < 0.05
+    total = rng.integers(2, 13, parcelada.sum())
+    dados["Descrição"] = dados["Descrição"].copy()
+    dados["Descrição"][parcelada] = dados["Descrição"][parcelada] + np.char.add(" 01/", np.char.zfill(total.astype(str), 2)).astype(object)
+
+    ledger = Ledger()
+    t0 = time.perf_counter()
+    faturas = Faturas(CARDS, ledger)
+    ledger.extend(dados)
+    dt = time.perf_counter() - t0
+    print(f"carga de {n:,} linhas: {dt * 1e3:.0f} ms ({n / dt:,.0f} linhas/s)")
+
+    reps = 1_000
+    t0 = time.perf_counter()
+    for i in range(reps):
+        ledger.append(np.datetime64("2026-02-10"), f"Compra {i}", "Lazer", -10.0, conta="Nubank")
+    print(f"inclusão unitária: {(time.perf_counter() - t0) / reps * 1e6:.1f} µs")
+
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        for card in CARDS:
+            faturas.resumo(card["nome"], "2026-02-18")
+    print(f"resumo por cartão: {(time.perf_counter() - t0) / reps / len(CARDS) * 1e6:.1f} µs "
+          f"(independe das {len(ledger):,} linhas)")
+    print(faturas.resumo("Nubank Roxinho", "2026-02-18"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Caminho de filtro do extrato: índices vs. máscara booleana sobre o DataFrame.
+#
+#   python benchmarks/bench_filtros.py
+#
+# No fim, o custo de manter os índices a cada inclusão manual (Ledger.append),
+# com data em ordem e atrasada; deve ficar estável com o tamanho do extrato.
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench_ledger import lote  # noqa: E402
+from castelo.indices import IndicesExtrato  # noqa: E402
+from castelo.ledger import Ledger  # noqa: E402
+
+TAMANHOS = [10_000, 100_000, 1_000_000]
+REPS = 20
+INCLUSOES = 2000
+
+
+def mascara(df, inicio, fim, conta, categoria):
+    m = (df["Data"] >= inicio) & (df["Data"] < fim)
+    if conta:
+        m &= df["Conta"] == conta
+    if categoria:
+        m &= df["Categoria"] == categoria
+    return df[m].sort_values("Data", ascending=False)
+
+
+def cronometrar(fn):
+    t0 = time.perf_counter()
+    for _ in range(REPS):
+        resultado = fn()
+    return (time.perf_counter() - t0) / REPS * 1e3, len(resultado)
+
+
+def main():
+    cenarios = [
+        ("1 semana", pd.Timedelta(days=7), None, None),
+        ("1 semana, Nubank, Lazer", pd.Timedelta(days=7), "Nubank", "Lazer"),
+        ("1 ano, Lazer", pd.Timedelta(days=365), None, "Lazer"),
+    ]
+    print(f"{'linhas':>10} | {'cenário':<24} | {'resultado':>9} | {'máscara (ms)':>12} | {'índices (ms)':>12}")
+    for n in TAMANHOS:
+        ledger = Ledger()
+        ledger.extend(lote(n))
+        indices = IndicesExtrato(ledger)
+        df = ledger.to_frame()
+        _, fim = indices.periodo()
+        fim = pd.Timestamp(fim)
+        for nome, janela, conta, categoria in cenarios:
+            inicio = fim - janela
+            t_mask, _ = cronometrar(lambda: mascara(df, inicio, fim, conta, categoria))
+            t_idx, k = cronometrar(lambda: ledger.take(indices.filtrar(inicio, fim, conta, categoria)))
+            print(f"{n:>10,} | {nome:<24} | {k:>9,} | {t_mask:>12.2f} | {t_idx:>12.3f}")
+
+    print(f"\n{'linhas':>10} | {'inclusão em ordem (µs)':>22} | {'inclusão atrasada (µs)':>22} | {'sem índices (µs)':>16}")
+    for n in TAMANHOS:
+        tempos = []
+        for indexado, data in ((True, "2200-01-01"), (True, "2016-06-01"), (False, "2200-01-01")):
+            ledger = Ledger()
+            ledger.extend(lote(n))
+            if indexado:
+                IndicesExtrato(ledger)
+            datas = (pd.Timestamp(data) + pd.to_timedelta(range(INCLUSOES), unit="min")).to_pydatetime()
+            t0 = time.perf_counter()
+            for d in datas:
+                ledger.append(d, "Uber", "Transporte", -24.90, "Nubank", "Pago")
+            tempos.append((time.perf_counter() - t0) / INCLUSOES * 1e6)
+        print(f"{n:>10,} | {tempos[0]:>22.1f} | {tempos[1]:>22.1f} | {tempos[2]:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
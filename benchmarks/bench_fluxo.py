@@ -0,0 +1,51 @@
+# Série mensal do dashboard: recálculo só dos meses tocados vs. resample completo.
+#
+#   python benchmarks/bench_fluxo.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench_ledger import lote  # noqa: E402
+from castelo.fluxo import FluxoMensal, FonteLedger  # noqa: E402
+from castelo.indices import IndicesExtrato  # noqa: E402
+from castelo.ledger import Ledger  # noqa: E402
+
+REPS = 20
+
+
+def resample_completo(df):
+    v = df.set_index("Data")["Valor"]
+    return v.clip(lower=0).resample("MS").sum(), (-v.clip(upper=0)).resample("MS").sum()
+
+
+def main():
+    for n in (100_000, 1_000_000):
+        ledger = Ledger()
+        ledger.extend(lote(n))                 # ~11 anos de histórico com 1M linhas
+        indices = IndicesExtrato(ledger)
+        fluxo = FluxoMensal(FonteLedger(ledger, indices))
+        fluxo.acompanhar(ledger)
+
+        t0 = time.perf_counter()
+        serie = fluxo.serie()
+        t_frio = (time.perf_counter() - t0) * 1e3
+
+        t0 = time.perf_counter()
+        for _ in range(REPS):
+            ledger.append("2016-02-10", "Uber", "Transporte", -24.90, "Nubank", "Pago")
+            fluxo.serie()
+        t_inc = (time.perf_counter() - t0) / REPS * 1e3
+
+        t0 = time.perf_counter()
+        for _ in range(REPS):
+            resample_completo(ledger.to_frame())
+        t_full = (time.perf_counter() - t0) / REPS * 1e3
+
+        print(f"{n:>10,} linhas, {len(serie)} meses | 1ª série {t_frio:8.1f} ms | "
+              f"inclusão + série {t_inc:6.2f} ms | resample completo {t_full:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
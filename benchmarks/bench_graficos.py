@@ -0,0 +1,87 @@
+# Custo por rerun dos gráficos do dashboard: montar do zero vs. cache de figuras.
+#
+#   python benchmarks/bench_graficos.py
+#
+# "serialização" reproduz o que o st.plotly_chart faz a cada rerun com uma
+# Figure (to_dict + to_json); ela continua existindo com o cache.
+import os
+import sys
+import time
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from castelo.graficos import (  # noqa: E402
+    CacheFiguras, figura_categorias, figura_fluxo, remendar_categorias, remendar_fluxo
+)
+
+REPS = 50
+MESES = 24
+
+
+def dados(deslocamento=0.0):
+    df_fluxo = pd.DataFrame({
+        "Mês": [f"M{i}" for i in range(MESES)],
+        "Receitas": [18000.0 + i + deslocamento for i in range(MESES)],
+        "Despesas": [12000.0 + i for i in range(MESES)],
+    })
+    df_fluxo["Saldo"] = df_fluxo["Receitas"] - df_fluxo["Despesas"]
+    gastos = {"Alimentação": 450.0 + deslocamento, "Transporte": 24.9, "Lazer": 55.9, "Moradia": 3000.0}
+    return df_fluxo, gastos
+
+
+def antes(df_fluxo, gastos):
+    fig_line = go.Figure()
+    fig_line.add_trace(go.Scatter(x=df_fluxo['Mês'], y=df_fluxo['Receitas'], name='Receitas', line=dict(color='#2ecc71', width=3)))
+    fig_line.add_trace(go.Scatter(x=df_fluxo['Mês'], y=df_fluxo['Despesas'], name='Despesas', line=dict(color='#e74c3c', width=3)))
+    fig_line.add_trace(go.Bar(x=df_fluxo['Mês'], y=df_fluxo['Saldo'], name='Saldo Líquido', marker_color='#D4AF37', opacity=0.3))
+    fig_line.update_layout(title="Receitas vs Despesas", plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font_color='#fff')
+    df_pizza = pd.DataFrame({"Categoria": list(gastos.keys()), "Valor": list(gastos.values())})
+    fig_pie = px.pie(df_pizza, values='Valor', names='Categoria', color_discrete_sequence=px.colors.sequential.RdBu, hole=0.4)
+    fig_pie.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font_color='#fff')
+    return fig_line, fig_pie
+
+
+def depois(cache, versao, df_fluxo, gastos):
+    fig_line = cache.obter("fluxo", versao, "dark", lambda: figura_fluxo(df_fluxo), remendar_fluxo(df_fluxo))
+    fig_pie = cache.obter("categorias", versao, "dark", lambda: figura_categorias(gastos), remendar_categorias(gastos))
+    return fig_line, fig_pie
+
+
+def serializar(figs):
+    for fig in figs:
+        plotly.io.to_json(fig.to_dict(), validate=False)
+
+
+def cronometrar(fn):
+    t0 = time.perf_counter()
+    for i in range(REPS):
+        fn(i)
+    return (time.perf_counter() - t0) / REPS * 1e3
+
+
+def main():
+    df_fluxo, gastos = dados()
+    antes(df_fluxo, gastos)  # aquece imports/validadores do Plotly
+    t_antes = cronometrar(lambda i: antes(df_fluxo, gastos))
+    figs = antes(df_fluxo, gastos)
+    t_ser = cronometrar(lambda i: serializar(figs))
+
+    cache = CacheFiguras()
+    depois(cache, 0, df_fluxo, gastos)
+    t_hit = cronometrar(lambda i: depois(cache, 0, df_fluxo, gastos))
+    variantes = [dados(float(i + 1)) for i in range(REPS)]
+    t_patch = cronometrar(lambda i: depois(cache, i + 1, *variantes[i]))
+
+    print(f"montar do zero (antes)        {t_antes:8.2f} ms/rerun")
+    print(f"cache: dados inalterados      {t_hit:8.4f} ms/rerun")
+    print(f"cache: remendo dos traces     {t_patch:8.2f} ms/rerun")
+    print(f"serialização (st.plotly_chart){t_ser:8.2f} ms/rerun, em ambos os casos")
+    print(f"métricas do cache: {cache.metricas}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Vazão do importador (linhas/s) para arquivos CSV e OFX de 1M de linhas.
+#
+#   python benchmarks/bench_importador.py [linhas] [--sqlite]
+#
+# Gera os arquivos num diretório temporário, importa em streaming para um
+# Ledger (e opcionalmente para o SQLite) e reimporta para medir a deduplicação.
+import os
+import resource
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from castelo.armazenamento import Armazenamento  # noqa: E402
+from castelo.importador import IndiceHashes, Importador, ler_csv, ler_ofx  # noqa: E402
+from castelo.ledger import Ledger  # noqa: E402
+
+LOJAS = np.array(["Supermercado Extra", "Uber *Trip", "Netflix.com", "Drogasil", "Posto Shell", "iFood", "Salário"])
+
+
+def gerar_csv(caminho, n):
+    rng = np.random.default_rng(0)
+    datas = pd.Timestamp("2016-01-01") + pd.to_timedelta(rng.integers(0, 3650, n), unit="D")
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write("Data;Histórico;Valor\n")
+        for inicio in range(0, n, 100_000):
+            fim = min(inicio + 100_000, n)
+            bloco = pd.DataFrame({
+                "Data": datas[inicio:fim].strftime("%d/%m/%Y"),
+                "Histórico": LOJAS[rng.integers(0, len(LOJAS), fim - inicio)],
+                "Valor": np.char.replace((-rng.gamma(2.0, 80.0, fim - inicio)).round(2).astype(str), ".", ","),
+            })
+            bloco.to_csv(f, sep=";", header=False, index=False)
+
+
+def gerar_ofx(caminho, n):
+    rng = np.random.default_rng(1)
+    datas = (pd.Timestamp("2016-01-01") + pd.to_timedelta(rng.integers(0, 3650, n), unit="D")).strftime("%Y%m%d")
+    with open(caminho, "w", encoding="latin-1") as f:
+        f.write("OFXHEADER:100\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS>"
+                "<BANKACCTFROM><ACCTID>Itau</ACCTID></BANKACCTFROM><BANKTRANLIST>\n")
+        for inicio in range(0, n, 100_000):
+            fim = min(inicio + 100_000, n)
+            valores = (-rng.gamma(2.0, 80.0, fim - inicio)).round(2)
+            lojas = LOJAS[rng.integers(0, len(LOJAS), fim - inicio)]
+            f.writelines(
+                f"<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>{d}<TRNAMT>{v:.2f}<FITID>{inicio + i}<MEMO>{m}</STMTTRN>\n"
+                for i, (d, v, m) in enumerate(zip(datas[inicio:fim], valores, lojas))
+            )
+        f.write("</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n")
+
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def rodar(rotulo, leitor, pasta, com_sqlite):
+    ledger = Ledger()
+    if com_sqlite:
+        Armazenamento(os.path.join(pasta, f"{rotulo}.db")).acompanhar(ledger)
+    importador = Importador(ledger, IndiceHashes(ledger))
+    stats = importador.importar(leitor())
+    print(f"  {rotulo:<4} 1ª carga : {stats['inseridas']:>9,} inseridas em {stats['segundos']:6.2f} s"
+          f" = {stats['lidas'] / stats['segundos']:>9,.0f} linhas/s  (pico RSS {rss_mb():.0f} MB)")
+    stats = importador.importar(leitor())
+    print(f"  {rotulo:<4} reimport: {stats['duplicadas']:>9,} duplicadas em {stats['segundos']:6.2f} s"
+          f" = {stats['lidas'] / stats['segundos']:>9,.0f} linhas/s")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 1_000_000
+    com_sqlite = "--sqlite" in sys.argv
+    with tempfile.TemporaryDirectory() as pasta:
+        csv, ofx = os.path.join(pasta, "extrato.csv"), os.path.join(pasta, "extrato.ofx")
+        gerar_csv(csv, n)
+        gerar_ofx(ofx, n)
+        print(f"{n:,} linhas (CSV {os.path.getsize(csv) / 2**20:.0f} MB, OFX {os.path.getsize(ofx) / 2**20:.0f} MB)"
+              f"{' + SQLite' if com_sqlite else ''}")
+        rodar("csv", lambda: ler_csv(csv, conta="Nubank", sep=";"), pasta, com_sqlite)
+        rodar("ofx", lambda: ler_ofx(ofx), pasta, com_sqlite)
+
+
+if __name__ == "__main__":
+    main()
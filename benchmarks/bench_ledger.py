@@ -0,0 +1,68 @@
+# Custo de inclusão no Ledger conforme o extrato cresce (1k -> 1M linhas).
+#
+#   python benchmarks/bench_ledger.py
+#
+# Mede o custo médio de `append` unitário e de `extend` em lote quando o
+# extrato já tem N linhas, e compara com o antigo `pd.concat` para N pequeno.
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from castelo.ledger import Ledger  # noqa: E402
+
+TAMANHOS = [1_000, 10_000, 100_000, 1_000_000]
+AMOSTRA = 2_000
+
+
+def lote(n, inicio=0):
+    rng = np.random.default_rng(inicio)
+    return {
+        "Data": pd.date_range("2016-01-01", periods=n, freq="h"),
+        "Descrição": np.array(["Supermercado", "Uber", "Netflix", "Salário"], dtype=object)[rng.integers(0, 4, n)],
+        "Categoria": np.array(["Alimentação", "Transporte", "Lazer", "Receita"], dtype=object)[rng.integers(0, 4, n)],
+        "Valor": rng.normal(-100, 50, n).round(2),
+        "Conta": np.array(["Nubank", "Itaú"], dtype=object)[rng.integers(0, 2, n)],
+        "Status": np.full(n, "Pago", dtype=object),
+    }
+
+
+def us_por_linha(segundos, linhas):
+    return segundos / linhas * 1e6
+
+
+def main():
+    print(f"{'linhas':>10} | {'append (µs/linha)':>18} | {'extend (µs/linha)':>18} | {'pd.concat (µs/linha)':>20}")
+    for n in TAMANHOS:
+        ledger = Ledger()
+        ledger.extend(lote(n))
+
+        t0 = time.perf_counter()
+        for i in range(AMOSTRA):
+            ledger.append(datetime(2026, 2, 6), "Uber", "Transporte", -24.90, "Nubank", "Pago")
+        t_append = us_por_linha(time.perf_counter() - t0, AMOSTRA)
+
+        novos = lote(AMOSTRA, inicio=1)
+        t0 = time.perf_counter()
+        ledger.extend(novos)
+        t_extend = us_por_linha(time.perf_counter() - t0, AMOSTRA)
+
+        t_concat = "-"
+        if n <= 100_000:
+            df = pd.DataFrame(lote(n))
+            linha = pd.DataFrame(lote(1, inicio=2))
+            reps = 50
+            t0 = time.perf_counter()
+            for _ in range(reps):
+                df = pd.concat([linha, df], ignore_index=True)
+            t_concat = f"{us_por_linha(time.perf_counter() - t0, reps):.1f}"
+
+        print(f"{n:>10,} | {t_append:>18.2f} | {t_extend:>18.3f} | {t_concat:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Projeção de objetivos: dezenas de metas, milhares de caminhos no Monte Carlo.
+#
+#   python benchmarks/bench_objetivos.py [objetivos] [caminhos]
+#
+# Meta: projeção completa (determinística + Monte Carlo) abaixo de 200 ms, e
+# reuso do cache enquanto nenhum aporte novo chega.
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench_ledger import lote  # noqa: E402
+from castelo.ledger import Ledger  # noqa: E402
+from castelo.objetivos import AportesObjetivos, ProjecoesObjetivos, projetar  # noqa: E402
+
+HOJE = "2026-02-18"
+
+
+def objetivos(n, rng):
+    # Metade em renda fixa (sem volatilidade), metade ligada a mercado.
+    return [{
+        "nome": f"Objetivo {i}",
+        "alvo": float(rng.integers(20, 300) * 1000),
+        "atual": float(rng.integers(0, 20) * 1000),
+        "cor": "#D4AF37",
+        "prazo": f"{2027 + i % 8}-12-01",
+        "retorno": 0.10 if i % 2 else 0.12,
+        "volatilidade": 0.0 if i % 2 else float(rng.choice([0.10, 0.18, 0.25])),
+    } for i in range(n)]
+
+
+def aportes_mensais(goals, rng):
+    # Dois anos de aportes mensais por objetivo, no formato das colunas do Ledger.
+    meses = pd.date_range("2024-03-05", HOJE, freq="MS") + pd.Timedelta(days=4)
+    nomes = np.repeat([g["nome"] for g in goals], len(meses)).astype(object)
+    n = len(nomes)
+    return {
+        "Data": np.tile(meses.values, len(goals)),
+        "Descrição": np.array(["Aporte"] * n, dtype=object),
+        "Categoria": nomes,
+        "Valor": -rng.integers(3, 30, n) * 100.0,
+        "Conta": np.array(["Itaú"] * n, dtype=object),
+        "Status": np.array(["Pago"] * n, dtype=object),
+    }
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 48
+    caminhos = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    rng = np.random.default_rng(0)
+    goals = objetivos(n, rng)
+
+    ledger = Ledger()
+    ledger.extend(lote(200_000))
+    aportes = AportesObjetivos([g["nome"] for g in goals], ledger)
+    t0 = time.perf_counter()
+    ledger.extend(aportes_mensais(goals, rng))
+    print(f"aportes de {n} objetivos contabilizados em {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+    projetar(goals, aportes, HOJE, caminhos=caminhos)        # aquece
+    tempos = []
+    for semente in range(5):
+        t0 = time.perf_counter()
+        df = projetar(goals, aportes, HOJE, caminhos=caminhos, semente=semente)
+        tempos.append(time.perf_counter() - t0)
+    mercado = sum(g["volatilidade"] > 0 for g in goals)
+    print(f"projeção de {n} objetivos ({mercado} com Monte Carlo x {caminhos:,} caminhos): "
+          f"mediana {np.median(tempos) * 1e3:.0f} ms, pior {max(tempos) * 1e3:.0f} ms (meta: < 200 ms)")
+
+    projecoes = ProjecoesObjetivos(aportes, caminhos=caminhos)
+    projecoes.obter(goals, HOJE)
+    reps = 1_000
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        projecoes.obter(goals, HOJE)
+    print(f"cache (sem aporte novo): {(time.perf_counter() - t0) / reps * 1e6:.0f} µs por consulta")
+
+    ledger.append(np.datetime64(HOJE), "Aporte", goals[0]["nome"], -500.0, conta="Itaú")
+    t0 = time.perf_counter()
+    projecoes.obter(goals, HOJE)
+    print(f"após um aporte: recálculo em {(time.perf_counter() - t0) * 1e3:.0f} ms; métricas {projecoes.metricas}")
+    print(df.head(4).to_string())
+
+
+if __name__ == "__main__":
+    main()
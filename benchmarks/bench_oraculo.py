@@ -0,0 +1,33 @@
+# Oráculo com modelo local falso: latência com/sem cache e taxa de acerto.
+#
+#   python benchmarks/bench_oraculo.py
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from castelo.oraculo import FakeBackend, Oraculo  # noqa: E402
+
+CONSULTAS = 200
+PROMPTS_DISTINTOS = 20
+
+
+def main():
+    oraculo = Oraculo(FakeBackend(atraso=0.005), timeout=1.0)
+    rng = random.Random(0)
+    t0 = time.perf_counter()
+    for _ in range(CONSULTAS):
+        i = rng.randrange(PROMPTS_DISTINTOS)
+        prompt = f"Compra: item {i} | Valor: R$ {i * 100:.2f}"
+        "".join(oraculo.consultar(prompt, fallback=lambda: "local"))
+    total = time.perf_counter() - t0
+    latencias = sorted(oraculo.latencias)
+    print(f"consultas: {oraculo.metricas['consultas']}  acertos: {oraculo.metricas['acertos']}  "
+          f"taxa de acerto: {oraculo.taxa_acerto() * 100:.1f}%")
+    print(f"latência p50: {latencias[len(latencias) // 2] * 1e3:.2f} ms  "
+          f"p95: {latencias[int(len(latencias) * 0.95)] * 1e3:.2f} ms  total: {total:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
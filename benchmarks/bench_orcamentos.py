@@ -0,0 +1,69 @@
+# Orçamentos incrementais: custo por inclusão e leitura dos alertas do mês.
+#
+#   python benchmarks/bench_orcamentos.py [linhas]
+#
+# Compara o rastreador (só os pares mês/categoria tocados) com o que a tela de
+# Planejamento fazia: recalcular os gastos por categoria do extrato inteiro.
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench_ledger import lote  # noqa: E402
+from castelo.agregados import Agregados  # noqa: E402
+from castelo.ledger import Ledger  # noqa: E402
+from castelo.orcamentos import Orcamentos  # noqa: E402
+
+TETOS = {"Alimentação": 1500.0, "Transporte": 500.0, "Lazer": 400.0, "Moradia": 3000.0}
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    ledger = Ledger()
+    agregados = Agregados(ledger)
+    ledger.extend(lote(n))
+
+    t0 = time.perf_counter()
+    orcamentos = Orcamentos(TETOS, agregados=agregados)
+    for mes in orcamentos.meses():
+        orcamentos.verificar(mes)
+    orcamentos.acompanhar(ledger)
+    print(f"partida a partir dos agregados ({len(orcamentos.meses())} meses): "
+          f"{(time.perf_counter() - t0) * 1e3:.1f} ms, {len(orcamentos.eventos):,} alertas históricos")
+
+    ultimo = ledger.column("Data", len(ledger) - 1, len(ledger))[0]
+    mes = str(np.datetime64(ultimo, "M"))
+    reps = 1_000
+    antes = len(orcamentos.eventos)
+    sem = Ledger()      # mesmo Ledger com só os agregados assinando, como referência
+    Agregados(sem)
+    sem.extend(lote(1_000))
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        sem.append(ultimo, "Uber", "Transporte", -1.0, "Nubank", "Pago")
+    base = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        ledger.append(ultimo, "Uber", "Transporte", -1.0, "Nubank", "Pago")
+    print(f"inclusão sem rastreador: {base / reps * 1e6:.1f} µs")
+    print(f"inclusão com rastreador: {(time.perf_counter() - t0) / reps * 1e6:.1f} µs "
+          f"({len(orcamentos.eventos) - antes} alertas novos, cada limiar uma vez)")
+
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        orcamentos.alertas(mes)
+        orcamentos.gastos(mes)
+    print(f"alertas + gastos do mês: {(time.perf_counter() - t0) / reps * 1e6:.1f} µs")
+
+    t0 = time.perf_counter()
+    valores = ledger.column("Valor")
+    saida = (ledger.column("Data").astype("datetime64[M]") == np.datetime64(mes, "M")) & (valores < 0)
+    pd.Series(-valores[saida]).groupby(ledger.column("Categoria")[saida]).sum()
+    print(f"recálculo do mês varrendo {len(ledger):,} linhas: {(time.perf_counter() - t0) * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# Todas as páginas dos três apps contra extratos sintéticos, sem navegador.
+#
+#   CASTELO_ORACULO=fake python benchmarks/bench_paginas.py [--linhas 10000,100000]
+#       [--apps app.py,app_mvp.py,app_lite.py] [--reps 5] [--semente 0]
+#       [--baseline benchmarks/baseline_paginas.json] [--salvar-baseline] [--tolerancia 0.3] 2>/dev/null
+#
+# Cada página roda no AppTest do Streamlit, em `reps` voltas pelo menu:
+# "navegação" é a mediana das execuções que chegam na página, "rerun" a das
+# execuções seguintes nela, "pico" o maior RSS (VmHWM, zerado a cada visita).
+# "abertura" é a primeira execução do app, com imports e caches frios. Cada (app,
+# linhas) roda num processo próprio, porque o banco (CASTELO_DB) é fixado na
+# importação; os bancos do gerador ficam em cache em --dados. Sai com código 1
+# se alguma medição piorar além da tolerância em relação ao baseline (e de
+# novo numa segunda rodada do mesmo app) — o baseline só vale para a máquina
+# onde foi gravado, e junto dele ficam o commit medido e a semente do gerador.
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+from gerador import gerar, gravar  # noqa: E402
+
+APPS = ["app.py", "app_mvp.py", "app_lite.py"]
+ROTULOS_MENU = ("Navegação", "Menu")
+BASELINE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_paginas.json")
+# Abaixo destes pisos a diferença é ruído de medição, qualquer que seja a porcentagem.
+PISO_MS = 20.0
+PISO_MB = 15.0
+
+
+# --- MEMÓRIA ---
+def _zerar_pico():
+    # "5" em clear_refs zera o VmHWM (Linux); sem isso, o pico é o do processo todo.
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _pico_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for linha in f:
+                if linha.startswith("VmHWM:"):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# --- EXECUÇÃO DE UM APP (PROCESSO FILHO) ---
+def _menu(at):
+    for radio in [*at.sidebar.radio, *at.main.radio]:
+        if radio.label in ROTULOS_MENU:
+            return radio
+    return None
+
+
+def _erros(at):
+    return [e.message.splitlines()[0][:200] for e in at.exception]
+
+
+def medir_app(app, n, caminho, reps, semente=0):
+    os.environ["CASTELO_DB"] = caminho
+    os.environ.setdefault("CASTELO_ORACULO", "fake")
+    from streamlit.testing.v1 import AppTest
+    from castelo.importador import IndiceHashes
+    from castelo.ledger import Ledger
+
+    os.chdir(RAIZ)      # os apps abrem logo.jpg pelo caminho relativo
+    at = AppTest.from_file(os.path.join(RAIZ, app), default_timeout=600)
+    if app == "app_mvp.py":
+        # O MVP guarda o extrato só na sessão: entra já carregado com o mesmo volume.
+        ledger = Ledger()
+        ledger.extend(gerar(n, semente))
+        at.session_state["ledger"] = ledger
+        at.session_state["hashes"] = IndiceHashes(ledger)
+
+    _zerar_pico()
+    t0 = time.perf_counter()
+    at.run()
+    abertura = (time.perf_counter() - t0) * 1e3
+    menu = _menu(at)
+    paginas = list(menu.options) if menu is not None else ["(única)"]
+    medidas = {p: {"navegacao": [], "rerun": [], "pico": []} for p in paginas}
+    # `reps` voltas por todas as páginas: a navegação de cada volta vem da página
+    # anterior; a primeira da primeira volta é a abertura do app (imports, caches frios).
+    for volta in range(reps):
+        for i, pagina in enumerate(paginas):
+            m = medidas[pagina]
+            if volta or i:
+                _zerar_pico()
+                if menu is not None and len(paginas) > 1:
+                    t0 = time.perf_counter()
+                    _menu(at).set_value(pagina).run()
+                    m["navegacao"].append((time.perf_counter() - t0) * 1e3)
+            else:
+                m["navegacao"].append(abertura)
+            t0 = time.perf_counter()
+            at.run()
+            m["rerun"].append((time.perf_counter() - t0) * 1e3)
+            m["pico"].append(_pico_mb())
+            m["erros"] = _erros(at)
+
+    return {pagina: {
+        "abertura_ms": round(abertura, 1),
+        "navegacao_ms": round(float(np.median(m["navegacao"] or [abertura])), 1),
+        "rerun_ms": round(float(np.median(m["rerun"])), 1),
+        "navegacao_min_ms": round(min(m["navegacao"] or [abertura]), 1),
+        "rerun_min_ms": round(min(m["rerun"]), 1),
+        "pico_mb": round(max(m["pico"]), 1),
+        "erros": m["erros"],
+    } for pagina, m in medidas.items()}
+
+
+# --- ORQUESTRAÇÃO ---
+def banco(dados, n, semente=0):
+    caminho = os.path.join(dados, f"castelo-{n}-{semente}.db")
+    if not os.path.exists(caminho):
+        t0 = time.perf_counter()
+        gravar(caminho, n, semente)
+        print(f"  gerado {caminho} em {time.perf_counter() - t0:.1f} s", flush=True)
+    return caminho
+
+
+def rodar(app, n, caminho, reps, semente=0):
+    # Processo novo por (app, linhas): banco, caches e memória limpos.
+    saida = subprocess.run(
+        [sys.executable, __file__, "--filho", app, str(n), caminho, str(reps), str(semente)],
+        capture_output=True, text=True, cwd=RAIZ,
+    )
+    if saida.returncode != 0:
+        raise RuntimeError(f"{app} com {n:,} linhas falhou:\n{saida.stderr[-2000:]}")
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def commit_medido():
+    # Commit do código medido, com "-sujo" se há alterações fora de benchmarks/
+    # (o próprio script e o baseline não mudam as medições); None fora do git.
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True, cwd=RAIZ).stdout.strip()
+        sujo = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no", "--", ".",
+                               ":(exclude)benchmarks"], capture_output=True, text=True, cwd=RAIZ).stdout.strip()
+    except OSError:
+        return None
+    return (commit + ("-sujo" if sujo else "")) or None
+
+
+def comparar(atual, baseline, tolerancia):
+    # Medições que pioraram além da tolerância e do piso absoluto. A repetição
+    # mais rápida de agora vai contra a mediana do baseline: com a carga da
+    # máquina oscilando, só acusa quando nem a melhor execução alcança a típica.
+    regressoes = []
+    for chave, medidas in atual.items():
+        antes = baseline.get(chave)
+        if antes is None:
+            continue
+        for campo, referencia, piso in (("navegacao_min_ms", "navegacao_ms", PISO_MS),
+                                        ("rerun_min_ms", "rerun_ms", PISO_MS),
+                                        ("pico_mb", "pico_mb", PISO_MB)):
+            a, b = antes.get(referencia), medidas.get(campo)
+            if a is None or b is None:
+                continue
+            if b > a * (1 + tolerancia) and b - a > piso:
+                regressoes.append((chave, referencia, a, b))
+    return regressoes
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--filho":
+        app, n, caminho, reps, semente = sys.argv[2], int(sys.argv[3]), sys.argv[4], int(sys.argv[5]), int(sys.argv[6])
+        print(json.dumps(medir_app(app, n, caminho, reps, semente), ensure_ascii=False))
+        return
+
+    p = argparse.ArgumentParser(description="Latência e memória de todas as páginas no AppTest.")
+    p.add_argument("--linhas", default="10000,100000")
+    p.add_argument("--apps", default=",".join(APPS))
+    p.add_argument("--reps", type=int, default=5)
+    p.add_argument("--semente", type=int, default=0, help="semente do gerador dos extratos")
+    p.add_argument("--dados", default=os.path.join(tempfile.gettempdir(), "castelo-bench"))
+    p.add_argument("--baseline", default=BASELINE_PADRAO)
+    p.add_argument("--salvar-baseline", action="store_true")
+    p.add_argument("--tolerancia", type=float, default=0.3)
+    args = p.parse_args()
+    os.makedirs(args.dados, exist_ok=True)
+
+    atual = {}
+    print(f"{'app':<12} {'linhas':>10}  {'página':<26} {'navegação':>10} {'rerun':>9} {'pico':>8}")
+    for n in (int(x) for x in args.linhas.split(",")):
+        caminho = banco(args.dados, n, args.semente)
+        for app in args.apps.split(","):
+            for pagina, m in rodar(app, n, caminho, args.reps, args.semente).items():
+                atual[f"{app}|{n}|{pagina}"] = m
+                erro = f"  ERRO: {m['erros'][0]}" if m["erros"] else ""
+                print(f"{app:<12} {n:>10,}  {pagina:<26} {m['navegacao_ms']:>8.0f}ms "
+                      f"{m['rerun_ms']:>7.0f}ms {m['pico_mb']:>6.0f}MB{erro}", flush=True)
+
+    falhou = any(m["erros"] for m in atual.values())
+    if args.salvar_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"maquina": platform.platform(), "python": platform.python_version(),
+                       "commit": commit_medido(), "semente": args.semente,
+                       "reps": args.reps, "resultados": atual}, f, ensure_ascii=False, indent=1)
+        print(f"baseline gravado em {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("semente", 0) != args.semente:
+            print(f"  aviso: baseline gravado com --semente {baseline.get('semente', 0)}, extratos diferentes")
+        regressoes = comparar(atual, baseline["resultados"], args.tolerancia)
+        # Suspeitas são medidas de novo; só conta o que piorar nas duas rodadas.
+        suspeitos = dict.fromkeys(tuple(chave.split("|")[:2]) for chave, *_ in regressoes)
+        for app, n in suspeitos:
+            print(f"  confirmando {app} com {int(n):,} linhas...", flush=True)
+            for pagina, m in rodar(app, int(n), banco(args.dados, int(n), args.semente), args.reps,
+                                   args.semente).items():
+                antes = atual[f"{app}|{n}|{pagina}"]
+                for campo in ("navegacao_min_ms", "rerun_min_ms", "pico_mb"):
+                    antes[campo] = min(antes[campo], m[campo])
+        if suspeitos:
+            regressoes = comparar(atual, baseline["resultados"], args.tolerancia)
+        print(f"comparado com {args.baseline} ({baseline['maquina']}, commit {baseline.get('commit')}), "
+              f"tolerância {args.tolerancia:.0%}:")
+        for chave, campo, a, b in regressoes:
+            print(f"  REGRESSÃO {chave} {campo}: {a:.1f} -> {b:.1f} ({b / a - 1:+.0%})")
+        if not regressoes:
+            print("  nenhuma regressão")
+        falhou = falhou or bool(regressoes)
+    sys.exit(1 if falhou else 0)
+
+
+if __name__ == "__main__":
+    main()
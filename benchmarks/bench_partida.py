@@ -0,0 +1,91 @@
+# Partida a frio: custo de import da moldura e de cada página, e primeira execução.
+#
+#   CASTELO_ORACULO=fake python benchmarks/bench_partida.py [repetições] 2>/dev/null
+#
+# Imports medidos com `python -X importtime` num processo novo (acima do
+# próprio streamlit, que todo app paga). A primeira execução roda no AppTest,
+# também em processo novo: "moldura" é o tempo até o menu estar pintado
+# (tudo antes da etapa da página, pelo perfilador), comparável à execução
+# inteira do app_lite.py.
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, RAIZ)
+from paginas import PAGINAS  # noqa: E402
+
+MODULOS = {
+    "moldura (app.py)": ["paginas", "paginas.base"],
+    "dados do cliente": ["paginas.clientes"],
+    **{f"página {p}": [f"paginas.{m}"] for p, m in PAGINAS.items()},
+}
+
+
+def custo_import(modulos):
+    # Soma do tempo cumulativo dos imports de primeiro nível feitos depois do streamlit.
+    codigo = "import streamlit\n" + "".join(f"import {m}\n" for m in modulos)
+    saida = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo],
+                           capture_output=True, text=True, cwd=RAIZ).stderr
+    total, depois = 0, False
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        _, cumulativo, nome = linha.split("|")
+        if nome.startswith(" ") and not nome.startswith("  "):
+            if depois:
+                total += int(cumulativo)
+            depois = depois or nome.strip() == "streamlit"
+    return total / 1e3
+
+
+def primeira_execucao(app):
+    # Processo novo: AppTest na primeira execução do app, com o perfilador ligado.
+    with tempfile.TemporaryDirectory() as pasta:
+        codigo = f"""
+import json, os, time
+os.chdir({RAIZ!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({os.path.join(RAIZ, app)!r}, default_timeout=120)
+t0 = time.perf_counter()
+at.run()
+print(json.dumps({{"ms": (time.perf_counter() - t0) * 1e3, "erros": [e.message for e in at.exception]}}))
+"""
+        env = {**os.environ, "CASTELO_DB": os.path.join(pasta, "castelo.db"),
+               "CASTELO_PERFIL": os.path.join(pasta, "perfil.jsonl")}
+        saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, cwd=RAIZ, env=env)
+        resultado = json.loads(saida.stdout.strip().splitlines()[-1])
+        moldura = None
+        if os.path.exists(env["CASTELO_PERFIL"]):
+            with open(env["CASTELO_PERFIL"], encoding="utf-8") as f:
+                registro = json.loads(f.readline())
+            depois = sum(e["ms"] for e in registro["etapas"] if e["nome"].startswith("pagina:") or e["nome"] == "alertas")
+            moldura = resultado["ms"] - depois
+        return resultado["ms"], moldura, resultado["erros"]
+
+
+def main():
+    reps = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    os.environ.setdefault("CASTELO_ORACULO", "fake")
+
+    print("imports a frio (acima do streamlit, mediana de", reps, "processos):")
+    for rotulo, modulos in MODULOS.items():
+        ms = np.median([custo_import(modulos) for _ in range(reps)])
+        print(f"  {rotulo:<34} {ms:7.0f} ms")
+
+    print("primeira execução em processo novo:")
+    for app in ("app_lite.py", "app.py"):
+        medidas = [primeira_execucao(app) for _ in range(reps)]
+        erros = [e for _, _, es in medidas for e in es]
+        linha = f"  {app:<12} total {np.median([m[0] for m in medidas]):6.0f} ms"
+        if medidas[0][1] is not None:
+            linha += f" · moldura pintada em {np.median([m[1] for m in medidas]):6.0f} ms"
+        print(linha + (f"  ERRO: {erros[0][:200]}" if erros else ""))
+
+
+if __name__ == "__main__":
+    main()
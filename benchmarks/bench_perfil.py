@@ -0,0 +1,71 @@
+# Custo da camada de perfil: ligada x desligada, por medição e por execução.
+#
+#   python benchmarks/bench_perfil.py [execucoes_por_pagina] 2>/dev/null
+#
+# (o AppTest escreve um aviso de ScriptRunContext no stderr a cada sessão criada)
+import os
+import sys
+import tempfile
+import time
+
+PASTA = tempfile.mkdtemp(prefix="castelo-perfil-")
+os.environ["CASTELO_DB"] = os.path.join(PASTA, "demo.db")
+os.environ.setdefault("CASTELO_ORACULO", "fake")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from castelo.perfil import Perfilador, agregar, ler_registros  # noqa: E402
+
+APP = os.path.join(os.path.dirname(__file__), "..", "app.py")
+REPS = 100_000
+
+
+def por_medicao(perfilador):
+    execucao = perfilador.execucao()
+    t0 = time.perf_counter()
+    for _ in range(REPS):
+        execucao.etapa("etapa")
+        with execucao.bloco("bloco"):
+            pass
+    return (time.perf_counter() - t0) / REPS * 1e6
+
+
+def por_execucao(n, caminho):
+    # Percorre todas as páginas `n` vezes numa sessão; devolve ms médios por execução.
+    if caminho:
+        os.environ["CASTELO_PERFIL"] = caminho
+    else:
+        os.environ.pop("CASTELO_PERFIL", None)
+    os.environ["CASTELO_ADMIN"] = "1"
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    paginas = at.sidebar.radio[0].options
+    t0 = time.perf_counter()
+    for _ in range(n):
+        for pagina in paginas:
+            at.sidebar.radio[0].set_value(pagina).run()
+    assert not at.exception, [e.message for e in at.exception]
+    return (time.perf_counter() - t0) / (n * len(paginas)) * 1e3
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"desligado: {por_medicao(Perfilador()):.3f} µs por etapa+bloco")
+    print(f"ligado:    {por_medicao(Perfilador(os.path.join(PASTA, 'micro.jsonl'))):.3f} µs por etapa+bloco "
+          f"(inclui leitura do RSS)")
+
+    # Cada AppTest roda no mesmo processo: o Perfilador (cache_resource) é
+    # criado na primeira execução, então cada cenário usa um app recém-aberto.
+    desligado = por_execucao(n, None)
+    log = os.path.join(PASTA, "perfil.jsonl")
+    from streamlit.runtime.caching import cache_resource
+    cache_resource.clear()
+    ligado = por_execucao(n, log)
+    print(f"execução do app (todas as páginas): desligado {desligado:.1f} ms, ligado {ligado:.1f} ms "
+          f"({(ligado / desligado - 1) * 100:+.1f}%)")
+    print(agregar(ler_registros(log)).head(12).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Previsão das recorrentes: cálculo em segundo plano vs. leitura na tela.
+#
+#   python benchmarks/bench_recorrencias.py [linhas,...]
+#
+# "cálculo" é o que a thread faz (janela de JANELA_DIAS dias lida do SQLite ou
+# do Ledger, detecção e previsão); "obter" é o que uma execução da página paga
+# para ler o resultado pronto. "séries" compara as detectadas com as mensais
+# que o gerador cria (salário, contas fixas e aportes dos objetivos).
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from gerador import FIXAS, GOALS, gravar  # noqa: E402
+from castelo.armazenamento import Armazenamento  # noqa: E402
+from castelo.sessoes import EstadoUsuario  # noqa: E402
+
+TAMANHOS = [10_000, 100_000, 1_000_000]
+REPS = 5
+LEITURAS = 1000
+
+
+def cronometrar(fn):
+    melhor = float("inf")
+    for _ in range(REPS):
+        t0 = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor * 1e3
+
+
+def main():
+    tamanhos = [int(x) for x in sys.argv[1].split(",")] if len(sys.argv) > 1 else TAMANHOS
+    esperadas = 1 + len(FIXAS) + len(GOALS)
+    print(f"{'linhas':>10} | {'janela':>7} | {'cálculo SQLite (ms)':>19} | {'cálculo Ledger (ms)':>19} | "
+          f"{'obter (µs)':>10} | séries")
+    for n in tamanhos:
+        with tempfile.TemporaryDirectory() as pasta:
+            arm = Armazenamento(gravar(os.path.join(pasta, "bench.db"), n))
+            estado = EstadoUsuario("bench", arm)
+            previsoes = estado.previsoes
+            previsoes.aguardar()
+            linhas = len(estado.recentes(previsoes.dias))
+            sqlite = cronometrar(previsoes.calcular)
+            estado.ledger()
+            ledger = cronometrar(previsoes.calcular)
+            previsoes.obter()
+            previsoes.aguardar()
+            t0 = time.perf_counter()
+            for _ in range(LEITURAS):
+                resultado = previsoes.obter()
+            obter = (time.perf_counter() - t0) / LEITURAS * 1e6
+            arm.fechar()
+        series = len(resultado["series"])
+        print(f"{n:>10,} | {linhas:>7,} | {sqlite:>19.1f} | {ledger:>19.1f} | {obter:>10.1f} | "
+              f"{series}/{esperadas}{'' if series == esperadas else ' ✗'}")
+
+
+if __name__ == "__main__":
+    main()
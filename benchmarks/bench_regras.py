@@ -0,0 +1,43 @@
+# Motor de regras VFP: avaliação unitária (µs) e em lote sobre um DataFrame.
+#
+#   python benchmarks/bench_regras.py
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from castelo.regras import avaliar, avaliar_lote  # noqa: E402
+
+CATEGORIAS = np.array(["Essencial", "Estilo de Vida", "Supérfluo/Desejo"], dtype=object)
+
+
+def main():
+    reps = 100_000
+    t0 = time.perf_counter()
+    for i in range(reps):
+        avaliar(1500.0 + i % 100, 18200.0, "Supérfluo/Desejo", 1 + i % 12)
+    print(f"avaliar (unitário): {(time.perf_counter() - t0) / reps * 1e6:.2f} µs/compra")
+
+    rng = np.random.default_rng(0)
+    for n in (10_000, 1_000_000):
+        df = pd.DataFrame({
+            "Valor": rng.uniform(10, 20_000, n).round(2),
+            "Categoria": CATEGORIAS[rng.integers(0, 3, n)],
+            "Parcelas": rng.integers(1, 13, n),
+        })
+        t0 = time.perf_counter()
+        res = avaliar_lote(df, renda=18200.0)
+        dt = time.perf_counter() - t0
+        print(f"avaliar_lote ({n:,} compras): {dt * 1e3:.1f} ms  ({dt / n * 1e9:.0f} ns/compra)")
+
+        # O lote precisa concordar com o caminho unitário.
+        amostra = df.sample(500, random_state=0)
+        esperado = [avaliar(r.Valor, 18200.0, r.Categoria, r.Parcelas).status for r in amostra.itertuples()]
+        assert res.loc[amostra.index, "status"].tolist() == esperado
+
+
+if __name__ == "__main__":
+    main()
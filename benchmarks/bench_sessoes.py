@@ -0,0 +1,112 @@
+# Teste de carga multiusuário: RSS por sessão simultânea do app.py.
+#
+#   python benchmarks/bench_sessoes.py [sessoes] [linhas_por_usuario] 2>/dev/null
+#
+# (o AppTest escreve um aviso de ScriptRunContext no stderr a cada sessão criada)
+#
+# Abre N sessões (AppTest, mesmo processo, como no servidor) em dois cenários:
+# todas do mesmo cliente (dividem um estado) e uma por cliente (um estado cada,
+# com o extrato carregado). Depois mede o RegistroUsuarios sozinho e o despejo.
+import gc
+import os
+import resource
+import sys
+import tempfile
+import time
+
+PASTA = tempfile.mkdtemp(prefix="castelo-sessoes-")
+os.environ["CASTELO_DB"] = os.path.join(PASTA, "demo.db")
+os.environ["CASTELO_DADOS"] = PASTA
+os.environ.setdefault("CASTELO_ORACULO", "fake")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from bench_ledger import lote  # noqa: E402
+from castelo.armazenamento import Armazenamento  # noqa: E402
+from castelo.sessoes import EstadoUsuario, RegistroUsuarios, caminho_usuario  # noqa: E402
+
+APP = os.path.join(os.path.dirname(__file__), "..", "app.py")
+
+
+def rss_mb():
+    # RSS atual (não o pico), para medir o quanto cada sessão acrescenta.
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def semear(usuario, linhas):
+    arm = Armazenamento(caminho_usuario(usuario))
+    if arm.vazio():
+        arm.inserir(lote(linhas, inicio=hash(usuario) % 1000))
+    arm.fechar()
+
+
+def sessao(usuario):
+    os.environ["CASTELO_USUARIO"] = usuario
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    at.sidebar.radio[0].set_value("💳 Lançamentos").run()
+    assert not at.exception, [e.message for e in at.exception]
+    return at
+
+
+def cenario(rotulo, usuarios):
+    gc.collect()
+    antes = rss_mb()
+    t0 = time.perf_counter()
+    sessoes = [sessao(u) for u in usuarios]
+    dt = time.perf_counter() - t0
+    gc.collect()
+    depois = rss_mb()
+    print(f"{rotulo:<26} {len(sessoes):>4} sessões  +{depois - antes:7.1f} MB  "
+          f"{(depois - antes) / len(sessoes):6.2f} MB/sessão  {dt / len(sessoes) * 1e3:6.0f} ms/sessão")
+    return sessoes
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    linhas = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    usuarios = [f"cliente{i}@castelo" for i in range(n)]
+    for u in ["demo"] + usuarios:
+        semear(u, linhas)
+    print(f"RSS inicial: {rss_mb():.1f} MB; {n} clientes com {linhas:,} lançamentos cada")
+
+    sessao("demo")      # aquece imports e caches de processo
+    mesmo = cenario("mesmo cliente (demo)", ["demo"] * n)
+    distintos = cenario("um cliente por sessão", usuarios)
+    del mesmo, distintos
+
+    # Só o estado por usuário, sem a sessão do Streamlit em volta: uma cópia
+    # por sessão (como era no session_state) contra o estado compartilhado.
+    def criar(u):
+        return EstadoUsuario(u, Armazenamento(caminho_usuario(u)))
+
+    gc.collect()
+    antes = rss_mb()
+    copias = [criar("demo") for _ in range(n)]
+    for e in copias:
+        e.ledger()
+    gc.collect()
+    print(f"{'cópia por sessão':<26} {n:>4} sessões  {(rss_mb() - antes) / n:6.2f} MB/sessão")
+    del copias
+
+    registro = RegistroUsuarios(criar)
+    gc.collect()
+    antes = rss_mb()
+    for _ in range(n):
+        registro.obter("demo").ledger()
+    gc.collect()
+    print(f"{'estado compartilhado':<26} {n:>4} sessões  {(rss_mb() - antes) / n:6.2f} MB/sessão")
+    for u in usuarios:
+        registro.obter(u).ledger()
+    registro.ocioso = 0
+    registro.despejar_ociosos()
+    gc.collect()
+    print(f"após despejo dos ociosos: {len(registro)} estados, métricas {registro.metricas}")
+
+
+if __name__ == "__main__":
+    main()
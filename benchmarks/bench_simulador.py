@@ -0,0 +1,27 @@
+# Grade do simulador de parcelas (1..12x x meses) — alvo: bem abaixo de 100 ms.
+#
+#   python benchmarks/bench_simulador.py
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from castelo.simulador import simular_parcelas  # noqa: E402
+
+REPS = 200
+CARD = {"nome": "Nubank Roxinho", "limite": 15000.00, "fechamento": 5, "vencimento": 12, "fatura_atual": 4500.20}
+
+
+def main():
+    simular_parcelas(6000.0, 18200.0, CARD, datetime(2026, 2, 10))
+    t0 = time.perf_counter()
+    for _ in range(REPS):
+        sim = simular_parcelas(6000.0, 18200.0, CARD, datetime(2026, 2, 10),
+                               despesas_mensais=9000.0, saldo_inicial=12450.0, categoria="Supérfluo/Desejo")
+    dt = (time.perf_counter() - t0) / REPS * 1e3
+    print(f"grade {sim['fluxo'].shape[0]} opções x {sim['fluxo'].shape[1]} meses: {dt:.2f} ms por simulação")
+
+
+if __name__ == "__main__":
+    main()
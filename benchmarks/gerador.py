@@ -0,0 +1,160 @@
+# Gerador reprodutível de extratos sintéticos (10 mil a 10 milhões de linhas).
+#
+#   python benchmarks/gerador.py <linhas> <saida.db> [semente]
+#
+# Monta um cliente completo no esquema do Armazenamento: conta corrente com
+# salário, contas fixas e aportes mensais nos objetivos; compras em três
+# cartões (algumas parceladas, "LOJA 01/10"); Pix enviados e recebidos. Mesmas
+# `linhas` e `semente` geram sempre o mesmo banco.
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from castelo.armazenamento import Armazenamento  # noqa: E402
+from castelo.ledger import COLUNAS, TRANSFERENCIA  # noqa: E402
+
+CONTA_CORRENTE = "Itaú"
+CARDS = [
+    {"nome": "Nubank Roxinho", "limite": 15000.0, "fechamento": 5, "vencimento": 12, "conta": "Nubank"},
+    {"nome": "Itaú Black", "limite": 35000.0, "fechamento": 20, "vencimento": 28, "conta": "Itaú Black"},
+    {"nome": "Inter Gold", "limite": 8000.0, "fechamento": 28, "vencimento": 5, "conta": "Inter"},
+]
+GOALS = [
+    {"nome": "Reserva de Emergência", "alvo": 100000.0, "atual": 12450.0, "cor": "#2ecc71",
+     "prazo": "2028-12-01", "retorno": 0.10, "volatilidade": 0.0, "aporte": 1500.0},
+    {"nome": "Viagem Europa", "alvo": 30000.0, "atual": 5000.0, "cor": "#3498db",
+     "prazo": "2027-07-01", "retorno": 0.08, "volatilidade": 0.0, "aporte": 600.0},
+    {"nome": "Troca de Carro", "alvo": 150000.0, "atual": 0.0, "cor": "#e74c3c",
+     "prazo": "2030-12-01", "retorno": 0.12, "volatilidade": 0.18, "aporte": 1200.0},
+    {"nome": "Aposentadoria", "alvo": 2000000.0, "atual": 80000.0, "cor": "#9b59b6",
+     "prazo": "2050-01-01", "retorno": 0.11, "volatilidade": 0.22, "aporte": 2500.0},
+]
+BUDGETS = {"Alimentação": 2500.0, "Transporte": 900.0, "Lazer": 700.0, "Moradia": 4500.0, "Saúde": 800.0}
+
+# Compras do dia a dia: (categoria, estabelecimentos, mediana do valor, dispersão log).
+COMPRAS = [
+    ("Alimentação", ["Supermercado Pão de Açúcar", "Carrefour", "iFood", "Padaria Real", "Rappi", "Hortifruti"], 85.0, 0.8),
+    ("Transporte", ["Uber *Trip", "99 Pop", "Posto Shell", "Posto Ipiranga", "Estacionamento Estapar"], 32.0, 0.7),
+    ("Lazer", ["Netflix", "Spotify", "Cinemark", "Steam", "Ingresso.com", "Bar do Zé"], 60.0, 0.9),
+    ("Saúde", ["Drogasil", "Droga Raia", "Smart Fit", "Laboratório Fleury"], 120.0, 0.8),
+    ("Moradia", ["Leroy Merlin", "Tok&Stok", "Mercado Livre", "Amazon"], 180.0, 1.0),
+    ("Sem Categoria", ["Pix Enviado", "Compra Internacional", "Pagamento Diverso"], 150.0, 1.1),
+]
+PARCELADAS = ["Magazine Luiza", "Fast Shop", "Americanas", "Apple Store", "Decathlon"]
+FIXAS = [("Aluguel", "Moradia", 3200.0), ("Condomínio", "Moradia", 780.0), ("Enel Energia", "Moradia", 210.0),
+         ("Sabesp", "Moradia", 95.0), ("Unimed", "Saúde", 650.0), ("Vivo Fibra", "Moradia", 120.0)]
+SALARIO = 18200.0           # mínimo; sobe com o volume de compras para o saldo não afundar
+FOLGA_SALARIO = 1.15
+FRACAO_CARTAO = 0.65        # compras no cartão; o resto sai da conta corrente
+FRACAO_PARCELADA = 0.04
+FRACAO_PIX_RECEBIDO = 0.03
+
+
+def anos_para(n):
+    # Histórico de 2 anos para 10 mil linhas até 20 anos para 10 milhões.
+    return int(np.clip(round(n / 25_000), 2, 20))
+
+
+def gerar(n, semente=0, fim="2026-02-28"):
+    """Extrato com exatamente `n` linhas, em ordem de data (dict de colunas do Ledger)."""
+    rng = np.random.default_rng(semente)
+    fim = pd.Timestamp(fim)
+    meses = pd.date_range(end=fim, periods=anos_para(n) * 12, freq="MS")
+    inicio_ns, fim_ns = meses[0].value, (fim + pd.Timedelta(days=1)).value
+
+    # Lançamentos mensais da conta corrente: salário, contas fixas e aportes.
+    mensais = []
+    for dia, descricao, categoria, valor, status in (
+        [(5, "Salário", "Receita", SALARIO, "Recebido")]
+        + [(10, d, c, -v, "Pago") for d, c, v in FIXAS]
+        + [(15, f"Aporte: {g['nome']}", g["nome"], -g["aporte"], TRANSFERENCIA) for g in GOALS]
+    ):
+        mensais.append(pd.DataFrame({
+            "Data": meses + pd.Timedelta(days=dia - 1),
+            "Descrição": descricao, "Categoria": categoria,
+            "Valor": np.round(valor * rng.normal(1.0, 0.02 if categoria != "Receita" else 0.0, len(meses)), 2),
+            "Conta": CONTA_CORRENTE, "Status": status,
+        }))
+    fixos = pd.concat(mensais, ignore_index=True).iloc[:n]
+
+    # O restante são compras e Pix espalhados no período (horário aleatório).
+    m = n - len(fixos)
+    datas = np.sort(rng.integers(inicio_ns, fim_ns, m)).astype("datetime64[ns]")
+    tipo = rng.integers(0, len(COMPRAS), m)
+    descricao = np.empty(m, dtype=object)
+    categoria = np.empty(m, dtype=object)
+    valor = np.empty(m)
+    for i, (cat, lojas, mediana, dispersao) in enumerate(COMPRAS):
+        sel = tipo == i
+        k = int(sel.sum())
+        descricao[sel] = np.array(lojas, dtype=object)[rng.integers(0, len(lojas), k)]
+        categoria[sel] = cat
+        valor[sel] = -np.round(mediana * rng.lognormal(0.0, dispersao, k), 2)
+
+    conta = np.full(m, CONTA_CORRENTE, dtype=object)
+    cartao = rng.random(m) < FRACAO_CARTAO
+    contas_cards = np.array([c["conta"] for c in CARDS], dtype=object)
+    conta[cartao] = contas_cards[rng.choice(len(CARDS), int(cartao.sum()), p=[0.5, 0.35, 0.15])]
+
+    # Parceladas no cartão: chega a 1ª parcela, as demais ficam projetadas na fatura.
+    parcelada = cartao & (rng.random(m) < FRACAO_PARCELADA)
+    k = int(parcelada.sum())
+    total = rng.integers(2, 13, k)
+    descricao[parcelada] = (np.array(PARCELADAS, dtype=object)[rng.integers(0, len(PARCELADAS), k)]
+                            + np.char.add(" 01/", np.char.zfill(total.astype(str), 2)).astype(object))
+    categoria[parcelada] = "Moradia"
+    valor[parcelada] = -np.round(rng.lognormal(np.log(2400), 0.6, k) / total, 2)
+
+    pix = ~cartao & (rng.random(m) < FRACAO_PIX_RECEBIDO)
+    descricao[pix] = "Pix Recebido"
+    categoria[pix] = "Receita"
+    valor[pix] = np.round(rng.lognormal(np.log(300), 0.9, int(pix.sum())), 2)
+    status = np.where(valor > 0, "Recebido", "Pago").astype(object)
+
+    # Renda compatível com o volume: salário cobre gastos do mês com alguma folga.
+    saidas = -(valor[valor < 0].sum() + fixos.loc[fixos["Valor"] < 0, "Valor"].sum()) / len(meses)
+    salario = fixos["Descrição"] == "Salário"
+    fixos.loc[salario, "Valor"] = max(SALARIO, round(saidas * FOLGA_SALARIO, -2))
+
+    variaveis = pd.DataFrame({"Data": datas, "Descrição": descricao, "Categoria": categoria,
+                              "Valor": valor, "Conta": conta, "Status": status})
+    df = pd.concat([fixos, variaveis], ignore_index=True).sort_values("Data", kind="stable", ignore_index=True)
+    return {c: df[c].to_numpy(dtype="datetime64[ns]" if c == "Data" else np.float64 if c == "Valor" else object)
+            for c in COLUNAS}
+
+
+def gravar(caminho, n, semente=0, lote=500_000):
+    # Banco SQLite completo (extrato, cartões, objetivos e orçamentos) para CASTELO_DB.
+    for sufixo in ("", "-wal", "-shm"):
+        if os.path.exists(caminho + sufixo):
+            os.remove(caminho + sufixo)
+    dados = gerar(n, semente)
+    arm = Armazenamento(caminho)
+    for i in range(0, n, lote):
+        arm.inserir({c: v[i:i + lote] for c, v in dados.items()})
+    for card in CARDS:
+        arm.salvar_card(card)
+    for goal in GOALS:
+        arm.salvar_goal({k: v for k, v in goal.items() if k != "aporte"})
+    for categoria, limite in BUDGETS.items():
+        arm.salvar_budget(categoria, limite)
+    arm.fechar()
+    return caminho
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    caminho = sys.argv[2] if len(sys.argv) > 2 else f"castelo-{n}.db"
+    semente = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    t0 = time.perf_counter()
+    gravar(caminho, n, semente)
+    print(f"{n:,} linhas ({anos_para(n)} anos) em {caminho}: {time.perf_counter() - t0:.1f} s, "
+          f"{os.path.getsize(caminho) / 2**20:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
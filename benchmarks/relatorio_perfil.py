@@ -0,0 +1,31 @@
+# Agrega o log do perfil (CASTELO_PERFIL=perfil.jsonl) em p50/p95/p99 por
+# página, etapa, bloco e chamada ao modelo.
+#
+#   python benchmarks/relatorio_perfil.py [perfil.jsonl] [--pagina NOME]
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from castelo.perfil import ARQUIVO_PADRAO, agregar, ler_registros  # noqa: E402
+
+
+def main():
+    args = sys.argv[1:]
+    pagina = None
+    if "--pagina" in args:
+        i = args.index("--pagina")
+        pagina = args[i + 1]
+        del args[i:i + 2]
+    registros = ler_registros(args[0] if args else ARQUIVO_PADRAO)
+    if pagina is not None:
+        registros = [r for r in registros if r.get("pagina") == pagina]
+    interrompidas = sum(r.get("interrompida", False) for r in registros)
+    print(f"{len(registros):,} execuções ({interrompidas:,} encerradas por st.rerun)")
+    with pd.option_context("display.max_rows", None, "display.width", 200, "display.float_format", "{:,.2f}".format):
+        print(agregar(registros).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
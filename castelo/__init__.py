@@ -0,0 +1 @@
+# Castelo Forte - núcleo de dados e motores de cálculo compartilhados pelos apps.
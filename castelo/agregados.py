@@ -0,0 +1,193 @@
+import numpy as np
+
+from castelo.ledger import NULO, TRANSFERENCIA, proxima_versao
+
+
+def _somar_por(chaves, valores, destino, rotulos=None):
+    # Soma `valores` (centavos) agrupados por `chaves` inteiras e acumula no
+    # dict `destino`, rotulado por `rotulos(chaves únicas)`. O bincount soma em
+    # float64, exato para inteiros até 2**53 centavos.
+    if len(chaves) == 0:
+        return
+    unicas, inversa = np.unique(chaves, return_inverse=True)
+    somas = np.bincount(inversa, weights=valores, minlength=len(unicas))
+    nomes = unicas.tolist() if rotulos is None else rotulos(unicas)
+    for chave, soma in zip(nomes, somas.tolist()):
+        destino[chave] = destino.get(chave, 0) + int(soma)
+
+
+def _meses(datas):
+    # Datas -> mês como inteiro (meses desde 1970), chave barata de agrupar.
+    return datas.astype("datetime64[M]").astype(np.int64)
+
+
+def _rotulos_mes(meses):
+    return meses.astype("datetime64[M]").astype(str).tolist()
+
+
+def _rotulos_dicionario(dicionario):
+    def rotulos(codigos):
+        return [None if c == NULO else dicionario.valores[c] for c in codigos.tolist()]
+    return rotulos
+
+
+def _reais(centavos):
+    return {chave: total / 100 for chave, total in centavos.items()}
+
+
+class Agregados:
+    """Totais corridos do extrato, atualizados a cada inclusão.
+
+    Assina o Ledger e processa apenas as linhas novas, de modo que as telas
+    leem KPIs e quebras por categoria em O(categorias) sem varrer o extrato.
+    Linhas com status TRANSFERENCIA (aportes dos objetivos) ficam fora de
+    receitas e despesas, mas contam no saldo.
+    """
+
+    def __init__(self, ledger=None):
+        self._zerar()
+        if ledger is not None:
+            self.acompanhar(ledger)
+
+    def _zerar(self):
+        # Tudo em centavos (int); as leituras convertem para reais.
+        self._receitas_mes = {}
+        self._despesas_mes = {}
+        self._despesas_categoria = {}
+        self._despesas_mes_categoria = {}     # {mes: {categoria: centavos}}
+        self._saldo_conta = {}
+        self._total_status = {}
+        self._receitas = 0
+        self._despesas = 0
+        self._transferencias = 0    # líquido dos aportes/resgates: só entra no saldo
+        # Muda a cada atualização; chave dos caches de gráficos.
+        self.versao = proxima_versao()
+
+    def acompanhar(self, ledger, contabilizado=False):
+        # `contabilizado=True` quando os totais já vieram de outra fonte
+        # (ex.: GROUP BY no armazenamento) e só as próximas inclusões contam.
+        if len(ledger) and not contabilizado:
+            self.atualizar(ledger, 0, len(ledger))
+        ledger.subscribe(self.atualizar)
+
+    def somar_grupo(self, mes, categoria, conta, status, entrada, saida, liquido):
+        # Acumula um grupo pré-somado (mes, categoria, conta, status), em centavos.
+        self.versao = proxima_versao()
+        self._saldo_conta[conta] = self._saldo_conta.get(conta, 0) + liquido
+        self._total_status[status] = self._total_status.get(status, 0) + liquido
+        if status == TRANSFERENCIA:
+            self._transferencias += liquido
+            return
+        self._receitas += entrada
+        self._despesas += saida
+        if entrada:
+            self._receitas_mes[mes] = self._receitas_mes.get(mes, 0) + entrada
+        if saida:
+            self._despesas_mes[mes] = self._despesas_mes.get(mes, 0) + saida
+            self._despesas_categoria[categoria] = self._despesas_categoria.get(categoria, 0) + saida
+            do_mes = self._despesas_mes_categoria.setdefault(mes, {})
+            do_mes[categoria] = do_mes.get(categoria, 0) + saida
+
+    def atualizar(self, ledger, inicio, fim):
+        # Agrupa pelos códigos do Ledger (inteiros) e só rotula os grupos.
+        self.versao = proxima_versao()
+        valor = ledger.centavos(inicio, fim)
+        meses = _meses(ledger.column("Data", inicio, fim))
+        categoria = ledger.codigos("Categoria", inicio, fim)
+        rotulos_categoria = _rotulos_dicionario(ledger.dicionario("Categoria"))
+        contabil = ledger.contabeis(inicio, fim)
+        entrada = (valor > 0) & contabil
+        saida = (valor < 0) & contabil
+        gasto = -valor[saida]
+
+        self._transferencias += int(valor[~contabil].sum())
+        self._receitas += int(valor[entrada].sum())
+        self._despesas += int(gasto.sum())
+        _somar_por(meses[entrada], valor[entrada], self._receitas_mes, _rotulos_mes)
+        _somar_por(meses[saida], gasto, self._despesas_mes, _rotulos_mes)
+        _somar_por(categoria[saida], gasto, self._despesas_categoria, rotulos_categoria)
+        # Mês e categoria numa chave só: mês * (categorias + 1) + código + 1.
+        base = len(ledger.dicionario("Categoria")) + 1
+        chave_mc = meses[saida] * base + categoria[saida] + 1
+
+        def rotulos_mc(chaves):
+            return list(zip(_rotulos_mes(chaves // base), rotulos_categoria(chaves % base - 1)))
+        por_mc = {}
+        _somar_por(chave_mc, gasto, por_mc, rotulos_mc)
+        for (mes, nome), total in por_mc.items():
+            do_mes = self._despesas_mes_categoria.setdefault(mes, {})
+            do_mes[nome] = do_mes.get(nome, 0) + total
+        _somar_por(ledger.codigos("Conta", inicio, fim), valor, self._saldo_conta,
+                   _rotulos_dicionario(ledger.dicionario("Conta")))
+        _somar_por(ledger.codigos("Status", inicio, fim), valor, self._total_status,
+                   _rotulos_dicionario(ledger.dicionario("Status")))
+
+    # --- LEITURAS (O(1) / O(categorias)), em reais ---
+    def receitas(self):
+        return self._receitas / 100
+
+    def despesas(self):
+        return self._despesas / 100
+
+    def saldo(self):
+        return (self._receitas - self._despesas + self._transferencias) / 100
+
+    @property
+    def receitas_mes(self):
+        return _reais(self._receitas_mes)
+
+    @property
+    def despesas_mes(self):
+        return _reais(self._despesas_mes)
+
+    @property
+    def despesas_categoria(self):
+        return _reais(self._despesas_categoria)
+
+    @property
+    def despesas_mes_categoria(self):
+        # Chaves "mes|categoria", como na tabela `totais`.
+        return _reais(self._mes_categoria_plano())
+
+    def _mes_categoria_plano(self):
+        return {f"{mes}|{categoria}": total for mes, do_mes in self._despesas_mes_categoria.items()
+                for categoria, total in do_mes.items()}
+
+    @property
+    def saldo_conta(self):
+        return _reais(self._saldo_conta)
+
+    @property
+    def total_status(self):
+        return _reais(self._total_status)
+
+    def despesa_centavos(self, mes, categoria):
+        # Despesa de um (mês, categoria) em centavos, para comparar sem erro de
+        # arredondamento (ex.: limiares dos orçamentos).
+        return self._despesas_mes_categoria.get(mes, {}).get(categoria, 0)
+
+    def gastos_por_categoria(self, mes=None):
+        if mes is None:
+            return self.despesas_categoria
+        return _reais(self._despesas_mes_categoria.get(mes, {}))
+
+    # --- CONFERÊNCIA ---
+    def conferir(self, ledger):
+        # Recalcula tudo do zero e devolve a lista de divergências (vazia = ok).
+        # Em centavos as somas não dependem da ordem: a comparação é exata.
+        completo = Agregados()
+        completo.atualizar(ledger, 0, len(ledger))
+        divergencias = []
+        for nome in ("_receitas_mes", "_despesas_mes", "_despesas_categoria",
+                     "_despesas_mes_categoria", "_saldo_conta", "_total_status"):
+            if nome == "_despesas_mes_categoria":
+                atual, esperado = self._mes_categoria_plano(), completo._mes_categoria_plano()
+            else:
+                atual, esperado = getattr(self, nome), getattr(completo, nome)
+            for chave in set(atual) | set(esperado):
+                if atual.get(chave, 0) != esperado.get(chave, 0):
+                    divergencias.append((nome.lstrip("_"), chave, atual.get(chave), esperado.get(chave)))
+        for nome in ("_receitas", "_despesas", "_transferencias"):
+            if getattr(self, nome) != getattr(completo, nome):
+                divergencias.append((nome.lstrip("_"), None, getattr(self, nome), getattr(completo, nome)))
+        return divergencias
@@ -0,0 +1,438 @@
+import os
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from castelo.agregados import Agregados
+from castelo.ledger import COLUNAS, TRANSFERENCIA, Ledger, em_centavos
+
+CAMINHO_PADRAO = os.environ.get("CASTELO_DB", "castelo.db")
+
+# Linhas por lote nas leituras/escritas em massa.
+LOTE = 50_000
+
+# PRAGMA user_version: 1 = `totais` em centavos e valores arredondados ao centavo;
+# 2 = tabela `totais_dia`; 3 = aportes dos objetivos com status TRANSFERENCIA.
+VERSAO_ESQUEMA = 3
+NS_DIA = 86_400 * 10**9
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    data INTEGER NOT NULL,          -- nanossegundos desde a época (datetime64[ns])
+    descricao TEXT,
+    categoria TEXT,
+    valor REAL NOT NULL,
+    conta TEXT,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tx_data ON transactions (data);
+CREATE INDEX IF NOT EXISTS idx_tx_categoria ON transactions (categoria, data);
+CREATE INDEX IF NOT EXISTS idx_tx_conta ON transactions (conta, data);
+
+-- Totais pré-somados por grupo, mantidos a cada inserção: a partida a frio do
+-- dashboard lê só esta tabela (O(grupos)) em vez de agregar o extrato. Em
+-- centavos: inteiros num REAL somam sem erro de arredondamento.
+CREATE TABLE IF NOT EXISTS totais (
+    mes TEXT, categoria TEXT, conta TEXT, status TEXT,
+    entrada REAL NOT NULL DEFAULT 0,
+    saida REAL NOT NULL DEFAULT 0,
+    liquido REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (mes, categoria, conta, status)
+);
+CREATE INDEX IF NOT EXISTS idx_totais_mes ON totais (mes);
+
+-- Líquido por conta e dia (centavos), mantido como `totais`: as faturas dos
+-- cartões partem daqui sem ler as linhas. Por dia, e não por ciclo, porque o
+-- ciclo depende do fechamento do cartão, que pode mudar.
+CREATE TABLE IF NOT EXISTS totais_dia (
+    conta TEXT, dia INTEGER,        -- dias desde a época
+    liquido REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (conta, dia)
+);
+-- Só as linhas parceladas ("LOJA 03/10"), que as faturas ainda leem uma a uma.
+CREATE INDEX IF NOT EXISTS idx_tx_parcelas ON transactions (conta, data) WHERE descricao LIKE '%/%';
+
+CREATE TABLE IF NOT EXISTS budgets (
+    categoria TEXT PRIMARY KEY,
+    limite REAL NOT NULL
+);
+-- Tetos alterados a partir de um mês; `budgets` fica como o padrão.
+CREATE TABLE IF NOT EXISTS budgets_historico (
+    mes TEXT, categoria TEXT,
+    limite REAL NOT NULL,
+    PRIMARY KEY (mes, categoria)
+);
+-- Limiares de orçamento já disparados: cada um só uma vez por mês.
+CREATE TABLE IF NOT EXISTS alertas_orcamento (
+    mes TEXT, categoria TEXT, limiar REAL,
+    gasto REAL, limite REAL, quando TEXT,
+    PRIMARY KEY (mes, categoria, limiar)
+);
+CREATE TABLE IF NOT EXISTS cards (
+    nome TEXT PRIMARY KEY,
+    limite REAL, fechamento INTEGER, vencimento INTEGER, fatura_atual REAL,
+    conta TEXT
+);
+CREATE TABLE IF NOT EXISTS goals (
+    nome TEXT PRIMARY KEY,
+    alvo REAL, atual REAL, cor TEXT,
+    prazo TEXT, retorno REAL, volatilidade REAL
+);
+"""
+
+# Colunas acrescentadas depois da primeira versão do esquema, por tabela.
+COLUNAS_NOVAS = {
+    "cards": [("conta", "TEXT")],
+    "goals": [("prazo", "TEXT"), ("retorno", "REAL"), ("volatilidade", "REAL")],
+}
+
+# Ordem das colunas na tabela, espelhando COLUNAS do Ledger.
+CAMPOS = ["data", "descricao", "categoria", "valor", "conta", "status"]
+
+
+def _ns(datas):
+    return pd.to_datetime(datas).values.astype("datetime64[ns]").astype(np.int64)
+
+
+def _em_frame(linhas):
+    df = pd.DataFrame.from_records(linhas, columns=CAMPOS)
+    df["data"] = pd.to_datetime(df["data"].astype(np.int64), unit="ns")
+    df.columns = COLUNAS
+    return df
+
+
+class Armazenamento:
+    """Persistência local (SQLite) do extrato, orçamentos, cartões e metas.
+
+    As telas pedem só o que precisam: `consultar` usa os índices de data,
+    conta e categoria, e `carregar_agregados` devolve os totais do dashboard
+    via GROUP BY sem materializar as linhas. `somente_leitura` abre o banco
+    sem gravar nada nele (nem esquema nem migração), para leitores de fora do
+    app como a exportação; o banco precisa já estar na versão atual.
+    """
+
+    def __init__(self, caminho=CAMINHO_PADRAO, somente_leitura=False):
+        self.caminho = caminho
+        if somente_leitura:
+            self.conn = sqlite3.connect(f"{Path(caminho).absolute().as_uri()}?mode=ro", uri=True,
+                                        check_same_thread=False)
+            versao = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if versao != VERSAO_ESQUEMA:
+                self.conn.close()
+                raise ValueError(f"{caminho}: esquema na versão {versao}, esperada {VERSAO_ESQUEMA} "
+                                 "(abra o cliente no app para migrar)")
+            return
+        self.conn = sqlite3.connect(caminho, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(ESQUEMA)
+        self._migrar()
+
+    def _migrar(self):
+        # Bancos criados antes das colunas de COLUNAS_NOVAS.
+        for tabela, novas in COLUNAS_NOVAS.items():
+            colunas = {linha[1] for linha in self.conn.execute(f"PRAGMA table_info({tabela})")}
+            for coluna, tipo in novas:
+                if coluna not in colunas:
+                    with self.conn:
+                        self.conn.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {tipo}")
+        versao = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if versao < 1:
+            # Totais em reais (versão 0): valores levados ao centavo.
+            with self.conn:
+                self.conn.execute("UPDATE transactions SET valor = ROUND(valor, 2) WHERE valor != ROUND(valor, 2)")
+        if versao < 3:
+            # Aportes e resgates gravados como "Pago": categoria = nome do objetivo e a
+            # descrição que a tela de objetivos escreve. Gastos comuns da categoria ficam.
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE transactions SET status = ? WHERE categoria IN (SELECT nome FROM goals) "
+                    "AND (descricao = 'Aporte: ' || categoria OR descricao = 'Resgate: ' || categoria)",
+                    (TRANSFERENCIA,),
+                )
+        if versao < VERSAO_ESQUEMA:
+            self.reconstruir_totais()
+            self.conn.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+
+    def fechar(self):
+        self.conn.close()
+
+    # --- TRANSAÇÕES ---
+    def total_transacoes(self):
+        return self.conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def reconstruir_totais(self):
+        # Refaz `totais` e `totais_dia` a partir do extrato (ex.: banco de versão antiga).
+        with self.conn:
+            self.conn.execute("DELETE FROM totais_dia")
+            self.conn.execute(f"""
+                INSERT INTO totais_dia (conta, dia, liquido)
+                SELECT conta, data / {NS_DIA}, SUM(CAST(ROUND(valor * 100) AS INTEGER))
+                FROM transactions GROUP BY conta, data / {NS_DIA}
+            """)
+            self.conn.execute("DELETE FROM totais")
+            self.conn.execute("""
+                INSERT INTO totais (mes, categoria, conta, status, entrada, saida, liquido)
+                SELECT mes, categoria, conta, status,
+                       SUM(CASE WHEN centavos > 0 THEN centavos ELSE 0 END),
+                       SUM(CASE WHEN centavos < 0 THEN -centavos ELSE 0 END),
+                       SUM(centavos)
+                FROM (SELECT strftime('%Y-%m', data / 1000000000, 'unixepoch') AS mes, categoria, conta, status,
+                             CAST(ROUND(valor * 100) AS INTEGER) AS centavos FROM transactions)
+                GROUP BY mes, categoria, conta, status
+            """)
+
+    def vazio(self):
+        return self.conn.execute("SELECT 1 FROM transactions LIMIT 1").fetchone() is None
+
+    def inserir(self, linhas):
+        # Aceita DataFrame ou dict de colunas no esquema do extrato. Valores
+        # entram arredondados ao centavo, e os totais são somados em centavos.
+        n = len(linhas[COLUNAS[0]])
+        datas = _ns(linhas["Data"])
+        centavos = em_centavos(linhas["Valor"])
+        valores = centavos / 100
+        textos = [np.asarray(linhas[c], dtype=object) for c in ("Descrição", "Categoria", "Conta", "Status")]
+        grupos = pd.DataFrame({
+            "mes": datas.astype("datetime64[ns]").astype("datetime64[M]").astype(str),
+            "categoria": textos[1], "conta": textos[2], "status": textos[3],
+            "entrada": np.where(centavos > 0, centavos, 0),
+            "saida": np.where(centavos < 0, -centavos, 0),
+            "liquido": centavos,
+        }).groupby(["mes", "categoria", "conta", "status"], sort=False, dropna=False).sum().reset_index()
+        por_dia = pd.DataFrame({"conta": textos[2], "dia": datas // NS_DIA, "liquido": centavos}) \
+            .groupby(["conta", "dia"], sort=False, dropna=False).sum().reset_index()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO totais (mes, categoria, conta, status, entrada, saida, liquido) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(mes, categoria, conta, status) DO UPDATE SET "
+                "entrada = entrada + excluded.entrada, saida = saida + excluded.saida, liquido = liquido + excluded.liquido",
+                zip(*(grupos[c].tolist() for c in grupos.columns)),
+            )
+            self.conn.executemany(
+                "INSERT INTO totais_dia (conta, dia, liquido) VALUES (?, ?, ?) "
+                "ON CONFLICT(conta, dia) DO UPDATE SET liquido = liquido + excluded.liquido",
+                zip(*(por_dia[c].tolist() for c in por_dia.columns)),
+            )
+            for i in range(0, n, LOTE):
+                j = min(i + LOTE, n)
+                self.conn.executemany(
+                    "INSERT INTO transactions (data, descricao, categoria, valor, conta, status) VALUES (?, ?, ?, ?, ?, ?)",
+                    zip(datas[i:j].tolist(), textos[0][i:j].tolist(), textos[1][i:j].tolist(),
+                        valores[i:j].tolist(), textos[2][i:j].tolist(), textos[3][i:j].tolist()),
+                )
+
+    def acompanhar(self, ledger):
+        # Persiste cada inclusão feita no Ledger da sessão.
+        def gravar(ledger, inicio, fim):
+            self.inserir({c: ledger.column(c, inicio, fim) for c in COLUNAS})
+        ledger.subscribe(gravar)
+
+    def periodo(self):
+        # (menor, maior) data do extrato; O(log n) pelo índice de data
+        # (MIN e MAX na mesma consulta forçariam uma varredura).
+        minimo = self.conn.execute("SELECT MIN(data) FROM transactions").fetchone()[0]
+        maximo = self.conn.execute("SELECT MAX(data) FROM transactions").fetchone()[0]
+        if minimo is None:
+            return None, None
+        return pd.Timestamp(minimo, unit="ns"), pd.Timestamp(maximo, unit="ns")
+
+    def consultar(self, inicio=None, fim=None, conta=None, categoria=None, limite=None):
+        filtros, params = [], []
+        if inicio is not None:
+            filtros.append("data >= ?")
+            params.append(int(pd.Timestamp(inicio).value))
+        if fim is not None:
+            # `fim` é inclusivo no dia inteiro.
+            filtros.append("data < ?")
+            params.append(int((pd.Timestamp(fim).normalize() + pd.Timedelta(days=1)).value))
+        if conta is not None:
+            filtros.append("conta = ?")
+            params.append(conta)
+        if categoria is not None:
+            filtros.append("categoria = ?")
+            params.append(categoria)
+        sql = "SELECT data, descricao, categoria, valor, conta, status FROM transactions"
+        if filtros:
+            sql += " WHERE " + " AND ".join(filtros)
+        sql += " ORDER BY data DESC, id DESC"
+        if limite is not None:
+            sql += f" LIMIT {int(limite)}"
+        return _em_frame(self.conn.execute(sql, params).fetchall())
+
+    def carregar_ledger(self):
+        ledger = Ledger(capacidade=max(self.total_transacoes(), 1))
+        cursor = self.conn.execute(
+            "SELECT data, descricao, categoria, valor, conta, status FROM transactions ORDER BY id"
+        )
+        while True:
+            linhas = cursor.fetchmany(LOTE)
+            if not linhas:
+                break
+            ledger.extend(_em_frame(linhas))
+        return ledger
+
+    def totais_dia(self, conta):
+        # (dias datetime64[D], líquido em reais) da conta, em ordem de dia.
+        linhas = self.conn.execute(
+            "SELECT dia, liquido FROM totais_dia WHERE conta = ? ORDER BY dia", (conta,)
+        ).fetchall()
+        dias = np.array([d for d, _ in linhas], dtype=np.int64).astype("datetime64[D]")
+        return dias, np.array([v for _, v in linhas], dtype=np.float64) / 100
+
+    def parceladas(self, conta):
+        # Linhas da conta com "/" na descrição, pelo índice parcial idx_tx_parcelas.
+        return _em_frame(self.conn.execute(
+            "SELECT data, descricao, categoria, valor, conta, status FROM transactions "
+            "WHERE conta = ? AND descricao LIKE '%/%' ORDER BY data, id", (conta,)
+        ).fetchall())
+
+    def carregar_agregados(self):
+        # Reconstrói os totais corridos da tabela `totais`, sem trazer as linhas.
+        agg = Agregados()
+        cursor = self.conn.execute(
+            "SELECT mes, categoria, conta, status, entrada, saida, liquido FROM totais"
+        )
+        for mes, categoria, conta, status, entrada, saida, liquido in cursor:
+            agg.somar_grupo(mes, categoria, conta, status, int(entrada), int(saida), int(liquido))
+        return agg
+
+    def fluxo_mensal(self, meses=None):
+        # {mes: (receitas, despesas)} a partir da tabela `totais`, sem as transferências.
+        sql = "SELECT mes, SUM(entrada), SUM(saida) FROM totais WHERE status IS NOT ?"
+        params = [TRANSFERENCIA]
+        if meses is not None:
+            meses = list(meses)
+            if not meses:
+                return {}
+            sql += f" AND mes IN ({', '.join('?' * len(meses))})"
+            params += meses
+        sql += " GROUP BY mes"
+        return {mes: (entrada / 100, saida / 100) for mes, entrada, saida in self.conn.execute(sql, params)}
+
+    def categorias(self):
+        # Categorias que já aparecem no extrato, pela tabela `totais`.
+        return [c for (c,) in self.conn.execute("SELECT DISTINCT categoria FROM totais WHERE categoria IS NOT NULL")]
+
+    def meses(self):
+        # Meses com lançamentos ("2026-02"), em ordem, pela tabela `totais`.
+        return [m for (m,) in self.conn.execute("SELECT DISTINCT mes FROM totais ORDER BY mes")]
+
+    def gastos_categoria(self, mes):
+        # {categoria: saídas do mês}, maiores primeiro (sem as transferências).
+        return {categoria: total / 100 for categoria, total in self.conn.execute(
+            "SELECT categoria, SUM(saida) AS total FROM totais WHERE mes = ? AND status IS NOT ? "
+            "GROUP BY categoria HAVING total > 0 ORDER BY total DESC", (mes, TRANSFERENCIA)
+        )}
+
+    def iterar_mes(self, mes, lote=LOTE):
+        # Lançamentos do mês em ordem de data, em DataFrames de até `lote` linhas:
+        # a memória fica limitada ao lote, qualquer que seja o tamanho do mês.
+        inicio = np.datetime64(mes, "M")
+        cursor = self.conn.execute(
+            "SELECT data, descricao, categoria, valor, conta, status FROM transactions "
+            "WHERE data >= ? AND data < ? ORDER BY data, id",
+            (int(inicio.astype("datetime64[ns]").astype(np.int64)),
+             int((inicio + 1).astype("datetime64[ns]").astype(np.int64))),
+        )
+        while True:
+            linhas = cursor.fetchmany(lote)
+            if not linhas:
+                break
+            yield _em_frame(linhas)
+
+    # --- SNAPSHOT PARQUET (opcional, requer pyarrow) ---
+    def salvar_snapshot(self, caminho):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        cursor = self.conn.execute(
+            "SELECT data, descricao, categoria, valor, conta, status FROM transactions ORDER BY id"
+        )
+        writer = None
+        try:
+            while True:
+                linhas = cursor.fetchmany(LOTE)
+                if not linhas:
+                    break
+                tabela = pa.Table.from_pandas(_em_frame(linhas), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(caminho, tabela.schema)
+                writer.write_table(tabela)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def carregar_snapshot(self, caminho):
+        return Ledger.from_frame(pd.read_parquet(caminho))
+
+    # --- ORÇAMENTOS, CARTÕES E METAS ---
+    def carregar_budgets(self):
+        return dict(self.conn.execute("SELECT categoria, limite FROM budgets").fetchall())
+
+    def salvar_budget(self, categoria, limite, mes=None):
+        # Sem `mes`, muda o teto padrão; com `mes` ("2026-02"), vale daquele mês em diante.
+        with self.conn:
+            if mes is None:
+                self.conn.execute(
+                    "INSERT INTO budgets (categoria, limite) VALUES (?, ?) "
+                    "ON CONFLICT(categoria) DO UPDATE SET limite = excluded.limite",
+                    (categoria, limite),
+                )
+            else:
+                self.conn.execute(
+                    "INSERT INTO budgets_historico (mes, categoria, limite) VALUES (?, ?, ?) "
+                    "ON CONFLICT(mes, categoria) DO UPDATE SET limite = excluded.limite",
+                    (mes, categoria, limite),
+                )
+
+    def carregar_budgets_historico(self):
+        return self.conn.execute("SELECT mes, categoria, limite FROM budgets_historico").fetchall()
+
+    def carregar_alertas(self):
+        cursor = self.conn.execute(
+            "SELECT mes, categoria, limiar, gasto, limite, quando FROM alertas_orcamento ORDER BY quando, rowid"
+        )
+        campos = [d[0] for d in cursor.description]
+        return [dict(zip(campos, linha)) for linha in cursor]
+
+    def salvar_alerta(self, evento):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO alertas_orcamento (mes, categoria, limiar, gasto, limite, quando) "
+                "VALUES (:mes, :categoria, :limiar, :gasto, :limite, :quando)",
+                evento,
+            )
+
+    def carregar_cards(self):
+        cursor = self.conn.execute(
+            "SELECT nome, limite, fechamento, vencimento, fatura_atual, conta FROM cards ORDER BY rowid"
+        )
+        campos = [d[0] for d in cursor.description]
+        return [dict(zip(campos, linha)) for linha in cursor]
+
+    def salvar_card(self, card):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cards (nome, limite, fechamento, vencimento, fatura_atual, conta) "
+                "VALUES (:nome, :limite, :fechamento, :vencimento, :fatura_atual, :conta)",
+                {"fatura_atual": 0.0, "conta": None, **card},
+            )
+
+    def carregar_goals(self):
+        cursor = self.conn.execute(
+            "SELECT nome, alvo, atual, cor, prazo, retorno, volatilidade FROM goals ORDER BY rowid"
+        )
+        campos = [d[0] for d in cursor.description]
+        return [dict(zip(campos, linha)) for linha in cursor]
+
+    def salvar_goal(self, goal):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO goals (nome, alvo, atual, cor, prazo, retorno, volatilidade) "
+                "VALUES (:nome, :alvo, :atual, :cor, :prazo, :retorno, :volatilidade)",
+                {"prazo": None, "retorno": 0.0, "volatilidade": 0.0, **goal},
+            )
@@ -0,0 +1,234 @@
+import numpy as np
+import pandas as pd
+
+from castelo.importador import CATEGORIA_PADRAO
+
+CATEGORIA_RECEITA = "Receita"
+
+# Palavras-chave padrão (já normalizadas: minúsculas, sem acento).
+PALAVRAS_CHAVE = {
+    "Alimentação": ["supermercado", "mercado", "hortifruti", "padaria", "restaurante", "ifood", "rappi",
+                    "carrefour", "extra", "pao de acucar", "assai", "atacadao", "lanchonete", "acougue"],
+    "Transporte": ["uber", "99 pop", "99app", "cabify", "posto", "shell", "ipiranga", "petrobras", "combustivel",
+                   "estacionamento", "sem parar", "metro", "bilhete unico", "pedagio"],
+    "Lazer": ["netflix", "spotify", "disney", "prime video", "hbo", "cinema", "ingresso", "steam", "show"],
+    "Moradia": ["aluguel", "condominio", "enel", "light", "sabesp", "copasa", "comgas", "iptu", "internet", "vivo fibra"],
+    "Saúde": ["farmacia", "drogasil", "droga raia", "pague menos", "hospital", "clinica", "laboratorio", "unimed"],
+    "Receita": ["salario", "pro labore", "rendimento", "dividendo", "reembolso"],
+}
+
+# Padrões em texto (não compilados) para o pandas usar o regex nativo do Arrow.
+_ACENTOS = "[\u0300-\u036f]"
+_NAO_LETRAS = r"[^a-z0-9 ]+"
+_NUMEROS = r"\b\d+\b"
+_ESPACOS = r"\s+"
+
+
+def normalizar_descricoes(descricoes):
+    # "UBER *TRIP 4821 SAO PAULO" -> "uber trip sao paulo". Vetorizado sobre uma Series.
+    s = pd.Series(descricoes, dtype=object).fillna("").astype("str")
+    s = s.str.normalize("NFKD").str.replace(_ACENTOS, "", regex=True).str.lower()
+    s = s.str.replace(_NAO_LETRAS, " ", regex=True).str.replace(_NUMEROS, " ", regex=True)
+    return s.str.replace(_ESPACOS, " ", regex=True).str.strip()
+
+
+def _tokens(normalizadas):
+    # Uma linha por palavra, com o índice da descrição de origem.
+    return normalizadas.str.split(" ").explode()
+
+
+# --- CASADOR DE PALAVRAS-CHAVE (TRIE) ---
+def _trie_regex(no):
+    # Converte a trie em regex com prefixos fatorados: "uber|uberlandia" vira "uber(?:landia)?".
+    if "" in no and len(no) == 1:
+        return ""
+    opcional = "" in no
+    ramos = []
+    for letra in sorted(k for k in no if k):
+        # Termos normalizados só têm [a-z0-9 ]: nada a escapar.
+        ramos.append(letra + _trie_regex(no[letra]))
+    corpo = ramos[0] if len(ramos) == 1 else "(?:" + "|".join(ramos) + ")"
+    if opcional:
+        corpo = "(?:" + corpo + ")?"
+    return corpo
+
+
+class CasadorTermos:
+    """Acha a primeira palavra-chave conhecida numa descrição.
+
+    As palavras viram uma trie compilada numa única regex, então o lote
+    inteiro é casado com um `str.extract` em vez de um laço por termo.
+    """
+
+    def __init__(self, palavras_chave=None):
+        self.termos = {}
+        for categoria, termos in (palavras_chave or PALAVRAS_CHAVE).items():
+            for termo in termos:
+                self.termos[normalizar_descricoes([termo]).iloc[0]] = categoria
+        trie = {}
+        for termo in self.termos:
+            no = trie
+            for letra in termo:
+                no = no.setdefault(letra, {})
+            no[""] = {}
+        self.padrao = r"\b(" + _trie_regex(trie) + r")\b"
+
+    def categorizar(self, normalizadas):
+        achados = normalizadas.str.extract(self.padrao, expand=False)
+        return achados.map(self.termos)
+
+
+# --- MODELO LOCAL (NAIVE BAYES) ---
+class ModeloBayes:
+    """Naive Bayes multinomial sobre as palavras das descrições já categorizadas.
+
+    Treinado com as escolhas de `Categoria` do próprio usuário; só responde
+    quando a probabilidade da melhor categoria passa de `confianca`.
+    """
+
+    def __init__(self, confianca=0.6, suavizacao=1.0):
+        self.confianca = confianca
+        self.suavizacao = suavizacao
+        self.categorias = np.empty(0, dtype=object)
+        self.vocabulario = {}
+
+    def __len__(self):
+        return len(self.vocabulario)
+
+    def treinar(self, normalizadas, categorias, pesos=None):
+        normalizadas = pd.Series(normalizadas, dtype=object).reset_index(drop=True)
+        codigos, self.categorias = pd.factorize(pd.Series(categorias, dtype=object))
+        pesos = np.ones(len(codigos)) if pesos is None else np.asarray(pesos, dtype=np.float64)
+        tokens = _tokens(normalizadas)
+        tokens = tokens[tokens.str.len() >= 2]
+        ids, vocab = pd.factorize(tokens)
+        self.vocabulario = dict(zip(vocab, range(len(vocab))))
+        linhas = tokens.index.to_numpy()
+        contagem = np.zeros((len(self.categorias), len(vocab)))
+        np.add.at(contagem, (codigos[linhas], ids), pesos[linhas])
+        priori = np.bincount(codigos, weights=pesos, minlength=len(self.categorias))
+        self.log_priori = np.log(priori / priori.sum())
+        suavizada = contagem + self.suavizacao
+        self.log_prob = np.log(suavizada / suavizada.sum(axis=1, keepdims=True))
+        return self
+
+    def categorizar(self, normalizadas):
+        normalizadas = pd.Series(normalizadas, dtype=object)
+        saida = pd.Series(np.nan, index=normalizadas.index, dtype=object)
+        if not self.vocabulario:
+            return saida
+        tokens = _tokens(normalizadas.reset_index(drop=True))
+        ids = tokens.map(self.vocabulario).dropna()
+        if ids.empty:
+            return saida
+        linhas = ids.index.to_numpy()
+        pontos = np.zeros((len(normalizadas), len(self.categorias)))
+        np.add.at(pontos, linhas, self.log_prob[:, ids.to_numpy(dtype=np.int64)].T)
+        pontos += self.log_priori
+        pontos -= pontos.max(axis=1, keepdims=True)
+        prob = np.exp(pontos)
+        prob /= prob.sum(axis=1, keepdims=True)
+        melhor = prob.argmax(axis=1)
+        ok = np.zeros(len(normalizadas), dtype=bool)
+        ok[np.unique(linhas)] = True
+        ok &= prob[np.arange(len(melhor)), melhor] >= self.confianca
+        saida[ok] = self.categorias[melhor[ok]]
+        return saida
+
+
+# --- CATEGORIZADOR ---
+class Categorizador:
+    """Categoriza descrições de extrato em lote, em camadas:
+
+    1. tabela de descrições normalizadas com as escolhas do usuário;
+    2. palavras-chave (trie compilada);
+    3. modelo local opcional treinado com o histórico;
+    4. valores positivos sem regra viram "Receita"; o resto, "Sem Categoria".
+
+    Cada lote é fatorado: só as descrições distintas passam pelas camadas, e o
+    resultado fica em cache por descrição original.
+    """
+
+    def __init__(self, palavras_chave=None, usar_modelo=True, maximo_cache=200_000):
+        self.casador = CasadorTermos(palavras_chave)
+        self.modelo = ModeloBayes() if usar_modelo else None
+        self.tabela = {}
+        self.maximo_cache = maximo_cache
+        self._cache = {}
+        self.metricas = {"tabela": 0, "termos": 0, "modelo": 0, "sem_categoria": 0, "cache": 0}
+
+    def treinar(self, descricoes, categorias, vezes=None):
+        # Histórico do usuário -> tabela (categoria mais frequente por descrição) e modelo.
+        # `vezes` conta cada par quando ele já chega agrupado (ex.: `treinar_ledger`).
+        df = pd.DataFrame({"d": pd.Series(descricoes, dtype=object), "c": pd.Series(categorias, dtype=object),
+                           "n": 1 if vezes is None else np.asarray(vezes)})
+        df = df[df["c"].notna() & df["c"].ne(CATEGORIA_PADRAO)]
+        pares = df.groupby(["d", "c"], sort=False)["n"].sum().reset_index()
+        pares["d"] = normalizar_descricoes(pares["d"].to_numpy())
+        pares = pares[pares["d"].ne("")].groupby(["d", "c"], sort=False)["n"].sum().reset_index()
+        mais_frequente = pares.sort_values("n", ascending=False, kind="stable").drop_duplicates("d")
+        self.tabela = dict(zip(mais_frequente["d"], mais_frequente["c"]))
+        if self.modelo is not None and len(pares):
+            self.modelo.treinar(pares["d"], pares["c"], pares["n"])
+        self._cache.clear()
+        return self
+
+    def treinar_ledger(self, ledger):
+        # Pares (descrição, categoria) contados pelos códigos do Ledger: só os
+        # pares distintos são decodificados.
+        base = len(ledger.dicionario("Categoria")) + 1
+        chaves = ledger.codigos("Descrição").astype(np.int64) * base + ledger.codigos("Categoria") + 1
+        pares, vezes = np.unique(chaves, return_counts=True)
+        return self.treinar(ledger.dicionario("Descrição").decodificar(pares // base),
+                            ledger.dicionario("Categoria").decodificar(pares % base - 1), vezes)
+
+    def aprender(self, descricao, categoria):
+        # Escolha manual: vale na hora para a mesma descrição normalizada.
+        chave = normalizar_descricoes([descricao]).iloc[0]
+        if chave and categoria != CATEGORIA_PADRAO:
+            self.tabela[chave] = categoria
+            self._cache.clear()
+
+    def __call__(self, descricoes, valores=None):
+        descricoes = np.asarray(descricoes, dtype=object)
+        codigos, unicos = pd.factorize(descricoes)
+        saida = np.empty(len(unicos), dtype=object)
+        faltando = []
+        for i, d in enumerate(unicos):
+            cat = self._cache.get(d)
+            if cat is None:
+                faltando.append(i)
+            else:
+                saida[i] = cat
+        self.metricas["cache"] += len(unicos) - len(faltando)
+        if faltando:
+            faltando = np.asarray(faltando)
+            novos = self._resolver(pd.Series(unicos[faltando], dtype=object))
+            saida[faltando] = novos
+            if len(self._cache) + len(faltando) > self.maximo_cache:
+                self._cache.clear()
+            self._cache.update(zip(unicos[faltando], novos))
+        cats = saida[codigos] if len(codigos) else np.empty(0, dtype=object)
+        if valores is not None:
+            # A descrição não diz nada, mas dinheiro entrando é receita.
+            receita = (cats == CATEGORIA_PADRAO) & (np.asarray(valores, dtype=np.float64) > 0)
+            cats[receita] = CATEGORIA_RECEITA
+        return cats
+
+    def _resolver(self, unicos):
+        normalizadas = normalizar_descricoes(unicos.to_numpy())
+        cats = normalizadas.map(self.tabela).astype(object)
+        self.metricas["tabela"] += int(cats.notna().sum())
+        camadas = [("termos", self.casador.categorizar)]
+        if self.modelo is not None and len(self.modelo):
+            camadas.append(("modelo", self.modelo.categorizar))
+        for nome, camada in camadas:
+            falta = cats.isna()
+            if not falta.any():
+                break
+            achados = camada(normalizadas[falta])
+            cats[falta] = achados
+            self.metricas[nome] += int(achados.notna().sum())
+        sem = cats.isna()
+        self.metricas["sem_categoria"] += int(sem.sum())
+        return cats.fillna(CATEGORIA_PADRAO).to_numpy(dtype=object)
@@ -0,0 +1,286 @@
+# Exportação offline dos extratos mensais (fora do processo do Streamlit).
+#
+#   python -m castelo.exportacao <saida> [bancos ou pastas ...] [--mes 2026-02 | --todos]
+#                                [--formatos parquet,csv,relatorio] [--processos N]
+#
+# Sem bancos, exporta todos os clientes de CASTELO_DADOS. Cada cliente vira
+# <saida>/<cliente>/ com extrato-AAAA-MM.parquet, extrato-AAAA-MM.csv e o
+# relatório do mês. Os clientes rodam num pool de processos, cada um com sua
+# conexão SQLite; o extrato é lido mês a mês em lotes, então a memória de um
+# processo não cresce com o tamanho do cliente. Os bancos são abertos só para
+# leitura: a exportação não cria tabelas nem migra o esquema de ninguém.
+import argparse
+import glob
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+
+import pandas as pd
+
+from castelo.armazenamento import LOTE, Armazenamento
+from castelo.fluxo import FluxoMensal, rotulo_mes
+from castelo.sessoes import PASTA_USUARIOS
+
+FORMATOS = ("parquet", "csv", "relatorio")
+JANELA_FLUXO = 12           # meses no gráfico de fluxo do relatório
+MAIORES = 10                # maiores despesas listadas no relatório
+LARGURA, ALTURA = 1000, 1414  # folha A4 em retrato, em pixels
+PLOTLY_JS = "plotly.min.js"
+
+# CSV no formato dos bancos brasileiros, que o próprio importador lê de volta.
+OPCOES_CSV = dict(sep=";", decimal=",", date_format="%d/%m/%Y", index=False)
+
+
+def _esquema_parquet():
+    # Fixo: um lote sem nenhuma conta preenchida não pode virar coluna nula.
+    import pyarrow as pa
+    return pa.schema([
+        ("Data", pa.timestamp("ns")), ("Descrição", pa.string()), ("Categoria", pa.string()),
+        ("Valor", pa.float64()), ("Conta", pa.string()), ("Status", pa.string()),
+    ])
+
+
+@lru_cache(maxsize=None)
+def estatico_disponivel():
+    # PDF/PNG dependem do kaleido (opcional, fora do requirements.txt), que por
+    # sua vez precisa de um Chrome; sem os dois o relatório sai em HTML. Testado
+    # com uma figura vazia, uma vez por processo.
+    if importlib.util.find_spec("kaleido") is None:
+        return False
+    import plotly.io as pio
+    try:
+        pio.to_image({"data": [], "layout": {}}, format="png", width=10, height=10, validate=False)
+    except Exception:
+        return False
+    return True
+
+
+# --- EXTRATO DO MÊS ---
+def exportar_mes(arm, mes, pasta, formatos=FORMATOS, lote=LOTE):
+    # Parquet e CSV gravados lote a lote numa só leitura do mês; as maiores
+    # despesas do relatório são colhidas no mesmo passo.
+    nome = os.path.join(pasta, f"extrato-{mes}")
+    if "parquet" in formatos:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        esquema = _esquema_parquet()
+    writer = arquivo_csv = maiores = None
+    linhas = 0
+    try:
+        for df in arm.iterar_mes(mes, lote):
+            if "parquet" in formatos:
+                if writer is None:
+                    writer = pq.ParquetWriter(nome + ".parquet", esquema)
+                writer.write_table(pa.Table.from_pandas(df, schema=esquema, preserve_index=False))
+            if "csv" in formatos:
+                if arquivo_csv is None:
+                    arquivo_csv = open(nome + ".csv", "w", encoding="utf-8-sig", newline="")
+                df.to_csv(arquivo_csv, header=linhas == 0, **OPCOES_CSV)
+            if "relatorio" in formatos:
+                despesas = df[df["Valor"] < 0].nsmallest(MAIORES, "Valor")
+                maiores = despesas if maiores is None else pd.concat([maiores, despesas]).nsmallest(MAIORES, "Valor")
+            linhas += len(df)
+    finally:
+        if writer is not None:
+            writer.close()
+        if arquivo_csv is not None:
+            arquivo_csv.close()
+    arquivos = [nome + ext for ext, aberto in ((".parquet", writer), (".csv", arquivo_csv)) if aberto is not None]
+    return linhas, arquivos, maiores
+
+
+# --- RELATÓRIO DO MÊS ---
+def _moeda(valor):
+    return f"R$ {valor:,.2f}"
+
+
+@lru_cache(maxsize=None)
+def _molde():
+    # Folha montada (e validada pelo Plotly) uma vez por processo, com os
+    # gráficos do dashboard no tema claro; cada relatório só troca os dados.
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    from castelo.graficos import TEMAS, figura_categorias, figura_fluxo
+
+    fig = make_subplots(
+        rows=4, cols=2, row_heights=[0.08, 0.36, 0.3, 0.26], vertical_spacing=0.05,
+        specs=[[{"type": "table", "colspan": 2}, None], [{"type": "xy", "colspan": 2}, None],
+               [{"type": "domain"}, {"type": "table"}], [{"type": "table", "colspan": 2}, None]],
+        subplot_titles=("", f"Receitas vs Despesas (últimos {JANELA_FLUXO} meses)",
+                        "Gastos por Categoria", "", "Maiores Despesas do Mês"),
+    )
+    fig.add_trace(go.Table(header=dict(values=["Receitas", "Despesas", "Saldo do Mês", "Saldo Acumulado"])),
+                  row=1, col=1)
+    for trace in figura_fluxo({"Mês": [], "Receitas": [], "Despesas": [], "Saldo": []}).data:
+        fig.add_trace(trace, row=2, col=1)
+    fig.add_trace(figura_categorias({}).data[0], row=3, col=1)
+    fig.add_trace(go.Table(header=dict(values=["Categoria", "Gasto", "%"]),
+                           cells=dict(align=["left", "right", "right"])), row=3, col=2)
+    fig.add_trace(go.Table(
+        columnwidth=[1, 4, 2, 2, 2], header=dict(values=["Data", "Descrição", "Categoria", "Conta", "Valor"]),
+        cells=dict(align=["left", "left", "left", "left", "right"]),
+    ), row=4, col=1)
+    fig.update_layout(**TEMAS["light"], width=LARGURA, height=ALTURA, showlegend=False)
+    return fig.to_dict()
+
+
+def _com(trace, **dados):
+    return {**trace, **dados}
+
+
+def _celulas(trace, colunas):
+    return _com(trace, cells={**trace.get("cells", {}), "values": colunas})
+
+
+def folha_relatorio(cliente, mes, serie, gastos, maiores):
+    # Resumo, fluxo dos últimos meses, categorias e maiores despesas numa folha
+    # (dict de figura, já no formato que o Plotly grava sem revalidar).
+    molde = _molde()
+    resumo, receitas, despesas, saldo, pizza, categorias, tabela_maiores = molde["data"]
+    janela = serie.loc[:mes].iloc[-JANELA_FLUXO:]
+    do_mes = janela.iloc[-1] if mes in janela.index else {"Receitas": 0.0, "Despesas": 0.0, "Saldo": 0.0}
+    meses = janela["Mês"].tolist()
+    total = sum(gastos.values()) or 1.0
+    data = [
+        _celulas(resumo, [[_moeda(do_mes[c])] for c in ("Receitas", "Despesas", "Saldo")]
+                 + [[_moeda(serie.loc[:mes, "Saldo"].sum())]]),
+        *(_com(trace, x=meses, y=janela[c].tolist())
+          for trace, c in ((receitas, "Receitas"), (despesas, "Despesas"), (saldo, "Saldo"))),
+        _com(pizza, labels=list(gastos), values=list(gastos.values())),
+        _celulas(categorias, [list(gastos), [_moeda(v) for v in gastos.values()],
+                              [f"{v / total * 100:.1f}%" for v in gastos.values()]]),
+        _celulas(tabela_maiores, [] if maiores is None or maiores.empty else [
+            maiores["Data"].dt.strftime("%d/%m").tolist(), maiores["Descrição"].tolist(),
+            maiores["Categoria"].tolist(), maiores["Conta"].tolist(), [_moeda(v) for v in maiores["Valor"]],
+        ]),
+    ]
+    layout = {**molde["layout"], "title": {"text": f"Castelo Forte · Revisão de {rotulo_mes(mes)} · {cliente}"}}
+    return {"data": data, "layout": layout}
+
+
+def gravar_relatorio(fig, nome, estatico):
+    # PDF e PNG estáticos com o kaleido; sem ele, HTML que usa o plotly.min.js
+    # da pasta de saída (abre offline e imprime em PDF pelo navegador).
+    import plotly.io as pio
+
+    if estatico:
+        pio.write_image(fig, nome + ".pdf", validate=False)
+        pio.write_image(fig, nome + ".png", validate=False)
+        return [nome + ".pdf", nome + ".png"]
+    pio.write_html(fig, nome + ".html", include_plotlyjs=f"../{PLOTLY_JS}", full_html=True, validate=False)
+    return [nome + ".html"]
+
+
+def preparar_saida(saida, formatos=FORMATOS):
+    # Uma cópia do Plotly.js para todos os relatórios HTML do lote.
+    os.makedirs(saida, exist_ok=True)
+    caminho = os.path.join(saida, PLOTLY_JS)
+    if "relatorio" in formatos and not estatico_disponivel() and not os.path.exists(caminho):
+        from plotly.offline import get_plotlyjs
+        with open(caminho, "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+
+
+# --- CLIENTE E LOTE ---
+def exportar_cliente(caminho, saida, meses=None, todos=False, formatos=FORMATOS, lote=LOTE):
+    # `meses` explícitos, `todos` os meses do extrato, ou só o último mês com lançamentos.
+    if not os.path.exists(caminho):
+        raise FileNotFoundError(caminho)
+    t0 = time.perf_counter()
+    cliente = os.path.splitext(os.path.basename(caminho))[0]
+    pasta = os.path.join(saida, cliente)
+    os.makedirs(pasta, exist_ok=True)
+    preparar_saida(saida, formatos)
+    estatico = estatico_disponivel()
+    arm = Armazenamento(caminho, somente_leitura=True)
+    try:
+        disponiveis = arm.meses()
+        if meses is None:
+            meses = disponiveis if todos else disponiveis[-1:]
+        fluxo = FluxoMensal(arm) if "relatorio" in formatos else None
+        linhas, arquivos = 0, []
+        for mes in meses:
+            n, gravados, maiores = exportar_mes(arm, mes, pasta, formatos, lote)
+            linhas += n
+            arquivos += gravados
+            if fluxo is not None:
+                fig = folha_relatorio(cliente, mes, fluxo.serie(), arm.gastos_categoria(mes), maiores)
+                arquivos += gravar_relatorio(fig, os.path.join(pasta, f"relatorio-{mes}"), estatico)
+    finally:
+        arm.fechar()
+    return {
+        "cliente": cliente, "meses": len(meses), "linhas": linhas,
+        "bytes": sum(os.path.getsize(a) for a in arquivos),
+        "segundos": time.perf_counter() - t0, "erro": None,
+    }
+
+
+def _exportar_seguro(caminho, saida, **opcoes):
+    # Um cliente com banco corrompido não derruba o lote.
+    try:
+        return exportar_cliente(caminho, saida, **opcoes)
+    except Exception as e:
+        cliente = os.path.splitext(os.path.basename(caminho))[0]
+        return {"cliente": cliente, "meses": 0, "linhas": 0, "bytes": 0, "segundos": 0.0,
+                "erro": f"{type(e).__name__}: {e}"}
+
+
+def exportar_lote(caminhos, saida, processos=None, **opcoes):
+    # Gera o resultado de cada cliente, na ordem de `caminhos`, conforme o pool termina.
+    caminhos = list(caminhos)
+    preparar_saida(saida, opcoes.get("formatos", FORMATOS))
+    processos = processos or os.cpu_count() or 1
+    tarefa = partial(_exportar_seguro, saida=saida, **opcoes)
+    if processos == 1:
+        yield from map(tarefa, caminhos)
+        return
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        yield from pool.map(tarefa, caminhos, chunksize=max(1, len(caminhos) // (processos * 8)))
+
+
+def bancos(alvos):
+    # Arquivos .db informados, ou os castelo-*.db de cada pasta.
+    caminhos = []
+    for alvo in alvos:
+        if os.path.isdir(alvo):
+            caminhos += sorted(glob.glob(os.path.join(alvo, "castelo-*.db")))
+        else:
+            caminhos.append(alvo)
+    return caminhos
+
+
+def main():
+    p = argparse.ArgumentParser(description="Extratos mensais (Parquet/CSV) e relatórios dos clientes.")
+    p.add_argument("saida")
+    p.add_argument("bancos", nargs="*", help=f"bancos .db ou pastas de clientes (padrão: {PASTA_USUARIOS})")
+    p.add_argument("--mes", action="append", help="mês AAAA-MM (repetível); padrão: o último com lançamentos")
+    p.add_argument("--todos", action="store_true", help="todos os meses do extrato")
+    p.add_argument("--formatos", default=",".join(FORMATOS))
+    p.add_argument("--processos", type=int, default=None)
+    args = p.parse_args()
+    formatos = tuple(f for f in args.formatos.split(",") if f)
+    desconhecidos = set(formatos) - set(FORMATOS)
+    if desconhecidos:
+        p.error(f"formatos desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    caminhos = bancos(args.bancos or [PASTA_USUARIOS])
+    if "relatorio" in formatos and not estatico_disponivel():
+        print("kaleido indisponível: relatórios em HTML (sem PDF/PNG).", file=sys.stderr)
+    t0 = time.perf_counter()
+    linhas = erros = 0
+    for r in exportar_lote(caminhos, args.saida, args.processos, meses=args.mes, todos=args.todos, formatos=formatos):
+        linhas += r["linhas"]
+        if r["erro"]:
+            erros += 1
+            print(f"{r['cliente']}: {r['erro']}", file=sys.stderr)
+    segundos = time.perf_counter() - t0
+    print(f"{len(caminhos)} clientes, {linhas:,} lançamentos em {segundos:.1f} s ({erros} com erro)")
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+TAMANHOS_PAGINA = [25, 50, 100, 250, 500]
+TAMANHO_PAGINA_PADRAO = 50
+
+COR_NEGATIVO = 'color: #e74c3c; font-weight: bold;'
+COR_POSITIVO = 'color: #2ecc71; font-weight: bold;'
+
+# Quantas páginas estilizadas ficam em cache por sessão.
+MAX_PAGINAS_CACHE = 16
+
+
+def total_paginas(linhas, tamanho):
+    return max(1, -(-linhas // tamanho))
+
+
+def cores_valor(valores):
+    # Classe de cor de cada célula de Valor, calculada de uma vez com NumPy.
+    return np.where(np.asarray(valores) < 0, COR_NEGATIVO, COR_POSITIVO)
+
+
+def tamanho_payload(df):
+    # Bytes que o Streamlit envia ao navegador (o st.dataframe serializa em Arrow IPC).
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return int(df.memory_usage(deep=True).sum())
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, tabela.schema) as writer:
+        writer.write_table(tabela)
+    return sink.getvalue().size
+
+
+class PaginasExtrato:
+    """Extrato paginado: só a fatia visível é materializada e estilizada.
+
+    O Styler de cada página fica em cache (LRU) pela chave
+    (versão do ledger, filtros, página, tamanho), então reruns sem mudança
+    reaproveitam o estilo já calculado. A versão é única no processo
+    (`proxima_versao`), então um estado recriado depois de despejado não
+    casa com páginas do anterior.
+    """
+
+    def __init__(self, maximo=MAX_PAGINAS_CACHE):
+        self._cache = OrderedDict()
+        self._maximo = maximo
+
+    def pagina(self, ledger, posicoes, filtros, pagina, tamanho):
+        chave = (ledger.versao, filtros, pagina, tamanho)
+        if chave in self._cache:
+            self._cache.move_to_end(chave)
+            return self._cache[chave]
+
+        t0 = time.perf_counter()
+        inicio = (pagina - 1) * tamanho
+        fatia = ledger.take(posicoes[inicio:inicio + tamanho])
+        estilo = fatia.style.apply(cores_valor, subset=['Valor'])
+        resultado = {
+            "styler": estilo,
+            "linhas": len(fatia),
+            "payload": tamanho_payload(fatia),
+            "ms_preparo": (time.perf_counter() - t0) * 1e3,
+        }
+        self._cache[chave] = resultado
+        if len(self._cache) > self._maximo:
+            self._cache.popitem(last=False)
+        return resultado
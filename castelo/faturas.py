@@ -0,0 +1,261 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from castelo.ledger import proxima_versao
+from castelo.simulador import mes_fechamento, mes_vencimento
+
+# "MAGAZINE LUIZA 03/10" ou "LOJA X PARC 03/10": parcela 3 de 10.
+_PARCELA = re.compile(r"^(.*?)\s*(?:PARC(?:ELA)?\s*)?(\d{1,2})/(\d{1,2})\s*$")
+MAX_PARCELAS = 48
+
+ABERTA, FECHADA, FUTURA, PAGA = "Aberta", "Fechada", "Futura", "Paga"
+
+
+def conta_do_card(card):
+    # Conta do extrato onde caem as compras do cartão; por padrão, o próprio nome.
+    return card.get("conta") or card["nome"]
+
+
+def ciclos(datas, fechamento):
+    # Mês de fechamento de cada compra (vetorizado; mesma regra de `mes_fechamento`).
+    datas = np.asarray(datas, dtype="datetime64[D]")
+    meses = datas.astype("datetime64[M]")
+    dia = (datas - meses.astype("datetime64[D]")).astype(np.int64) + 1
+    return meses + (dia >= fechamento).astype(np.int64)
+
+
+def _dia_no_mes(mes, dia):
+    # Dia `dia` do mês, limitado ao último dia (fechamento 31 em fevereiro cai no dia 28/29).
+    ultimo = ((mes + 1).astype("datetime64[D]") - mes.astype("datetime64[D]")).astype(np.int64)
+    return mes.astype("datetime64[D]") + (min(dia, ultimo) - 1)
+
+
+def separar_parcelas(descricoes):
+    # -> (posições, base, parcela, total) só das linhas parceladas. O regex roda
+    # apenas onde há "/", então lotes sem parcelas (e inclusões unitárias) saem baratos.
+    posicoes, bases, ks, ns = [], [], [], []
+    for i, d in enumerate(descricoes):
+        if "/" not in d:
+            continue
+        m = _PARCELA.match(d)
+        if m is None:
+            continue
+        k, n = int(m.group(2)), int(m.group(3))
+        if 1 <= k <= n and 2 <= n <= MAX_PARCELAS:
+            posicoes.append(i)
+            bases.append(m.group(1).strip().upper())
+            ks.append(k)
+            ns.append(n)
+    return posicoes, bases, ks, ns
+
+
+def dividir_parcelas(valor, n):
+    # `valor` em `n` parcelas que somam exatamente o total; os centavos que
+    # sobram da divisão vão na primeira, como as operadoras cobram.
+    centavos = round(abs(valor) * 100)
+    sinal = -1 if valor < 0 else 1
+    base, resto = divmod(centavos, n)
+    return [sinal * (base + resto) / 100] + [sinal * base / 100] * (n - 1)
+
+
+def _mes(ciclo):
+    # Chave dos dicionários por ciclo: meses desde 1970.
+    return int(np.datetime64(ciclo, "M").astype(np.int64))
+
+
+def _a_projetar(vistas):
+    # Parcelas j ainda projetadas: compras (o maior número de parcelas iguais já
+    # vistas) menos as que já passaram de j. Parcela antiga chegando fora de
+    # ordem não reabre projeção.
+    compras = max(vistas)
+    projetar = [0] * len(vistas)
+    passaram = 0
+    for j in range(len(vistas) - 1, 0, -1):
+        passaram = max(passaram, vistas[j])
+        projetar[j] = compras - passaram
+    return projetar
+
+
+class Faturas:
+    """Faturas de cada cartão por ciclo, mantidas incrementalmente.
+
+    Cada compra na conta do cartão entra no ciclo do seu fechamento. Compras
+    parceladas ("LOJA 01/10") projetam as parcelas restantes nos ciclos
+    seguintes; quando a parcela seguinte chega no extrato, ela substitui a
+    projeção. Totais ficam em dicionários por ciclo (chave: meses desde 1970,
+    um int, que custa bem menos que um datetime64 como chave), então as
+    consultas não dependem do tamanho do extrato. Faturas com vencimento
+    passado são consideradas pagas. Na partida a frio, `carregar_resumo`
+    parte dos totais por dia do armazenamento e só das linhas parceladas.
+    """
+
+    def __init__(self, cards, ledger=None):
+        self.cards = {c["nome"]: c for c in cards}
+        self._por_conta = {conta_do_card(c): c["nome"] for c in cards}
+        self._reais = {nome: {} for nome in self.cards}
+        self._projetadas = {nome: {} for nome in self.cards}
+        self._parceladas = {nome: {} for nome in self.cards}
+        self._ultimo = {nome: None for nome in self.cards}    # último ciclo com valor (real ou projetado)
+        self._resumos = {}
+        self.versao = proxima_versao()
+        if ledger is not None:
+            self.acompanhar(ledger)
+
+    def contas(self):
+        return list(self._por_conta)
+
+    def acompanhar(self, ledger, contabilizado=False):
+        # `contabilizado=True` quando as linhas já vieram de `carregar`.
+        if len(ledger) and not contabilizado:
+            self.atualizar(ledger, 0, len(ledger))
+        ledger.subscribe(self.atualizar)
+
+    def atualizar(self, ledger, inicio, fim):
+        contas = ledger.column("Conta", inicio, fim)
+        dos_cards = np.isin(contas, list(self._por_conta))
+        if not dos_cards.any():
+            return
+        self.carregar({c: ledger.column(c, inicio, fim)[dos_cards] for c in ("Data", "Descrição", "Valor", "Conta")})
+
+    def carregar(self, linhas):
+        # `linhas`: dict/DataFrame com Data, Descrição, Valor e Conta (só dos cartões).
+        contas = np.asarray(linhas["Conta"], dtype=object)
+        for conta in pd.unique(contas):
+            nome = self._por_conta.get(conta)
+            if nome is None:
+                continue
+            sel = contas == conta
+            datas = np.asarray(linhas["Data"], dtype="datetime64[ns]")[sel]
+            valores = -np.asarray(linhas["Valor"], dtype=np.float64)[sel]    # compra negativa soma na fatura
+            self._somar(nome, datas, valores)
+            self._parcelas(nome, datas, np.asarray(linhas["Descrição"], dtype=object)[sel], valores)
+        self.versao = proxima_versao()
+        self._resumos.clear()
+
+    def carregar_resumo(self, conta, dias, totais, parceladas):
+        # Partida a frio: `dias`/`totais` são as compras somadas por dia da conta
+        # (em reais, saídas negativas) e `parceladas` as linhas com "/" na descrição.
+        nome = self._por_conta.get(conta)
+        if nome is None:
+            return
+        if len(dias):
+            self._somar(nome, dias, -np.asarray(totais, dtype=np.float64))
+        if len(parceladas):
+            self._parcelas(nome, np.asarray(parceladas["Data"], dtype="datetime64[ns]"),
+                           np.asarray(parceladas["Descrição"], dtype=object),
+                           -np.asarray(parceladas["Valor"], dtype=np.float64))
+        self.versao = proxima_versao()
+        self._resumos.clear()
+
+    def _somar(self, nome, datas, valores):
+        ciclo = ciclos(datas, self.cards[nome]["fechamento"]).astype(np.int64)
+        unicos, pos = np.unique(ciclo, return_inverse=True)
+        somas = np.bincount(pos, weights=valores, minlength=len(unicos))
+        reais = self._reais[nome]
+        for c, s in zip(unicos.tolist(), somas.tolist()):
+            reais[c] = reais.get(c, 0.0) + s
+        self._estender(nome, unicos[-1])
+
+    def _parcelas(self, nome, datas, descricoes, valores):
+        posicoes, bases, ks, ns = separar_parcelas(descricoes)
+        if not posicoes:
+            return
+        ciclo = ciclos(datas[posicoes], self.cards[nome]["fechamento"]).astype(np.int64).tolist()
+        for c, i, base, k, n in zip(ciclo, posicoes, bases, ks, ns):
+            self._parcela(nome, base, k, n, round(float(valores[i]), 2), c)
+
+    def _parcela(self, nome, base, k, n, valor, ciclo):
+        # Compras iguais (mesma loja, valor e total) só se misturam se a 1ª parcela
+        # caiu no mesmo ciclo; aí são contadas: `vistas[j]` é quantas parcelas j já
+        # chegaram. A projeção sai só das contagens, então não depende da ordem.
+        inicio = ciclo - (k - 1)
+        chave = (base, n, valor, inicio)
+        projetadas = self._projetadas[nome]
+        vistas = self._parceladas[nome].get(chave)
+        if vistas is None:
+            # Compra nova (o caso comum): projeta as parcelas seguintes direto.
+            vistas = self._parceladas[nome][chave] = [0] * (n + 1)
+            vistas[k] = 1
+            for c in range(inicio + k, inicio + n):
+                projetadas[c] = projetadas.get(c, 0.0) + valor
+        else:
+            antes = _a_projetar(vistas)
+            vistas[k] += 1
+            depois = _a_projetar(vistas)
+            for j in range(1, n + 1):
+                if depois[j] != antes[j]:
+                    c = inicio + (j - 1)
+                    projetadas[c] = projetadas.get(c, 0.0) + (depois[j] - antes[j]) * valor
+        self._estender(nome, inicio + (n - 1))
+
+    def _estender(self, nome, ciclo):
+        ciclo = int(ciclo)
+        if self._ultimo[nome] is None or ciclo > self._ultimo[nome]:
+            self._ultimo[nome] = ciclo
+
+    # --- CONSULTAS ---
+    def total(self, nome, ciclo):
+        ciclo = _mes(ciclo)
+        return self._reais[nome].get(ciclo, 0.0) + self._projetadas[nome].get(ciclo, 0.0)
+
+    def ciclo_aberto(self, nome, hoje=None):
+        hoje = pd.Timestamp.today() if hoje is None else pd.Timestamp(hoje)
+        return mes_fechamento(hoje, self.cards[nome]["fechamento"])
+
+    def datas_ciclo(self, nome, ciclo):
+        card = self.cards[nome]
+        ciclo = np.datetime64(ciclo, "M")
+        fechamento = _dia_no_mes(ciclo, card["fechamento"])
+        venc = _dia_no_mes(mes_vencimento(ciclo, card["fechamento"], card["vencimento"]), card["vencimento"])
+        return fechamento, venc
+
+    def status(self, nome, ciclo, hoje=None):
+        hoje = np.datetime64(pd.Timestamp.today() if hoje is None else pd.Timestamp(hoje), "D")
+        aberto = self.ciclo_aberto(nome, hoje)
+        ciclo = np.datetime64(ciclo, "M")
+        if ciclo == aberto:
+            return ABERTA
+        if ciclo > aberto:
+            return FUTURA
+        return FECHADA if self.datas_ciclo(nome, ciclo)[1] >= hoje else PAGA
+
+    def resumo(self, nome, hoje=None):
+        # Fatura aberta, fechada a vencer, parcelas futuras e o próximo vencimento;
+        # memorizado por dia até o próximo lançamento do cartão.
+        hoje = np.datetime64(pd.Timestamp.today() if hoje is None else pd.Timestamp(hoje), "D")
+        chave = (nome, hoje)
+        if chave not in self._resumos:
+            self._resumos[chave] = self._resumir(nome, hoje)
+        return self._resumos[chave]
+
+    def _resumir(self, nome, hoje):
+        aberto = self.ciclo_aberto(nome, hoje)
+        fechada = self.total(nome, aberto - 1) if self.datas_ciclo(nome, aberto - 1)[1] >= hoje else 0.0
+        # Só os ciclos entre o aberto e o último com lançamento ou parcela (no máximo MAX_PARCELAS).
+        ultimo = self._ultimo[nome]
+        ate = 0 if ultimo is None else min(ultimo - _mes(aberto), MAX_PARCELAS)
+        futuras = sum(self.total(nome, aberto + j) for j in range(1, ate + 1))
+        aberta = self.total(nome, aberto)
+        proximo = self.datas_ciclo(nome, aberto - 1 if fechada else aberto)[1]
+        return {
+            "ciclo": aberto,
+            "aberta": float(aberta),
+            "fechada": float(fechada),
+            "futuras": float(futuras),
+            "comprometido": max(float(aberta + fechada + futuras), 0.0),
+            "vencimento": proximo,
+            "dias_vencimento": int((proximo - hoje).astype(np.int64)),
+        }
+
+    def faturas(self, nome, hoje=None):
+        ciclos_card = sorted(set(self._reais[nome]) | set(self._projetadas[nome]))
+        linhas = []
+        for c in np.array(ciclos_card, dtype=np.int64).astype("datetime64[M]"):
+            fech, venc = self.datas_ciclo(nome, c)
+            linhas.append({
+                "Ciclo": str(c), "Fechamento": pd.Timestamp(fech), "Vencimento": pd.Timestamp(venc),
+                "Total": self.total(nome, c), "Status": self.status(nome, c, hoje),
+            })
+        return pd.DataFrame(linhas, columns=["Ciclo", "Fechamento", "Vencimento", "Total", "Status"])
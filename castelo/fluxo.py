@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+MESES_PT = ["Jan", "Fev", "Mar", "Abr", "Mai", "Jun", "Jul", "Ago", "Set", "Out", "Nov", "Dez"]
+
+
+def rotulo_mes(mes):
+    # "2026-02" -> "Fev/26"
+    ano, m = str(mes).split("-")[:2]
+    return f"{MESES_PT[int(m) - 1]}/{ano[2:]}"
+
+
+class FonteLedger:
+    # Recalcula meses a partir do Ledger em memória, usando o índice por data.
+
+    def __init__(self, ledger, indices):
+        self.ledger = ledger
+        self.indices = indices
+
+    def fluxo_mensal(self, meses=None):
+        if meses is None:
+            inicio, fim = self.indices.periodo()
+            if inicio is None:
+                return {}
+            meses = np.arange(np.datetime64(inicio, "M"), np.datetime64(fim, "M") + 1).astype(str)
+        resultado = {}
+        valores = self.ledger.centavos()
+        contabeis = self.ledger.contabeis()
+        for mes in meses:
+            m = np.datetime64(mes, "M")
+            pos = self.indices.filtrar(inicio=m.astype("datetime64[ns]"), fim=(m + 1).astype("datetime64[ns]"))
+            v = valores[pos][contabeis[pos]]
+            resultado[str(mes)] = (int(v[v > 0].sum()) / 100, int(-v[v < 0].sum()) / 100)
+        return resultado
+
+
+class FluxoMensal:
+    """Série mensal de receitas, despesas e fluxo líquido, memorizada.
+
+    A tabela de meses só é recalculada para os meses tocados por novas
+    inclusões (`invalidar`/`acompanhar`); o resto da história fica em cache.
+    `fonte` é qualquer objeto com `fluxo_mensal(meses)` devolvendo
+    {mes: (receitas, despesas)} — o Armazenamento ou uma FonteLedger.
+    """
+
+    def __init__(self, fonte):
+        self.fonte = fonte
+        self._tabela = None         # {mes: (receitas, despesas)}
+        self._sujos = set()
+        self._serie = None
+        self.meses_recalculados = 0
+
+    def acompanhar(self, ledger):
+        ledger.subscribe(self._ao_incluir)
+
+    def _ao_incluir(self, ledger, inicio, fim):
+        meses = np.unique(ledger.column("Data", inicio, fim).astype("datetime64[M]")).astype(str)
+        self.invalidar(meses.tolist())
+
+    def invalidar(self, meses):
+        self._sujos.update(meses)
+
+    def _atualizar(self):
+        if self._tabela is None:
+            self._tabela = dict(self.fonte.fluxo_mensal())
+            self.meses_recalculados += len(self._tabela)
+            self._sujos.clear()
+            self._serie = None
+        elif self._sujos:
+            novos = self.fonte.fluxo_mensal(sorted(self._sujos))
+            self._tabela.update(novos)
+            self.meses_recalculados += len(self._sujos)
+            self._sujos.clear()
+            self._remendar(novos)
+
+    def _remendar(self, novos):
+        # Atualiza só as linhas dos meses recalculados; um mês fora da faixa
+        # atual muda o eixo e obriga a remontar a série (O(meses)).
+        if self._serie is None:
+            return
+        if not all(m in self._serie.index for m in novos):
+            self._serie = None
+            return
+        serie = self._serie.copy(deep=False)
+        for mes, (receitas, despesas) in novos.items():
+            serie.loc[mes, ["Receitas", "Despesas", "Saldo"]] = [receitas, despesas, receitas - despesas]
+        self._serie = serie
+
+    def serie(self, ultimos=None):
+        # DataFrame com Mês, Receitas, Despesas e Saldo (líquido do mês), sem
+        # buracos entre o primeiro e o último mês; `ultimos` limita a janela.
+        self._atualizar()
+        if self._serie is None:
+            if not self._tabela:
+                self._serie = pd.DataFrame(columns=["Mês", "Receitas", "Despesas", "Saldo"])
+            else:
+                meses = sorted(self._tabela)
+                todos = np.arange(np.datetime64(meses[0], "M"), np.datetime64(meses[-1], "M") + 1).astype(str)
+                receitas = np.array([self._tabela.get(m, (0.0, 0.0))[0] for m in todos])
+                despesas = np.array([self._tabela.get(m, (0.0, 0.0))[1] for m in todos])
+                self._serie = pd.DataFrame({
+                    "Mês": [rotulo_mes(m) for m in todos],
+                    "Receitas": receitas,
+                    "Despesas": despesas,
+                    "Saldo": receitas - despesas,
+                }, index=pd.Index(todos, name="mes"))
+        return self._serie if ultimos is None else self._serie.iloc[-ultimos:]
@@ -0,0 +1,82 @@
+import plotly.graph_objects as go
+from plotly.colors import sequential
+
+# Layout por tema. O antigo `bg_color` não existe no Plotly: o fundo da área
+# do gráfico é `plot_bgcolor`.
+TEMAS = {
+    "dark": dict(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font_color='#fff'),
+    "light": dict(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font_color='#001529'),
+}
+TEMA_PADRAO = "dark"
+
+
+class CacheFiguras:
+    """Figuras Plotly reaproveitadas entre reruns.
+
+    Cada figura é guardada pelo nome com a (versão dos dados, tema) com que
+    foi montada. Mesma chave: devolve a figura pronta. Versão nova com mesmo
+    tema e mesma estrutura: `remendar` troca só os dados dos traces. Caso
+    contrário, `construir` monta do zero.
+    """
+
+    def __init__(self):
+        self._itens = {}
+        self.metricas = {"reusos": 0, "remendos": 0, "construcoes": 0}
+
+    def obter(self, nome, versao, tema, construir, remendar=None):
+        item = self._itens.get(nome)
+        if item is not None and item["tema"] == tema:
+            if item["versao"] == versao:
+                self.metricas["reusos"] += 1
+                return item["fig"]
+            if remendar is not None and remendar(item["fig"]):
+                self.metricas["remendos"] += 1
+                item["versao"] = versao
+                return item["fig"]
+        fig = construir()
+        fig.update_layout(**TEMAS.get(tema, TEMAS[TEMA_PADRAO]))
+        self.metricas["construcoes"] += 1
+        self._itens[nome] = {"versao": versao, "tema": tema, "fig": fig}
+        return fig
+
+
+# --- FIGURAS DO DASHBOARD ---
+def figura_fluxo(df_fluxo):
+    fig_line = go.Figure()
+    fig_line.add_trace(go.Scatter(x=df_fluxo['Mês'], y=df_fluxo['Receitas'], name='Receitas', line=dict(color='#2ecc71', width=3)))
+    fig_line.add_trace(go.Scatter(x=df_fluxo['Mês'], y=df_fluxo['Despesas'], name='Despesas', line=dict(color='#e74c3c', width=3)))
+    fig_line.add_trace(go.Bar(x=df_fluxo['Mês'], y=df_fluxo['Saldo'], name='Saldo Líquido', marker_color='#D4AF37', opacity=0.3))
+    fig_line.update_layout(title="Receitas vs Despesas")
+    return fig_line
+
+
+def remendar_fluxo(df_fluxo):
+    def remendar(fig):
+        if len(fig.data) != 3:
+            return False
+        x = df_fluxo['Mês'].tolist()
+        with fig.batch_update():
+            for trace, coluna in zip(fig.data, ['Receitas', 'Despesas', 'Saldo']):
+                trace.x = x
+                trace.y = df_fluxo[coluna].to_numpy()
+        return True
+    return remendar
+
+
+def figura_categorias(gastos):
+    # Equivalente ao px.pie anterior, sem passar pelo plotly.express.
+    return go.Figure(go.Pie(
+        labels=list(gastos.keys()), values=list(gastos.values()), hole=0.4,
+        marker=dict(colors=sequential.RdBu),
+    ))
+
+
+def remendar_categorias(gastos):
+    def remendar(fig):
+        if len(fig.data) != 1:
+            return False
+        with fig.batch_update():
+            fig.data[0].labels = list(gastos.keys())
+            fig.data[0].values = list(gastos.values())
+        return True
+    return remendar
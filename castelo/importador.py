@@ -0,0 +1,318 @@
+import io
+import re
+import time
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from castelo.ledger import COLUNAS
+
+TAMANHO_LOTE = 50_000
+CATEGORIA_PADRAO = "Sem Categoria"
+
+# Cabeçalhos comuns de extratos bancários -> coluna do extrato.
+SINONIMOS = {
+    "data": "Data", "date": "Data", "dt": "Data", "data lancamento": "Data",
+    "descricao": "Descrição", "historico": "Descrição", "memo": "Descrição", "description": "Descrição",
+    "lancamento": "Descrição", "estabelecimento": "Descrição",
+    "categoria": "Categoria", "category": "Categoria",
+    "valor": "Valor", "amount": "Valor", "value": "Valor", "valor (r$)": "Valor",
+    "conta": "Conta", "account": "Conta",
+    "status": "Status",
+}
+
+
+def _sem_acento(texto):
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+
+
+def _texto(arquivo, encoding):
+    # Aceita caminho, arquivo texto ou binário (ex.: UploadedFile do Streamlit).
+    if isinstance(arquivo, str):
+        return open(arquivo, encoding=encoding, newline="")
+    if isinstance(arquivo, io.TextIOBase):
+        return arquivo
+    return io.TextIOWrapper(arquivo, encoding=encoding, newline="")
+
+
+def _converter_datas(texto):
+    # Extratos repetem muito as datas: converte só os valores distintos.
+    codigos, unicos = pd.factorize(texto)
+    datas = _converter_unicos(pd.Series(unicos, dtype=object).astype(str))
+    return pd.Series(datas.to_numpy()[codigos], index=texto.index).where(codigos >= 0)
+
+
+def _converter_unicos(texto):
+    # ISO (2026-02-06) ou brasileiro (06/02/2026); formatos fixos primeiro, que
+    # são vetorizados, e o parser genérico só para o que sobrar.
+    iso = texto.str.match(r"^\d{4}-\d{2}-\d{2}")
+    datas = pd.Series(pd.NaT, index=texto.index, dtype="datetime64[ns]")
+    if iso.any():
+        datas[iso] = pd.to_datetime(texto[iso], format="ISO8601", errors="coerce")
+    br = ~iso
+    if br.any():
+        datas[br] = pd.to_datetime(texto[br], format="%d/%m/%Y", errors="coerce")
+    faltando = datas.isna() & texto.ne("") & texto.ne("nan")
+    if faltando.any():
+        datas[faltando] = pd.to_datetime(texto[faltando], dayfirst=True, errors="coerce", format="mixed")
+    return datas
+
+
+def normalizar_lote(df, conta="Importado"):
+    # Converte um lote qualquer para o esquema do extrato (Data ... Status).
+    df = df.rename(columns=lambda c: SINONIMOS.get(_sem_acento(str(c)).strip().lower(), c))
+    if "Data" not in df or "Valor" not in df:
+        raise ValueError("Extrato sem colunas de data e valor reconhecíveis.")
+    valor = df["Valor"]
+    if valor.dtype == object or pd.api.types.is_string_dtype(valor):
+        # Formato brasileiro ("1.234,56") só quando há vírgula; "-450.00" passa direto.
+        texto = valor.astype(str).str.strip()
+        br = texto.str.contains(",", regex=False)
+        texto = texto.where(~br, texto.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+        valor = pd.to_numeric(texto, errors="coerce")
+    valor = valor.to_numpy(dtype=np.float64)
+    datas = df["Data"]
+    if not pd.api.types.is_datetime64_any_dtype(datas):
+        datas = _converter_datas(datas.astype(str).str.strip())
+    n = len(df)
+    lote = {
+        "Data": np.asarray(datas, dtype="datetime64[ns]"),
+        "Descrição": df["Descrição"].astype(object).to_numpy() if "Descrição" in df else np.full(n, "", dtype=object),
+        "Categoria": df["Categoria"].astype(object).to_numpy() if "Categoria" in df else np.full(n, CATEGORIA_PADRAO, dtype=object),
+        "Valor": valor,
+        "Conta": df["Conta"].astype(object).to_numpy() if "Conta" in df else np.full(n, conta, dtype=object),
+        "Status": df["Status"].astype(object).to_numpy() if "Status" in df else np.where(valor < 0, "Pago", "Recebido").astype(object),
+    }
+    validas = ~(np.isnat(lote["Data"]) | np.isnan(valor))
+    if not validas.all():
+        lote = {c: v[validas] for c, v in lote.items()}
+    return lote
+
+
+# --- LEITORES EM STREAMING ---
+def ler_csv(arquivo, conta="Importado", tamanho_lote=TAMANHO_LOTE, encoding="utf-8", **kwargs_csv):
+    # Gera lotes já no esquema do extrato, sem carregar o arquivo inteiro.
+    with pd.read_csv(_texto(arquivo, encoding), chunksize=tamanho_lote, dtype=str, **kwargs_csv) as leitor:
+        for df in leitor:
+            yield normalizar_lote(df, conta=conta)
+
+
+BLOCO_LEITURA = 1 << 20
+_ABRE_TRN = "<STMTTRN>"
+_CONTA_OFX = re.compile(r"<(?:ACCTID|ORG)>([^<\r\n]+)")
+_CAMPOS_OFX = {
+    "Data": r"<DTPOSTED>\s*(\d{8})",
+    "Valor": r"<TRNAMT>\s*([-+]?[\d.,]+)",
+    "MEMO": r"<MEMO>([^<\r\n]*)",
+    "NAME": r"<NAME>([^<\r\n]*)",
+}
+
+
+def ler_ofx(arquivo, conta=None, tamanho_lote=TAMANHO_LOTE, encoding="latin-1"):
+    # Gera lotes a partir dos <STMTTRN> do OFX (SGML ou XML). O arquivo é lido
+    # em blocos; cada lote de registros é extraído de uma vez com `str.extract`.
+    # A conta vem de ACCTID/ORG do cabeçalho se não for informada.
+    texto = _texto(arquivo, encoding)
+    buffer, registros, conta_ofx = "", [], conta
+    cabecalho = True
+    while True:
+        parte = texto.read(BLOCO_LEITURA)
+        buffer += parte
+        if cabecalho:
+            inicio = buffer.find(_ABRE_TRN)
+            if inicio < 0 and parte:
+                continue
+            if conta_ofx is None:
+                m = _CONTA_OFX.search(buffer[:inicio if inicio >= 0 else len(buffer)])
+                conta_ofx = m.group(1).strip() if m else "Importado"
+            buffer = buffer[inicio:] if inicio >= 0 else ""
+            cabecalho = False
+        pedacos = buffer.split(_ABRE_TRN)
+        if parte:
+            # O último pedaço pode estar incompleto: fica para a próxima leitura.
+            registros.extend(pedacos[1:-1])
+            buffer = _ABRE_TRN + pedacos[-1]
+        else:
+            registros.extend(p for p in pedacos[1:] if p)
+        while len(registros) >= tamanho_lote:
+            yield _lote_ofx(registros[:tamanho_lote], conta_ofx)
+            registros = registros[tamanho_lote:]
+        if not parte:
+            break
+    if registros:
+        yield _lote_ofx(registros, conta_ofx)
+
+
+def _lote_ofx(registros, conta):
+    blocos = pd.Series(registros, dtype=object)
+    campos = {nome: blocos.str.extract(padrao, expand=False) for nome, padrao in _CAMPOS_OFX.items()}
+    df = pd.DataFrame({
+        "Data": pd.to_datetime(campos["Data"], format="%Y%m%d", errors="coerce"),
+        "Descrição": campos["MEMO"].fillna(campos["NAME"]).fillna("").str.strip(),
+        "Valor": pd.to_numeric(campos["Valor"].str.replace(",", ".", regex=False), errors="coerce"),
+    })
+    return normalizar_lote(df, conta=conta)
+
+
+# --- AGREGADOR FALSO (substitui a Pluggy localmente) ---
+class AgregadorFalso:
+    """Simula a API de transações da Pluggy (páginas de JSON) sem rede."""
+
+    def __init__(self, transacoes=1_000, conta="Pluggy", semente=0):
+        self.conta = conta
+        rng = np.random.default_rng(semente)
+        lojas = np.array(["Supermercado", "Uber", "Netflix", "Farmácia", "Posto Shell", "iFood", "Aluguel"])
+        self._datas = pd.Timestamp.today().normalize() - pd.to_timedelta(rng.integers(0, 365, transacoes), unit="D")
+        self._lojas = lojas[rng.integers(0, len(lojas), transacoes)]
+        self._valores = -rng.gamma(2.0, 80.0, transacoes).round(2)
+
+    def transacoes(self, conta_id, pagina=1, tamanho=500):
+        total = len(self._valores)
+        inicio, fim = (pagina - 1) * tamanho, min(pagina * tamanho, total)
+        return {
+            "total": total,
+            "totalPages": max(1, -(-total // tamanho)),
+            "page": pagina,
+            "results": [
+                {"id": f"{conta_id}-{i}", "date": self._datas[i].isoformat(),
+                 "description": str(self._lojas[i]), "amount": float(self._valores[i])}
+                for i in range(inicio, fim)
+            ],
+        }
+
+
+def ler_pluggy(cliente, conta_id, conta="Pluggy", tamanho=500):
+    pagina, total_paginas = 1, 1
+    while pagina <= total_paginas:
+        resposta = cliente.transacoes(conta_id, pagina=pagina, tamanho=tamanho)
+        total_paginas = resposta["totalPages"]
+        resultados = resposta["results"]
+        if resultados:
+            df = pd.DataFrame(resultados).rename(columns={"date": "Data", "description": "Descrição", "amount": "Valor"})
+            df["Data"] = pd.to_datetime(df["Data"], format="ISO8601")
+            yield normalizar_lote(df[["Data", "Descrição", "Valor"]], conta=conta)
+        pagina += 1
+
+
+# --- DEDUPLICAÇÃO ---
+def hashes_linhas(lote):
+    # Hash de 64 bits por linha sobre (Data, Descrição, Valor em centavos, Conta).
+    df = pd.DataFrame({
+        "Data": np.asarray(lote["Data"], dtype="datetime64[ns]").view(np.int64),
+        "Descrição": pd.Series(lote["Descrição"], dtype=object),
+        "Valor": np.rint(np.asarray(lote["Valor"], dtype=np.float64) * 100).astype(np.int64),
+        "Conta": pd.Series(lote["Conta"], dtype=object),
+    })
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+class ContagemHashes:
+    # Multiconjunto de hashes em arrays NumPy ordenados (busca binária vetorizada).
+
+    def __init__(self):
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._contagem = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def somar(self, hashes):
+        unicos, qtd = np.unique(hashes, return_counts=True)
+        onde = np.searchsorted(self._hashes, unicos)
+        existe = onde < len(self._hashes)
+        existe[existe] = self._hashes[onde[existe]] == unicos[existe]
+        np.add.at(self._contagem, onde[existe], qtd[existe])
+        novos = ~existe
+        if novos.any():
+            self._hashes = np.insert(self._hashes, onde[novos], unicos[novos])
+            self._contagem = np.insert(self._contagem, onde[novos], qtd[novos])
+
+    def contar(self, hashes):
+        if len(self._hashes) == 0:
+            return np.zeros(len(hashes), dtype=np.int64)
+        onde = np.minimum(np.searchsorted(self._hashes, hashes), len(self._hashes) - 1)
+        return np.where(self._hashes[onde] == hashes, self._contagem[onde], 0)
+
+
+class IndiceHashes(ContagemHashes):
+    """Contagem de linhas do extrato por hash, para deduplicar importações.
+
+    Guarda quantas vezes cada hash já existe: duas corridas de Uber idênticas
+    no mesmo dia continuam sendo duas, mas reimportar o mesmo arquivo não
+    duplica nada. Não assina o Ledger: como ele só cresce, as linhas que
+    entraram desde a última contagem (`_ate` em diante) são hasheadas e
+    fundidas de uma vez na próxima `contar`, e `Ledger.append` segue O(1).
+    """
+
+    def __init__(self, ledger=None):
+        super().__init__()
+        self._ledger = None
+        self._ate = 0       # linhas do Ledger já contadas
+        if ledger is not None:
+            self.acompanhar(ledger)
+
+    def __len__(self):
+        self._em_dia()
+        return super().__len__()
+
+    def acompanhar(self, ledger):
+        self._ledger = ledger
+        self._ate = 0
+
+    def _em_dia(self):
+        fim = 0 if self._ledger is None else len(self._ledger)
+        if self._ate < fim:
+            self.somar(hashes_linhas({c: self._ledger.column(c, self._ate, fim)
+                                      for c in ("Data", "Descrição", "Valor", "Conta")}))
+            self._ate = fim
+
+    def contar(self, hashes):
+        self._em_dia()
+        return super().contar(hashes)
+
+
+class Importador:
+    """Importa lotes (CSV, OFX, agregador) para o Ledger com deduplicação.
+
+    Cada lote entra com um único `ledger.extend`, então os ouvintes
+    (armazenamento, agregados, índices) também trabalham em lote. Linhas sem
+    categoria passam por `categorizar(descricoes, valores)`, se informado.
+    """
+
+    def __init__(self, ledger, indice_hashes, categorizar=None):
+        self.ledger = ledger
+        self.hashes = indice_hashes
+        self.categorizar = categorizar
+
+    def importar(self, lotes):
+        stats = {"lidas": 0, "inseridas": 0, "duplicadas": 0, "segundos": 0.0}
+        t0 = time.perf_counter()
+        # A k-ésima ocorrência de uma linha no arquivo só entra se o extrato
+        # tinha menos de k cópias dela antes desta importação.
+        vistos, inseridos = ContagemHashes(), ContagemHashes()
+        for lote in lotes:
+            n = len(lote["Data"])
+            stats["lidas"] += n
+            hashes = hashes_linhas(lote)
+            serie = pd.Series(hashes)
+            ocorrencia = serie.groupby(serie, sort=False).cumcount().to_numpy() + vistos.contar(hashes)
+            existentes = self.hashes.contar(hashes) - inseridos.contar(hashes)
+            mascara = ocorrencia >= existentes
+            vistos.somar(hashes)
+            inseridos.somar(hashes[mascara])
+            if not mascara.all():
+                lote = {c: v[mascara] for c, v in lote.items()}
+            novos = len(lote["Data"])
+            stats["duplicadas"] += n - novos
+            if novos == 0:
+                continue
+            if self.categorizar is not None:
+                sem_cat = lote["Categoria"] == CATEGORIA_PADRAO
+                if sem_cat.any():
+                    lote["Categoria"] = lote["Categoria"].copy()
+                    lote["Categoria"][sem_cat] = self.categorizar(lote["Descrição"][sem_cat], lote["Valor"][sem_cat])
+            self.ledger.extend({c: lote[c] for c in COLUNAS})
+            stats["inseridas"] += novos
+        stats["segundos"] = time.perf_counter() - t0
+        return stats
@@ -0,0 +1,197 @@
+import numpy as np
+
+from castelo.ledger import NULO
+
+
+# Linhas fora de ordem de data esperam numa lista lateral ordenada até passar
+# de max(LIMITE_FORA, √n); só aí são intercaladas no índice. As leituras
+# consultam as duas listas sem intercalar.
+LIMITE_FORA = 256
+
+
+class _Posicoes:
+    # Lista crescente de posições (int64, ou outro dtype) com capacidade que dobra.
+
+    def __init__(self, capacidade=64, dtype=np.int64):
+        self._buf = np.empty(capacidade, dtype=dtype)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    def extend(self, posicoes):
+        necessario = self._n + len(posicoes)
+        if necessario > len(self._buf):
+            cap = len(self._buf)
+            while cap < necessario:
+                cap *= 2
+            novo = np.empty(cap, dtype=self._buf.dtype)
+            novo[:self._n] = self._buf[:self._n]
+            self._buf = novo
+        self._buf[self._n:necessario] = posicoes
+        self._n = necessario
+
+    def array(self):
+        return self._buf[:self._n]
+
+    def substituir(self, valores):
+        self._buf = np.empty(max(2 * len(valores), 64), dtype=self._buf.dtype)
+        self._buf[:len(valores)] = valores
+        self._n = len(valores)
+
+
+def _agrupar(codigos, posicoes, destino, dicionario):
+    # Agrupa pelos códigos do Ledger (inteiros); o dict fica pelo texto.
+    if len(codigos) == 0:
+        return
+    if len(codigos) == 1:
+        # Inclusão manual: sem np.unique/argsort para uma linha só.
+        if codigos[0] != NULO:
+            chave = dicionario.valores[codigos[0]]
+            if chave not in destino:
+                destino[chave] = _Posicoes()
+            destino[chave].extend(posicoes)
+        return
+    unicas, inversa = np.unique(codigos, return_inverse=True)
+    ordem = np.argsort(inversa, kind="stable")
+    cortes = np.cumsum(np.bincount(inversa, minlength=len(unicas)))[:-1]
+    for codigo, grupo in zip(unicas.tolist(), np.split(posicoes[ordem], cortes)):
+        if codigo == NULO:
+            continue
+        chave = dicionario.valores[codigo]
+        if chave not in destino:
+            destino[chave] = _Posicoes()
+        destino[chave].extend(grupo)
+
+
+class IndicesExtrato:
+    """Índices do Ledger para os filtros do extrato.
+
+    Mantém as posições ordenadas por data (busca binária por período) e as
+    listas de posições por conta e por categoria, todas em buffers que dobram:
+    incluir custa O(1) amortizado, e linhas com data atrasada passam por uma
+    lista lateral intercalada de uma vez. `filtrar` parte do menor
+    conjunto candidato, então o custo acompanha o tamanho do resultado e não
+    o do extrato.
+    """
+
+    def __init__(self, ledger=None):
+        self._datas = _Posicoes(dtype="datetime64[ns]")
+        self._ordem = _Posicoes()
+        self._fora_datas = np.empty(0, dtype="datetime64[ns]")
+        self._fora_ordem = np.empty(0, dtype=np.int64)
+        self.por_conta = {}
+        self.por_categoria = {}
+        self._ledger = None
+        if ledger is not None:
+            self.acompanhar(ledger)
+
+    def acompanhar(self, ledger):
+        self._ledger = ledger
+        if len(ledger):
+            self.atualizar(ledger, 0, len(ledger))
+        ledger.subscribe(self.atualizar)
+
+    def atualizar(self, ledger, inicio, fim):
+        posicoes = np.arange(inicio, fim, dtype=np.int64)
+        datas = ledger.column("Data", inicio, fim)
+        if len(datas) > 1:
+            ordem = np.argsort(datas, kind="stable")
+            datas, posicoes_ordenadas = datas[ordem], posicoes[ordem]
+        else:
+            posicoes_ordenadas = posicoes
+        if len(self._datas) == 0 or datas[0] >= self._datas.array()[-1]:
+            # Caso comum (lançamentos em ordem): O(1) amortizado no fim do buffer.
+            self._datas.extend(datas)
+            self._ordem.extend(posicoes_ordenadas)
+        else:
+            # Fora de ordem: só a lista lateral (pequena) é recopiada.
+            onde = np.searchsorted(self._fora_datas, datas, side="right")
+            self._fora_datas = np.insert(self._fora_datas, onde, datas)
+            self._fora_ordem = np.insert(self._fora_ordem, onde, posicoes_ordenadas)
+            if len(self._fora_datas) > max(LIMITE_FORA, int(np.sqrt(len(self._datas)))):
+                self._intercalar()
+        _agrupar(ledger.codigos("Conta", inicio, fim), posicoes, self.por_conta, ledger.dicionario("Conta"))
+        _agrupar(ledger.codigos("Categoria", inicio, fim), posicoes, self.por_categoria, ledger.dicionario("Categoria"))
+
+    def _intercalar(self):
+        # Leva a lista lateral para o índice principal (O(n), uma vez por lote de atrasados).
+        if len(self._fora_datas) == 0:
+            return
+        datas = self._datas.array()
+        onde = np.searchsorted(datas, self._fora_datas, side="right")
+        self._datas.substituir(np.insert(datas, onde, self._fora_datas))
+        self._ordem.substituir(np.insert(self._ordem.array(), onde, self._fora_ordem))
+        self._fora_datas = self._fora_datas[:0]
+        self._fora_ordem = self._fora_ordem[:0]
+
+    # --- LEITURAS ---
+    def periodo(self):
+        # Pontas das duas listas ordenadas: O(1), sem intercalar a lateral.
+        pontas = [d[i] for d in (self._datas.array(), self._fora_datas) if len(d) for i in (0, -1)]
+        if not pontas:
+            return None, None
+        return min(pontas), max(pontas)
+
+    def contas(self):
+        return sorted(self.por_conta)
+
+    def categorias(self):
+        return sorted(self.por_categoria)
+
+    @staticmethod
+    def _faixa(datas, inicio, fim):
+        esq = 0 if inicio is None else np.searchsorted(datas, np.datetime64(inicio, "ns"), side="left")
+        dir_ = len(datas) if fim is None else np.searchsorted(datas, np.datetime64(fim, "ns"), side="left")
+        return esq, dir_
+
+    def _por_data(self, esq, dir_, fora_esq, fora_dir):
+        # Posições do período em ordem de data: a fatia do índice principal com
+        # a da lista lateral encaixada (O(resultado), o índice fica como está).
+        pos = self._ordem.array()[esq:dir_]
+        if fora_dir > fora_esq:
+            onde = np.searchsorted(self._datas.array()[esq:dir_], self._fora_datas[fora_esq:fora_dir], side="right")
+            pos = np.insert(pos, onde, self._fora_ordem[fora_esq:fora_dir])
+        return pos
+
+    def filtrar(self, inicio=None, fim=None, conta=None, categoria=None):
+        # Posições que atendem aos filtros, das mais recentes para as mais antigas.
+        # `inicio` é inclusivo e `fim` exclusivo (datetime64/Timestamp).
+        esq, dir_ = self._faixa(self._datas.array(), inicio, fim)
+        fora_esq, fora_dir = self._faixa(self._fora_datas, inicio, fim)
+        candidatos = [("data", dir_ - esq + fora_dir - fora_esq)]
+        if conta is not None:
+            candidatos.append(("conta", len(self.por_conta.get(conta, ()))))
+        if categoria is not None:
+            candidatos.append(("categoria", len(self.por_categoria.get(categoria, ()))))
+        base = min(candidatos, key=lambda c: c[1])[0]
+
+        ledger = self._ledger
+        if base == "data":
+            pos = self._por_data(esq, dir_, fora_esq, fora_dir)
+        else:
+            # Conta/categoria sem nenhuma linha (ex.: só com orçamento): resultado vazio.
+            indice = self.por_conta.get(conta) if base == "conta" else self.por_categoria.get(categoria)
+            pos = indice.array() if indice is not None else np.empty(0, dtype=np.int64)
+        if len(pos) == 0:
+            return pos
+
+        # Confere os demais critérios só sobre os candidatos.
+        mascara = np.ones(len(pos), dtype=bool)
+        if base != "data" and (inicio is not None or fim is not None):
+            datas = ledger.column("Data")[pos]
+            if inicio is not None:
+                mascara &= datas >= np.datetime64(inicio, "ns")
+            if fim is not None:
+                mascara &= datas < np.datetime64(fim, "ns")
+        # Texto comparado pelo código: sem decodificar a coluna.
+        if base != "conta" and conta is not None:
+            mascara &= ledger.codigos("Conta")[pos] == ledger.dicionario("Conta").procurar(conta)
+        if base != "categoria" and categoria is not None:
+            mascara &= ledger.codigos("Categoria")[pos] == ledger.dicionario("Categoria").procurar(categoria)
+        pos = pos[mascara]
+
+        datas = ledger.column("Data")[pos]
+        if base != "data":
+            pos = pos[np.argsort(datas, kind="stable")]
+        return pos[::-1]
@@ -0,0 +1,240 @@
+import itertools
+import sys
+
+import numpy as np
+import pandas as pd
+
+# --- ESQUEMA DO EXTRATO ---
+COLUNAS = ["Data", "Descrição", "Categoria", "Valor", "Conta", "Status"]
+
+# Colunas de texto guardadas como códigos no dicionário da coluna: cada
+# descrição, categoria, conta ou status distinto existe uma vez só.
+CATEGORICAS = ("Descrição", "Categoria", "Conta", "Status")
+
+# Tipo de cada buffer. Valor fica em centavos inteiros, então as somas são exatas.
+DTYPES = {
+    "Data": "datetime64[ns]",
+    "Descrição": np.int32,
+    "Categoria": np.int32,
+    "Valor": np.int64,
+    "Conta": np.int32,
+    "Status": np.int32,
+}
+
+CAPACIDADE_INICIAL = 1024
+NULO = -1                   # código de texto ausente (None/NaN), como nos Categorical do pandas
+
+# Status dos aportes e resgates dos objetivos: o dinheiro só muda de lugar, então
+# a linha mexe no saldo da conta mas fica fora de receitas, despesas e orçamentos.
+TRANSFERENCIA = "Transferência"
+
+
+# Contador de versões do processo. Cada escrita pega o próximo número, então
+# uma versão nunca se repete, nem entre estados recriados depois de um despejo
+# do RegistroUsuarios; caches na session_state podem usá-la como chave.
+_versoes = itertools.count(1)
+
+
+def proxima_versao():
+    return next(_versoes)
+
+
+def em_centavos(valores):
+    # Reais -> centavos inteiros, arredondando para o centavo mais próximo.
+    return np.rint(np.asarray(valores, dtype=np.float64) * 100).astype(np.int64)
+
+
+class Dicionario:
+    """Valores distintos de uma coluna de texto, na ordem em que apareceram.
+
+    O código de um valor é a sua posição em `valores`; um lote passa por
+    `pd.factorize` e só os distintos são procurados no dict.
+    """
+
+    def __init__(self):
+        self.valores = []
+        self._codigos = {}
+        self._decodificador = None      # valores + [None], para decodificar com NULO = -1
+        self._categorias = None
+
+    def __len__(self):
+        return len(self.valores)
+
+    def codigo(self, valor):
+        if valor is None or (isinstance(valor, float) and valor != valor):
+            return NULO
+        codigo = self._codigos.get(valor)
+        if codigo is None:
+            codigo = self._codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+            self._decodificador = self._categorias = None
+        return codigo
+
+    def procurar(self, valor):
+        # Código de um valor já visto, ou None (filtros não criam entradas).
+        return self._codigos.get(valor)
+
+    def codificar(self, valores):
+        if isinstance(valores, pd.Series):
+            valores = valores.array
+        if isinstance(valores, pd.Categorical):
+            codigos, unicos = valores.codes, valores.categories
+        else:
+            codigos, unicos = pd.factorize(np.asarray(valores, dtype=object))
+        mapa = np.fromiter((self.codigo(v) for v in unicos), dtype=np.int32, count=len(unicos))
+        return np.append(mapa, np.int32(NULO))[codigos]
+
+    def decodificar(self, codigos):
+        if self._decodificador is None:
+            self._decodificador = np.array(self.valores + [None], dtype=object)
+        return self._decodificador[codigos]
+
+    def categorias(self):
+        if self._categorias is None:
+            self._categorias = pd.Index(self.valores, dtype=object)
+        return self._categorias
+
+    def memoria(self):
+        # Bytes dos valores distintos e do dict de códigos.
+        return sys.getsizeof(self._codigos) + sum(sys.getsizeof(v) for v in self.valores) \
+            + sys.getsizeof(self.valores)
+
+
+class Ledger:
+    """Extrato colunar, somente-inclusão.
+
+    Cada coluna vive num array NumPy com folga de capacidade que dobra quando
+    enche, então `append`/`extend` custam O(1) amortizado por linha. As linhas
+    válidas são sempre o prefixo `[:len(self)]`. Texto é guardado como código
+    no `Dicionario` da coluna e Valor em centavos (int64); `column` devolve os
+    valores já decodificados (texto e reais), `codigos`/`centavos` os buffers
+    como estão, e `to_frame()` um DataFrame com as colunas de texto categóricas.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_INICIAL):
+        capacidade = max(int(capacidade), 1)
+        self._cols = {c: np.empty(capacidade, dtype=DTYPES[c]) for c in COLUNAS}
+        self._dicionarios = {c: Dicionario() for c in CATEGORICAS}
+        self._n = 0
+        self._ouvintes = []
+        # Muda a cada escrita (proxima_versao); serve de chave para caches de tela.
+        self.versao = proxima_versao()
+
+    @classmethod
+    def from_frame(cls, df):
+        ledger = cls(capacidade=max(len(df), CAPACIDADE_INICIAL))
+        ledger.extend(df)
+        return ledger
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def capacidade(self):
+        return len(self._cols["Data"])
+
+    def subscribe(self, callback):
+        # callback(ledger, inicio, fim) é chamado após cada escrita com o
+        # intervalo de linhas recém-incluídas.
+        self._ouvintes.append(callback)
+
+    def _reservar(self, extra):
+        necessario = self._n + extra
+        cap = self.capacidade
+        if necessario <= cap:
+            return
+        while cap < necessario:
+            cap *= 2
+        for c in COLUNAS:
+            novo = np.empty(cap, dtype=DTYPES[c])
+            novo[:self._n] = self._cols[c][:self._n]
+            self._cols[c] = novo
+
+    def append(self, data, descricao, categoria, valor, conta="Manual", status="Pago"):
+        self._reservar(1)
+        i = self._n
+        self._cols["Data"][i] = np.datetime64(pd.Timestamp(data), "ns")
+        for c, texto in zip(CATEGORICAS, (descricao, categoria, conta, status)):
+            self._cols[c][i] = self._dicionarios[c].codigo(texto)
+        self._cols["Valor"][i] = round(float(valor) * 100)
+        self._n += 1
+        self._notificar(i, self._n)
+
+    def extend(self, linhas):
+        # Aceita um DataFrame ou um dict de colunas com o esquema do extrato
+        # (Valor em reais); tudo é convertido para os tipos dos buffers.
+        tamanho = len(linhas[COLUNAS[0]])
+        if tamanho == 0:
+            return
+        convertidas = {
+            "Data": np.asarray(pd.to_datetime(linhas["Data"]), dtype=DTYPES["Data"]),
+            "Valor": em_centavos(linhas["Valor"]),
+            **{c: self._dicionarios[c].codificar(linhas[c]) for c in CATEGORICAS},
+        }
+        self._reservar(tamanho)
+        inicio, fim = self._n, self._n + tamanho
+        for c in COLUNAS:
+            self._cols[c][inicio:fim] = convertidas[c]
+        self._n = fim
+        self._notificar(inicio, fim)
+
+    def _notificar(self, inicio, fim):
+        self.versao = proxima_versao()
+        for callback in self._ouvintes:
+            callback(self, inicio, fim)
+
+    # --- LEITURAS ---
+    def _fatia(self, nome, inicio, fim):
+        fim = self._n if fim is None else min(fim, self._n)
+        return self._cols[nome][inicio:fim]
+
+    def column(self, nome, inicio=0, fim=None):
+        # Valores lógicos: texto decodificado (object) e Valor em reais (float64).
+        arr = self._fatia(nome, inicio, fim)
+        if nome in self._dicionarios:
+            return self._dicionarios[nome].decodificar(arr)
+        if nome == "Valor":
+            return arr / 100
+        return arr
+
+    def codigos(self, nome, inicio=0, fim=None):
+        # Códigos (int32) de uma coluna de texto, sem copiar; NULO para ausente.
+        return self._fatia(nome, inicio, fim)
+
+    def centavos(self, inicio=0, fim=None):
+        return self._fatia("Valor", inicio, fim)
+
+    def contabeis(self, inicio=0, fim=None):
+        # Máscara das linhas que contam como receita/despesa (as que não são TRANSFERENCIA).
+        status = self._fatia("Status", inicio, fim)
+        codigo = self._dicionarios["Status"].procurar(TRANSFERENCIA)
+        return np.ones(len(status), dtype=bool) if codigo is None else status != codigo
+
+    def dicionario(self, nome):
+        return self._dicionarios[nome]
+
+    def _frame(self, indice):
+        dados = {}
+        for c in COLUNAS:
+            arr = self._cols[c][indice]
+            if c in self._dicionarios:
+                dados[c] = pd.Categorical.from_codes(arr, categories=self._dicionarios[c].categorias(), validate=False)
+            elif c == "Valor":
+                dados[c] = arr / 100
+            else:
+                dados[c] = arr
+        return pd.DataFrame(dados, copy=False)
+
+    def take(self, posicoes):
+        # Cópia das linhas nas posições pedidas (resultado de filtros/índices).
+        return self._frame(posicoes)
+
+    def to_frame(self, inicio=0, fim=None, recentes_primeiro=False):
+        fim = self._n if fim is None else min(fim, self._n)
+        passo = slice(fim - 1, inicio - 1 if inicio > 0 else None, -1) if recentes_primeiro else slice(inicio, fim)
+        return self._frame(passo)
+
+    def memoria(self):
+        # Bytes ocupados pelas linhas válidas: buffers mais os dicionários de texto.
+        buffers = sum(self._cols[c][:self._n].nbytes for c in COLUNAS)
+        return buffers + sum(d.memoria() for d in self._dicionarios.values())
@@ -0,0 +1,266 @@
+import numpy as np
+import pandas as pd
+
+from castelo.ledger import proxima_versao
+
+CAMINHOS_PADRAO = 2_000
+JANELA_APORTES = 6          # meses usados na média de aportes
+HORIZONTE_MAXIMO = 360      # meses (30 anos); além disso a meta fica "sem previsão"
+BLOCO_MESES = 24            # meses simulados por vez no Monte Carlo
+
+
+def _mes(data):
+    return np.datetime64(pd.Timestamp(data).strftime("%Y-%m"), "M")
+
+
+def validar_nome(nome, goals, categorias):
+    # Nome de um objetivo novo, sem espaços nas pontas. Os aportes são
+    # lançamentos com Categoria = nome, então ele não pode repetir outro
+    # objetivo nem uma categoria já usada (os gastos dela virariam aportes).
+    nome = (nome or "").strip()
+    if not nome:
+        raise ValueError("Dê um nome ao objetivo.")
+    chave = nome.casefold()
+    if any(g["nome"].casefold() == chave for g in goals):
+        raise ValueError(f"Já existe um objetivo chamado \"{nome}\".")
+    if any(c.casefold() == chave for c in categorias):
+        raise ValueError(f"\"{nome}\" já é uma categoria do extrato ou do orçamento.")
+    return nome
+
+
+class AportesObjetivos:
+    """Aportes líquidos por objetivo e mês, vindos do extrato.
+
+    Um aporte é um lançamento com `Categoria` igual ao nome do objetivo:
+    valor negativo é dinheiro saindo da conta para a meta; positivo, resgate.
+    Mantido incrementalmente como as faturas; `versao` muda a cada aporte.
+    """
+
+    def __init__(self, nomes=(), ledger=None):
+        self._meses = {nome: {} for nome in nomes}
+        self.versao = proxima_versao()
+        if ledger is not None:
+            self.acompanhar(ledger)
+
+    def adicionar(self, nome, linhas=None):
+        # Objetivo novo; `linhas` são lançamentos que já existiam com a categoria dele.
+        self._meses.setdefault(nome, {})
+        if linhas is not None and len(linhas["Data"]):
+            self.carregar(linhas)
+
+    def acompanhar(self, ledger, contabilizado=False):
+        if len(ledger) and not contabilizado:
+            self.atualizar(ledger, 0, len(ledger))
+        ledger.subscribe(self.atualizar)
+
+    def atualizar(self, ledger, inicio, fim):
+        categorias = ledger.column("Categoria", inicio, fim)
+        dos_objetivos = np.isin(categorias, list(self._meses))
+        if dos_objetivos.any():
+            self.carregar({c: ledger.column(c, inicio, fim)[dos_objetivos] for c in ("Data", "Categoria", "Valor")})
+
+    def carregar(self, linhas):
+        categorias = np.asarray(linhas["Categoria"], dtype=object)
+        meses = np.asarray(linhas["Data"], dtype="datetime64[ns]").astype("datetime64[M]")
+        aportes = -np.asarray(linhas["Valor"], dtype=np.float64)
+        for nome in pd.unique(categorias):
+            por_mes = self._meses.get(nome)
+            if por_mes is None:
+                continue
+            sel = categorias == nome
+            unicos, pos = np.unique(meses[sel], return_inverse=True)
+            for m, v in zip(unicos, np.bincount(pos, weights=aportes[sel])):
+                por_mes[m] = por_mes.get(m, 0.0) + v
+        self.versao = proxima_versao()
+
+    def total(self, nome):
+        return sum(self._meses.get(nome, {}).values())
+
+    def media_mensal(self, nome, hoje=None, janela=JANELA_APORTES):
+        # Média dos últimos `janela` meses (contando os sem aporte), a partir do primeiro aporte.
+        por_mes = self._meses.get(nome)
+        if not por_mes:
+            return 0.0
+        atual = _mes(pd.Timestamp.today() if hoje is None else hoje)
+        inicio = max(atual - (janela - 1), min(por_mes))
+        meses = int((atual - inicio).astype(np.int64)) + 1
+        if meses <= 0:
+            return 0.0
+        return sum(v for m, v in por_mes.items() if inicio <= m <= atual) / meses
+
+
+def _meses_ate(saldo, aporte, alvo, taxa):
+    # Menor n com saldo*(1+r)^n + aporte*((1+r)^n - 1)/r >= alvo (vetorizado; inf se nunca).
+    falta = alvo - saldo
+    n = np.full(len(saldo), np.inf)
+    n[falta <= 0] = 0
+    sem_juros = (taxa == 0) & (falta > 0) & (aporte > 0)
+    n[sem_juros] = np.ceil(falta[sem_juros] / aporte[sem_juros])
+    com_juros = (taxa > 0) & (falta > 0)
+    r = taxa[com_juros]
+    num = alvo[com_juros] * r + aporte[com_juros]
+    den = saldo[com_juros] * r + aporte[com_juros]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n_juros = np.ceil(np.log(num / den) / np.log1p(r))
+    n[com_juros] = np.where(den > 0, n_juros, np.inf)
+    return n
+
+
+def _aporte_necessario(saldo, alvo, taxa, meses):
+    # Aporte mensal constante que leva `saldo` a `alvo` em `meses`.
+    meses = np.maximum(meses, 1)
+    fator = np.power(1 + taxa, meses)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        com_juros = (alvo - saldo * fator) * taxa / (fator - 1)
+    return np.maximum(np.where(taxa > 0, com_juros, (alvo - saldo) / meses), 0.0)
+
+
+def _acumular(x):
+    # Soma acumulada ao longo dos meses (linhas), in-place: bem mais rápida que
+    # np.cumsum(axis=0) para poucas linhas muito longas.
+    for k in range(1, len(x)):
+        np.add(x[k], x[k - 1], out=x[k])
+    return x
+
+
+def monte_carlo(saldo, aporte, alvo, retorno, volatilidade, caminhos=CAMINHOS_PADRAO,
+                horizonte=HORIZONTE_MAXIMO, prazos=None, semente=0):
+    """Mês em que cada caminho atinge o alvo, para todos os objetivos de uma vez.
+
+    Retornos mensais log-normais; `saldo_t = saldo_{t-1} * g_t + aporte` é
+    resolvido em blocos de BLOCO_MESES com somas acumuladas, sem laço por mês.
+    Caminhos que já chegaram saem do lote, e um objetivo inteiro sai quando
+    passou do seu prazo com 90% dos caminhos no alvo (o suficiente para os
+    cenários p10/p50/p90). Devolve uma matriz (objetivos x caminhos) com o mês
+    (1..horizonte) ou inf.
+    """
+    rng = np.random.default_rng(semente)
+    g = len(saldo)
+    prazos = np.zeros(g, dtype=np.int64) if prazos is None else np.asarray(prazos)
+    suficiente = int(np.ceil(0.9 * caminhos))
+    # Estado achatado (objetivo, caminho) só dos caminhos ainda abaixo do alvo.
+    dono = np.repeat(np.arange(g), caminhos)
+    atual = np.repeat(saldo, caminhos).astype(np.float32)
+    chegada = np.where(atual >= alvo[dono], 0.0, np.inf)
+    chegaram = (~np.isinf(chegada)).reshape(g, caminhos).sum(axis=1)
+    vivos = np.flatnonzero(np.isinf(chegada))
+    mu = (np.log1p(retorno) / 12 - volatilidade ** 2 / 24).astype(np.float32)
+    sigma = (volatilidade / np.sqrt(12)).astype(np.float32)
+    aporte = aporte.astype(np.float32)
+    alvo32 = alvo.astype(np.float32)
+    atual = atual[vivos]
+    # Buffers reaproveitados em todos os blocos: alocar (e paginar) matrizes
+    # novas a cada bloco custava mais que as próprias contas.
+    n = len(vivos)
+    sorteio = np.empty(BLOCO_MESES * ((n + 1) // 2), dtype=np.float32)
+    buffers = np.empty((2, BLOCO_MESES * n), dtype=np.float32)
+    mes = 0
+    while mes < horizonte and len(vivos):
+        bloco, n = min(BLOCO_MESES, horizonte - mes), len(vivos)
+        metade = (n + 1) // 2
+        d = dono[vivos]
+        # Meses nas linhas, caminhos nas colunas. Choques antitéticos (z e -z):
+        # só metade é sorteada, que é a parte cara do bloco.
+        z = rng.standard_normal(out=sorteio[:bloco * metade].reshape(bloco, metade), dtype=np.float32)
+        log_g = buffers[0, :bloco * n].reshape(bloco, n)
+        log_g[:, :metade] = z
+        np.negative(z[:, :n - metade], out=log_g[:, metade:])
+        log_g *= sigma[d]
+        log_g += mu[d]
+        crescimento = np.exp(_acumular(log_g), out=log_g)
+        # S_t = e^{L_t} * (S_0 + a * sum_{k<=t} e^{-L_k})
+        saldos = np.divide(1, crescimento, out=buffers[1, :bloco * n].reshape(bloco, n))
+        _acumular(saldos)
+        saldos *= aporte[d]
+        saldos += atual
+        saldos *= crescimento
+        atingiu = saldos >= alvo32[d]
+        chegou = atingiu.any(axis=0)
+        chegada[vivos[chegou]] = atingiu[:, chegou].argmax(axis=0) + 1 + mes
+        chegaram += np.bincount(d[chegou], minlength=g)
+        mes += bloco
+        fica = ~chegou & ~((chegaram >= suficiente) & (prazos <= mes))[d]
+        vivos, atual = vivos[fica], saldos[-1, fica]
+    return chegada.reshape(g, caminhos)
+
+
+def projetar(goals, aportes, hoje=None, caminhos=CAMINHOS_PADRAO, semente=0):
+    """Previsão de cada objetivo: data estimada, aporte necessário e cenários.
+
+    `atual` do objetivo é o saldo inicial; os aportes do extrato somam a ele.
+    A data determinística usa a média de aportes e o `retorno` esperado; o
+    aporte necessário usa o `prazo`. Objetivos com `volatilidade` (ligados a
+    mercado) passam pelo Monte Carlo, todos no mesmo lote.
+    """
+    hoje = pd.Timestamp.today().normalize() if hoje is None else pd.Timestamp(hoje)
+    atual = _mes(hoje)
+    colunas = ["nome", "saldo", "alvo", "aporte_medio", "data_prevista", "aporte_necessario",
+               "prob_prazo", "p10", "p50", "p90"]
+    if not goals:
+        return pd.DataFrame(columns=colunas)
+    nomes = [g["nome"] for g in goals]
+    alvo = np.array([g["alvo"] for g in goals], dtype=np.float64)
+    saldo = np.array([g["atual"] + aportes.total(g["nome"]) for g in goals], dtype=np.float64)
+    aporte = np.array([aportes.media_mensal(n, hoje) for n in nomes], dtype=np.float64)
+    retorno = np.array([g.get("retorno") or 0.0 for g in goals], dtype=np.float64)
+    vol = np.array([g.get("volatilidade") or 0.0 for g in goals], dtype=np.float64)
+    taxa = np.power(1 + retorno, 1 / 12) - 1
+    meses_prazo = np.array([
+        max(int((_mes(g["prazo"]) - atual).astype(np.int64)), 0) if g.get("prazo") else -1 for g in goals
+    ])      # -1: sem prazo; prazo vencido conta como "agora"
+
+    previsto = _meses_ate(saldo, np.maximum(aporte, 0.0), alvo, taxa)
+    necessario = np.where(meses_prazo >= 0, _aporte_necessario(saldo, alvo, taxa, meses_prazo), np.nan)
+
+    def data_em(meses):
+        if not np.isfinite(meses) or meses > HORIZONTE_MAXIMO:
+            return pd.NaT
+        return pd.Timestamp(str(atual + int(meses)))
+
+    prob = np.full(len(goals), np.nan)
+    cenarios = np.full((3, len(goals)), np.inf)
+    mercado = np.flatnonzero(vol > 0)
+    if len(mercado):
+        finitos = previsto[np.isfinite(previsto)]
+        horizonte = int(min(HORIZONTE_MAXIMO, max(meses_prazo.max(), 2 * finitos.max(initial=0), 12)))
+        chegada = monte_carlo(saldo[mercado], np.maximum(aporte[mercado], 0.0), alvo[mercado], retorno[mercado],
+                              vol[mercado], caminhos=caminhos, horizonte=horizonte,
+                              prazos=meses_prazo[mercado], semente=semente)
+        # Quantis pelo método "lower": caminhos que não chegam (inf) não viram NaN.
+        cenarios[:, mercado] = np.quantile(chegada, [0.1, 0.5, 0.9], axis=1, method="lower")
+        com_prazo = meses_prazo[mercado] >= 0
+        prob[mercado[com_prazo]] = (chegada[com_prazo] <= meses_prazo[mercado][com_prazo, None]).mean(axis=1)
+
+    def datas(meses):
+        return [data_em(m) for m in meses]
+
+    return pd.DataFrame({
+        "nome": nomes, "saldo": saldo, "alvo": alvo, "aporte_medio": aporte,
+        "data_prevista": datas(previsto),
+        "aporte_necessario": necessario,
+        "prob_prazo": prob,
+        "p10": datas(cenarios[0]), "p50": datas(cenarios[1]), "p90": datas(cenarios[2]),
+    }, columns=colunas)
+
+
+class ProjecoesObjetivos:
+    """Memoriza `projetar` até os aportes ou os objetivos mudarem (ou virar o mês)."""
+
+    def __init__(self, aportes, caminhos=CAMINHOS_PADRAO):
+        self.aportes = aportes
+        self.caminhos = caminhos
+        self._chave = None
+        self._resultado = None
+        self.metricas = {"reusos": 0, "calculos": 0}
+
+    def obter(self, goals, hoje=None):
+        hoje = pd.Timestamp.today().normalize() if hoje is None else pd.Timestamp(hoje)
+        campos = ("nome", "alvo", "atual", "prazo", "retorno", "volatilidade")
+        chave = (self.aportes.versao, _mes(hoje), tuple(tuple(g.get(c) for c in campos) for g in goals))
+        if chave == self._chave:
+            self.metricas["reusos"] += 1
+            return self._resultado
+        self._resultado = projetar(goals, self.aportes, hoje, caminhos=self.caminhos)
+        self._chave = chave
+        self.metricas["calculos"] += 1
+        return self._resultado
@@ -0,0 +1,197 @@
+import hashlib
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+MODELO_PADRAO = "meta/llama-3-8b-instruct"
+MAX_TOKENS = 150
+
+TTL_PADRAO = 24 * 3600      # segundos
+MAX_VEREDICTOS = 512
+TIMEOUT_PADRAO = 20.0       # segundos até cair no veredito local
+
+# Janela de latências guardada para as métricas.
+JANELA_LATENCIAS = 200
+
+
+def normalizar_prompt(prompt):
+    # Espaços/indentação não mudam o veredito: colapsa antes de gerar a chave.
+    return "\n".join(re.sub(r"\s+", " ", linha).strip() for linha in prompt.strip().splitlines() if linha.strip())
+
+
+def chave_prompt(prompt):
+    return hashlib.sha256(normalizar_prompt(prompt).encode("utf-8")).hexdigest()
+
+
+class CacheVeredictos:
+    # Cache endereçado por conteúdo, com TTL e despejo LRU.
+
+    def __init__(self, ttl=TTL_PADRAO, maximo=MAX_VEREDICTOS, relogio=time.monotonic):
+        self.ttl = ttl
+        self.maximo = maximo
+        self._relogio = relogio
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def get(self, chave):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            expira, texto = item
+            if expira < self._relogio():
+                del self._itens[chave]
+                return None
+            self._itens.move_to_end(chave)
+            return texto
+
+    def put(self, chave, texto):
+        with self._lock:
+            self._itens[chave] = (self._relogio() + self.ttl, texto)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.maximo:
+                self._itens.popitem(last=False)
+
+
+# --- BACKENDS ---
+class ReplicateBackend:
+    def __init__(self, modelo=MODELO_PADRAO, max_tokens=MAX_TOKENS, api_token=None):
+        self.modelo = modelo
+        self.max_tokens = max_tokens
+        self.api_token = api_token
+
+    def stream(self, prompt):
+        import replicate
+
+        # Cliente com a chave de quem consultou, sem passar pelo os.environ do processo.
+        cliente = replicate.Client(api_token=self.api_token) if self.api_token else replicate
+        yield from cliente.run(self.modelo, input={"prompt": prompt, "max_tokens": self.max_tokens})
+
+
+class FakeBackend:
+    # Modelo local sem rede, para testes e benchmarks.
+
+    def __init__(self, resposta="APROVADO. Compra dentro da margem segura.", atraso=0.0):
+        self.resposta = resposta
+        self.atraso = atraso
+
+    def stream(self, prompt):
+        for token in re.findall(r"\S+\s*", self.resposta):
+            if self.atraso:
+                time.sleep(self.atraso)
+            yield token
+
+
+def backend_padrao(api_token):
+    # CASTELO_ORACULO=fake força o modelo local (sem rede).
+    if os.environ.get("CASTELO_ORACULO") == "fake":
+        return FakeBackend()
+    if api_token:
+        return ReplicateBackend(api_token=api_token)
+    return None
+
+
+class Oraculo:
+    """Cliente do Oráculo VFP.
+
+    `consultar` devolve um gerador de tokens para `st.write_stream`: respostas
+    repetidas saem do cache; chamadas novas rodam numa thread e os tokens são
+    repassados conforme chegam. Se o prazo estourar (ou o backend falhar), o
+    gerador termina com o veredito local de `fallback`. Respostas que chegam
+    depois do prazo ainda aquecem o cache.
+    """
+
+    _FIM = object()
+
+    def __init__(self, backend, cache=None, timeout=TIMEOUT_PADRAO):
+        self.backend = backend
+        self.cache = cache if cache is not None else CacheVeredictos()
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.metricas = {"consultas": 0, "acertos": 0, "timeouts": 0, "erros": 0}
+        self.latencias = deque(maxlen=JANELA_LATENCIAS)
+
+    def _contar(self, nome):
+        with self._lock:
+            self.metricas[nome] += 1
+
+    def taxa_acerto(self):
+        consultas = self.metricas["consultas"]
+        return self.metricas["acertos"] / consultas if consultas else 0.0
+
+    def latencia_p50(self):
+        if not self.latencias:
+            return None
+        ordenadas = sorted(self.latencias)
+        return ordenadas[len(ordenadas) // 2]
+
+    def _produzir(self, prompt, chave, fila):
+        partes = []
+        try:
+            for token in self.backend.stream(prompt):
+                token = str(token)
+                partes.append(token)
+                fila.put(token)
+        except Exception as e:
+            fila.put(e)
+            return
+        self.cache.put(chave, "".join(partes))
+        fila.put(self._FIM)
+
+    def _latencia(self, t0, origem, medir):
+        segundos = time.perf_counter() - t0
+        self.latencias.append(segundos)
+        if medir is not None:
+            medir(segundos, origem)
+
+    def consultar(self, prompt, fallback=None, medir=None):
+        # `medir(segundos, origem)`, se dado, recebe a latência desta consulta
+        # (origem: "cache", "modelo", "timeout", "erro" ou "interrompida", quando
+        # o gerador é fechado no meio, ex.: rerun durante o st.write_stream).
+        self._contar("consultas")
+        t0 = time.perf_counter()
+        origem = "interrompida"
+        try:
+            chave = chave_prompt(prompt)
+            texto = self.cache.get(chave)
+            if texto is not None:
+                self._contar("acertos")
+                self._latencia(t0, "cache", medir)
+                origem = None
+                yield texto
+                return
+
+            fila = queue.Queue()
+            threading.Thread(target=self._produzir, args=(prompt, chave, fila), daemon=True).start()
+            prazo = t0 + self.timeout
+            while True:
+                restante = prazo - time.perf_counter()
+                try:
+                    item = fila.get(timeout=max(restante, 0.0))
+                except queue.Empty:
+                    self._contar("timeouts")
+                    origem = "timeout"
+                    if fallback is not None:
+                        yield f"\n\n⏱️ *O Guardião demorou a responder. Veredito local:* {fallback()}"
+                    break
+                if item is self._FIM:
+                    origem = "modelo"
+                    break
+                if isinstance(item, Exception):
+                    self._contar("erros")
+                    origem = "erro"
+                    if fallback is None:
+                        raise item
+                    yield f"\n\n⚠️ *Erro na IA ({item}). Veredito local:* {fallback()}"
+                    break
+                yield item
+        finally:
+            # Toda consulta contada deixa uma latência, termine como terminar.
+            if origem is not None:
+                self._latencia(t0, origem, medir)
@@ -0,0 +1,160 @@
+import bisect
+
+import pandas as pd
+
+from castelo.agregados import Agregados
+from castelo.ledger import proxima_versao
+
+LIMIARES_PADRAO = (0.8, 1.0)
+LOTE_PEQUENO = 256      # até aqui, as inclusões são somadas num laço simples
+
+
+def mes_atual(hoje=None):
+    return (pd.Timestamp.today() if hoje is None else pd.Timestamp(hoje)).strftime("%Y-%m")
+
+
+class Orcamentos:
+    """Tetos de gasto por categoria e mês, com alertas de limiar incrementais.
+
+    `base` é o teto padrão de cada categoria; `historico` são alterações
+    (mes, categoria, limite) que valem daquele mês em diante, então meses
+    passados guardam o teto que tinham. O gasto por (mês, categoria) é lido
+    dos `agregados` (os mesmos do dashboard, então os dois não divergem); a
+    cada inclusão no Ledger só os pares tocados são conferidos contra os
+    limiares, e cada (mês, categoria, limiar) dispara uma única vez —
+    `disparados` vem do armazenamento e `ao_disparar` grava os novos.
+    Mudar um teto só confere o mês atual: meses fechados não ganham alertas
+    novos. Tetos, `gastos()` e eventos ficam em reais.
+    """
+
+    def __init__(self, base, historico=(), agregados=None, disparados=(), limiares=LIMIARES_PADRAO,
+                 ao_disparar=None):
+        self.base = dict(base)
+        self.limiares = tuple(sorted(limiares))
+        self.ao_disparar = ao_disparar
+        self._historico = {}        # {categoria: ([meses ordenados], [limites])}
+        for mes, categoria, limite in sorted(historico):
+            self._registrar(categoria, limite, mes)
+        # Sem agregados de fora, `acompanhar` assina estes próprios no Ledger.
+        self._proprios = agregados is None
+        self.agregados = Agregados() if agregados is None else agregados
+        self.eventos = []           # na ordem em que dispararam
+        self._por_mes = {}
+        self._disparados = set()
+        for evento in disparados:
+            self._guardar(dict(evento))
+        self.versao = proxima_versao()
+
+    def acompanhar(self, ledger):
+        # Os agregados precisam assinar o Ledger antes: `atualizar` lê os gastos
+        # já somados com as linhas novas.
+        if self._proprios:
+            self.agregados.acompanhar(ledger)
+        ledger.subscribe(self.atualizar)
+
+    def atualizar(self, ledger, inicio, fim):
+        saida = (ledger.centavos(inicio, fim) < 0) & ledger.contabeis(inicio, fim)
+        if not saida.any():
+            return
+        meses = ledger.column("Data", inicio, fim)[saida].astype("datetime64[M]").astype(str)
+        categorias = ledger.column("Categoria", inicio, fim)[saida]
+        if len(categorias) < LOTE_PEQUENO:
+            # Inclusão manual: um laço curto sai mais barato que montar um DataFrame.
+            pares = dict.fromkeys(zip(meses.tolist(), categorias.tolist()))
+        else:
+            pares = pd.DataFrame({"mes": meses, "categoria": categorias}).drop_duplicates().itertuples(index=False)
+        for mes, categoria in pares:
+            self._verificar(mes, categoria)
+        self.versao = proxima_versao()
+
+    # --- TETOS ---
+    def _registrar(self, categoria, limite, mes):
+        meses, limites = self._historico.setdefault(categoria, ([], []))
+        i = bisect.bisect_left(meses, mes)
+        if i < len(meses) and meses[i] == mes:
+            limites[i] = limite
+        else:
+            meses.insert(i, mes)
+            limites.insert(i, limite)
+
+    def categorias(self):
+        return list(dict.fromkeys([*self.base, *self._historico]))
+
+    def limite(self, categoria, mes=None):
+        # Última alteração até `mes` (inclusive); sem nenhuma, o teto padrão.
+        mes = mes_atual() if mes is None else mes
+        meses, limites = self._historico.get(categoria, ((), ()))
+        i = bisect.bisect_right(meses, mes)
+        return limites[i - 1] if i else self.base.get(categoria)
+
+    def limites(self, mes=None):
+        limites = {c: self.limite(c, mes) for c in self.categorias()}
+        return {c: v for c, v in limites.items() if v is not None}
+
+    def definir(self, categoria, limite, mes=None):
+        # `mes=None` muda o teto padrão (todos os meses sem alteração própria).
+        # Só o mês atual é conferido: um mês fechado não dispara alerta por um
+        # teto definido depois.
+        if mes is None:
+            self.base[categoria] = limite
+        else:
+            self._registrar(categoria, limite, mes)
+        atual = mes_atual()
+        if mes is None or mes <= atual:
+            self._verificar(atual, categoria)
+        self.versao = proxima_versao()
+
+    # --- GASTOS E ALERTAS ---
+    def gastos(self, mes=None):
+        return self.agregados.gastos_por_categoria(mes_atual() if mes is None else mes)
+
+    def meses(self):
+        return sorted(self.agregados.despesas_mes)
+
+    def verificar(self, mes=None):
+        # Confere todas as categorias do mês (ex.: ao abrir o estado do cliente).
+        mes = mes_atual() if mes is None else mes
+        for categoria in self.gastos(mes):
+            self._verificar(mes, categoria)
+
+    def _verificar(self, mes, categoria):
+        limite = self.limite(categoria, mes)
+        if not limite or limite <= 0:
+            return
+        gasto = self.agregados.despesa_centavos(mes, categoria)
+        for limiar in self.limiares:
+            if gasto < limiar * limite * 100:
+                break
+            chave = (mes, categoria, limiar)
+            if chave in self._disparados:
+                continue
+            evento = {
+                "mes": mes, "categoria": categoria, "limiar": limiar,
+                "gasto": gasto / 100, "limite": float(limite),
+                "quando": pd.Timestamp.now().isoformat(timespec="seconds"),
+            }
+            self._guardar(evento)
+            if self.ao_disparar is not None:
+                self.ao_disparar(evento)
+
+    def _guardar(self, evento):
+        self._disparados.add((evento["mes"], evento["categoria"], evento["limiar"]))
+        self.eventos.append(evento)
+        self._por_mes.setdefault(evento["mes"], []).append(evento)
+
+    def eventos_desde(self, n):
+        # Eventos disparados depois dos `n` primeiros (para avisar cada sessão uma vez).
+        return self.eventos[n:]
+
+    def alertas(self, mes=None):
+        # Maior limiar disparado por categoria no mês, do mais grave ao mais leve;
+        # some se o teto foi aumentado depois e o gasto voltou a ficar abaixo dele.
+        mes = mes_atual() if mes is None else mes
+        maiores = {}
+        for e in self._por_mes.get(mes, []):
+            limite = self.limite(e["categoria"], mes)
+            if not limite or self.agregados.despesa_centavos(mes, e["categoria"]) < e["limiar"] * limite * 100:
+                continue
+            if e["categoria"] not in maiores or e["limiar"] > maiores[e["categoria"]]["limiar"]:
+                maiores[e["categoria"]] = e
+        return sorted(maiores.values(), key=lambda e: -e["limiar"])
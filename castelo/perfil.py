@@ -0,0 +1,213 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+
+# CASTELO_PERFIL=perfil.jsonl liga a medição (o valor é o arquivo do log);
+# vazio ou "0" deixa tudo desligado.
+VARIAVEL = "CASTELO_PERFIL"
+ARQUIVO_PADRAO = "perfil.jsonl"
+JANELA_PADRAO = 500         # execuções guardadas em memória para o painel
+PERCENTIS = (50, 95, 99)
+
+
+def caminho_configurado():
+    valor = os.environ.get(VARIAVEL, "").strip()
+    if valor in ("", "0"):
+        return None
+    return ARQUIVO_PADRAO if valor == "1" else valor
+
+
+def _rss_mb():
+    # RSS atual do processo; None fora do Linux. Com várias sessões no mesmo
+    # processo, o delta de uma etapa também inclui o que as outras alocaram.
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return None
+
+
+def _delta(antes, depois):
+    return None if antes is None or depois is None else round(depois - antes, 3)
+
+
+class _Bloco:
+    # Context manager de um trecho aninhado; registra mesmo se o trecho levantar
+    # exceção (st.rerun/st.stop encerram a execução assim).
+    __slots__ = ("execucao", "nome", "t0", "rss0")
+
+    def __init__(self, execucao, nome):
+        self.execucao = execucao
+        self.nome = nome
+
+    def __enter__(self):
+        self.rss0 = _rss_mb()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        fim = time.perf_counter()
+        self.execucao._anotar(self.execucao.blocos, self.nome, self.t0, fim, self.rss0)
+        return False
+
+
+class Execucao:
+    """Medições de uma execução (rerun) do script.
+
+    `etapa(nome)` fecha a etapa anterior e abre a próxima, para cronometrar o
+    script em sequência sem reindentar as seções; `bloco(nome)` mede trechos
+    dentro delas; `llm` recebe a latência das chamadas ao modelo. Um registro
+    por execução vai para o Perfilador em `finalizar`.
+    """
+
+    ativa = True
+
+    def __init__(self, perfilador, sessao=None):
+        self.perfilador = perfilador
+        self.sessao = sessao
+        self.pagina = None
+        self.etapas = []
+        self.blocos = []
+        self.chamadas_llm = []
+        self.finalizada = False
+        self._rss0 = _rss_mb()
+        self._t0 = self._ultimo = time.perf_counter()
+        self._etapa = None      # (nome, t0, rss0)
+
+    def _anotar(self, destino, nome, t0, fim, rss0):
+        destino.append({"nome": nome, "ms": round((fim - t0) * 1e3, 3), "mem_mb": _delta(rss0, _rss_mb())})
+        self._ultimo = max(self._ultimo, fim)
+
+    def _fechar_etapa(self, fim=None):
+        if self._etapa is not None:
+            nome, t0, rss0 = self._etapa
+            fim = time.perf_counter() if fim is None else fim
+            if fim > t0:
+                self._anotar(self.etapas, nome, t0, fim, rss0)
+            self._etapa = None
+
+    def etapa(self, nome):
+        self._fechar_etapa()
+        self._etapa = (nome, time.perf_counter(), _rss_mb())
+
+    def bloco(self, nome):
+        return _Bloco(self, nome)
+
+    def llm(self, segundos, origem):
+        self.chamadas_llm.append({"origem": origem, "ms": round(segundos * 1e3, 3)})
+
+    def finalizar(self, interrompida=False):
+        # `interrompida`: a execução terminou por st.rerun/exceção e está sendo
+        # fechada pela seguinte; o total vai até a última medição que ela fez.
+        if self.finalizada:
+            return None
+        self.finalizada = True
+        self._fechar_etapa(self._ultimo if interrompida else None)
+        fim = self._ultimo if interrompida else time.perf_counter()
+        registro = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "sessao": self.sessao,
+            "pagina": self.pagina,
+            "total_ms": round((fim - self._t0) * 1e3, 3),
+            "rss_mb": _rss_mb(),
+            "mem_mb": _delta(self._rss0, _rss_mb()),
+            "interrompida": interrompida,
+            "etapas": self.etapas,
+            "blocos": self.blocos,
+            "llm": self.chamadas_llm,
+        }
+        self.perfilador.registrar(registro)
+        return registro
+
+
+class _ExecucaoNula:
+    # Usada com a medição desligada: cada chamada custa só o despacho do método.
+    ativa = False
+    pagina = None
+    finalizada = True
+    _contexto = nullcontext()
+
+    def etapa(self, nome):
+        pass
+
+    def bloco(self, nome):
+        return self._contexto
+
+    def llm(self, segundos, origem):
+        pass
+
+    def finalizar(self, interrompida=False):
+        return None
+
+
+EXECUCAO_NULA = _ExecucaoNula()
+
+
+class Perfilador:
+    """Coleta as execuções de todas as sessões do processo.
+
+    Guarda as últimas `janela` em memória (painel de administração) e grava
+    uma linha JSON por execução em `caminho`, para agregar depois com
+    `ler_registros` + `agregar`. Sem `caminho`, fica desligado e `execucao`
+    devolve EXECUCAO_NULA.
+    """
+
+    def __init__(self, caminho=None, janela=JANELA_PADRAO):
+        self.caminho = caminho
+        self.ativo = caminho is not None
+        self.recentes = deque(maxlen=janela)
+        self._trava = threading.Lock()
+
+    def execucao(self, sessao=None):
+        if not self.ativo:
+            return EXECUCAO_NULA
+        return Execucao(self, sessao or uuid.uuid4().hex[:8])
+
+    def registrar(self, registro):
+        linha = json.dumps(registro, ensure_ascii=False)
+        with self._trava:
+            self.recentes.append(registro)
+            with open(self.caminho, "a", encoding="utf-8") as f:
+                f.write(linha + "\n")
+
+
+# --- AGREGAÇÃO (PAINEL E RELATÓRIO OFFLINE) ---
+def ler_registros(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f if linha.strip()]
+
+
+def _amostras(registros):
+    # (grupo, nome, ms, mem_mb) de cada medição dos registros.
+    for r in registros:
+        yield "total", r.get("pagina") or "?", r["total_ms"], r.get("mem_mb")
+        for e in r.get("etapas", ()):
+            yield "etapa", e["nome"], e["ms"], e.get("mem_mb")
+        for b in r.get("blocos", ()):
+            yield "bloco", b["nome"], b["ms"], b.get("mem_mb")
+        for c in r.get("llm", ()):
+            yield "llm", c["origem"], c["ms"], None
+
+
+def agregar(registros):
+    # p50/p95/p99 (ms) e memória média por medição, do mais lento (p95) ao mais rápido.
+    # numpy/pandas só aqui: o app importa este módulo antes de pintar a tela.
+    import numpy as np
+    import pandas as pd
+
+    df = pd.DataFrame(_amostras(registros), columns=["grupo", "nome", "ms", "mem_mb"])
+    colunas = ["grupo", "nome", "n", *(f"p{p}" for p in PERCENTIS), "max", "mem_media_mb"]
+    if df.empty:
+        return pd.DataFrame(columns=colunas)
+    linhas = []
+    for (grupo, nome), g in df.groupby(["grupo", "nome"], sort=False):
+        ms = g["ms"].to_numpy(dtype=np.float64)
+        mem = pd.to_numeric(g["mem_mb"], errors="coerce")
+        linhas.append([grupo, nome, len(ms), *np.percentile(ms, PERCENTIS), ms.max(),
+                       mem.mean() if mem.notna().any() else np.nan])
+    return pd.DataFrame(linhas, columns=colunas).sort_values("p95", ascending=False, ignore_index=True)
@@ -0,0 +1,277 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+HORIZONTE = 90              # dias de previsão à frente de hoje
+JANELA_DIAS = 180           # histórico (até o lançamento mais recente) usado na detecção
+MIN_OCORRENCIAS = 3
+REGULARIDADE = 0.75         # fração mínima de intervalos e valores dentro da tolerância
+TOLERANCIA_VALOR = 0.10     # variação aceita em torno da mediana do valor...
+TOLERANCIA_MINIMA = 100     # ...ou R$ 1,00 (em centavos), o que for maior
+
+# Período (dias) -> (nome, tolerância em dias). O mensal segue o calendário:
+# repete no mesmo dia do mês (limitado ao último dia).
+PERIODOS = {7: ("Semanal", 1), 14: ("Quinzenal", 2), 30: ("Mensal", 3)}
+MENSAL = 30
+
+COLUNAS_SERIES = ["Descrição", "Categoria", "Conta", "Valor", "Período", "Dias", "Ocorrências",
+                  "Última", "Próxima", "Total"]
+COLUNAS_EVENTOS = ["Data", "Descrição", "Categoria", "Conta", "Valor"]
+
+
+def _dias(datas):
+    return np.asarray(datas, dtype="datetime64[D]").astype(np.int64)
+
+
+def _periodo(intervalos):
+    # Período cuja tolerância cobre a mediana dos intervalos e a maioria deles, ou None.
+    mediana = np.median(intervalos)
+    for dias, (_, tolerancia) in PERIODOS.items():
+        if abs(mediana - dias) <= tolerancia:
+            dentro = np.abs(intervalos - dias) <= tolerancia
+            return dias if dentro.mean() >= REGULARIDADE else None
+    return None
+
+
+def _somar_meses(datas, meses):
+    # Mesmo dia do mês `meses` adiante, limitado ao último dia do mês de destino.
+    datas = np.asarray(datas, dtype="datetime64[D]")
+    inicio = datas.astype("datetime64[M]")
+    dia = (datas - inicio.astype("datetime64[D]")).astype(np.int64)
+    destino = inicio + meses
+    ultimo = ((destino + 1).astype("datetime64[D]") - destino.astype("datetime64[D]")).astype(np.int64) - 1
+    return destino.astype("datetime64[D]") + np.minimum(dia, ultimo)
+
+
+def _repeticoes(ultima, dias, k):
+    # k-ésima repetição (k >= 1) depois de `ultima`.
+    if dias == MENSAL:
+        return _somar_meses(np.full(len(k), ultima), k)
+    return np.datetime64(ultima, "D") + k * dias
+
+
+def detectar(extrato, referencia=None):
+    """Séries recorrentes do extrato: mesma descrição, valor parecido e datas periódicas.
+
+    As linhas são ordenadas por (descrição, sinal do valor, data), então cada
+    estabelecimento vira uma faixa contígua e ordenada no tempo — o índice por
+    estabelecimento — e só faixas com `MIN_OCORRENCIAS` são examinadas. Uma
+    série só conta como ativa se a próxima ocorrência ainda não passou de
+    `referencia` (por padrão, o lançamento mais recente do extrato). Valor e
+    Total ficam em reais, somados em centavos.
+    """
+    if len(extrato) == 0:
+        return pd.DataFrame(columns=COLUNAS_SERIES)
+    chaves, nomes = pd.factorize(extrato["Descrição"])
+    centavos = np.rint(extrato["Valor"].to_numpy(dtype=np.float64) * 100).astype(np.int64)
+    dias = _dias(extrato["Data"].to_numpy())
+    referencia = dias.max() if referencia is None else _dias([referencia])[0]
+
+    validas = chaves >= 0
+    ordem = np.flatnonzero(validas)[np.lexsort((dias[validas], centavos[validas] > 0, chaves[validas]))]
+    grupo = chaves[ordem] * 2 + (centavos[ordem] > 0)
+    cortes = np.flatnonzero(np.diff(grupo)) + 1
+    inicios = np.concatenate([[0], cortes])
+    tamanhos = np.diff(np.concatenate([inicios, [len(ordem)]]))
+
+    categorias = extrato["Categoria"].to_numpy(dtype=object)
+    contas = extrato["Conta"].to_numpy(dtype=object)
+    series = []
+    for inicio, tamanho in zip(inicios[tamanhos >= MIN_OCORRENCIAS].tolist(),
+                               tamanhos[tamanhos >= MIN_OCORRENCIAS].tolist()):
+        pos = ordem[inicio:inicio + tamanho]
+        periodo = _periodo(np.diff(dias[pos]))
+        if periodo is None:
+            continue
+        valores = centavos[pos]
+        mediana = int(np.rint(np.median(valores)))
+        tolerancia = max(abs(mediana) * TOLERANCIA_VALOR, TOLERANCIA_MINIMA)
+        if (np.abs(valores - mediana) <= tolerancia).mean() < REGULARIDADE:
+            continue
+        ultima = dias[pos[-1]]
+        proxima = _repeticoes(np.datetime64(int(ultima), "D"), periodo, np.array([1]))[0]
+        if proxima.astype(np.int64) + PERIODOS[periodo][1] < referencia:
+            continue                                    # parou de acontecer
+        # Categoria e conta da ocorrência mais recente.
+        series.append((nomes[chaves[pos[-1]]], categorias[pos[-1]], contas[pos[-1]], mediana / 100,
+                       PERIODOS[periodo][0], periodo, tamanho, np.datetime64(int(ultima), "D"), proxima,
+                       int(valores.sum()) / 100))
+    df = pd.DataFrame(series, columns=COLUNAS_SERIES)
+    return df.sort_values("Próxima", kind="stable", ignore_index=True)
+
+
+def prever(series, hoje, horizonte=HORIZONTE):
+    # Ocorrências das séries em (hoje, hoje + horizonte], em ordem de data. As
+    # que já deveriam ter acontecido (extrato ainda não importado) são puladas.
+    hoje = np.datetime64(pd.Timestamp(hoje).normalize(), "D")
+    limite = hoje + horizonte
+    partes = []
+    for s in series.itertuples(index=False):
+        ultima = np.datetime64(s.Última, "D")
+        if s.Dias == MENSAL:
+            passos = int((hoje.astype("datetime64[M]") - ultima.astype("datetime64[M]")).astype(np.int64))
+        else:
+            passos = int((hoje - ultima).astype(np.int64)) // s.Dias
+        k = np.arange(max(passos, 1), max(passos, 0) + horizonte // s.Dias + 3)
+        datas = _repeticoes(ultima, s.Dias, k)
+        datas = datas[(datas > hoje) & (datas <= limite)]
+        if len(datas):
+            partes.append(pd.DataFrame({"Data": datas.astype("datetime64[ns]"), "Descrição": s.Descrição,
+                                        "Categoria": s.Categoria, "Conta": s.Conta, "Valor": s.Valor}))
+    if not partes:
+        return pd.DataFrame(columns=COLUNAS_EVENTOS)
+    return pd.concat(partes, ignore_index=True).sort_values("Data", kind="stable", ignore_index=True)
+
+
+def projetar_saldos(eventos, saldo, hoje, horizonte=HORIZONTE, variavel_diaria=0.0):
+    # Saldo ao fim de cada dia de hoje a hoje + horizonte: contas e receitas
+    # previstas mais o gasto variável (fora das séries) médio por dia.
+    hoje = np.datetime64(pd.Timestamp(hoje).normalize(), "D")
+    datas = hoje + np.arange(horizonte + 1)
+    centavos = np.zeros(horizonte + 1, dtype=np.int64)
+    if len(eventos):
+        dia = (_dias(eventos["Data"].to_numpy()) - hoje.astype(np.int64))
+        np.add.at(centavos, dia, np.rint(eventos["Valor"].to_numpy(dtype=np.float64) * 100).astype(np.int64))
+    previsto = np.cumsum(centavos) / 100
+    return pd.DataFrame({"Saldo": saldo + previsto + variavel_diaria * np.arange(horizonte + 1),
+                         "Previsto": previsto}, index=pd.DatetimeIndex(datas.astype("datetime64[ns]"), name="Data"))
+
+
+def resumir(extrato, saldo, hoje, horizonte=HORIZONTE):
+    """Séries, próximas ocorrências, saldos projetados e médias mensais.
+
+    `renda_mensal` e `despesas_mensais` são o que o simulador de parcelas
+    espera: receitas recorrentes por mês e, como despesa, as contas
+    recorrentes mais o gasto variável médio da janela.
+    """
+    hoje = pd.Timestamp(hoje).normalize()
+    series = detectar(extrato)
+    eventos = prever(series, hoje, horizonte)
+    dias = 0
+    variavel = 0.0
+    if len(extrato):
+        # Gastos fora das séries, por dia (ao menos um mês no denominador); receitas
+        # avulsas não entram, para a projeção não contar com dinheiro incerto.
+        datas = _dias(extrato["Data"].to_numpy())
+        dias = int(datas.max() - datas.min()) + 1
+        centavos = np.rint(extrato["Valor"].to_numpy(dtype=np.float64) * 100).astype(np.int64)
+        recorrentes = int(np.rint(series.loc[series["Valor"] < 0, "Total"].sum() * 100))
+        variavel = (int(centavos[centavos < 0].sum()) - recorrentes) / 100 / max(dias, MENSAL)
+    por_mes = series["Valor"] * MENSAL / series["Dias"]
+    renda = float(por_mes[por_mes > 0].sum())
+    return {
+        "hoje": hoje,
+        "series": series,
+        "eventos": eventos,
+        "saldos": projetar_saldos(eventos, saldo, hoje, horizonte, variavel),
+        "saldo": saldo,
+        "renda_mensal": renda,
+        "despesas_mensais": renda - float(por_mes.sum()) - variavel * MENSAL,
+        "dias_historico": dias,
+    }
+
+
+class Previsoes:
+    """Previsão das contas e receitas recorrentes, calculada em segundo plano.
+
+    `janela(dias)` devolve o extrato dos últimos `dias` dias e `saldo()` o
+    saldo atual; os dois são lidos dentro de `trava` (a das escritas do
+    cliente) e o resto roda fora dela, numa thread. Cada inclusão no Ledger
+    ou virada de dia só agenda um novo cálculo: pedidos feitos durante um
+    cálculo viram uma única repetição no fim. `obter()` devolve o último
+    resultado pronto sem esperar — as telas leem a previsão, não a calculam.
+    Um cálculo que falha guarda o erro com a versão do Ledger que leu e só
+    é tentado de novo quando essa versão muda.
+    """
+
+    def __init__(self, janela, saldo, trava=None, horizonte=HORIZONTE, dias=JANELA_DIAS):
+        self.janela = janela
+        self.saldo = saldo
+        self.trava = threading.RLock() if trava is None else trava
+        self.horizonte = horizonte
+        self.dias = dias
+        self._cond = threading.Condition()
+        self._pedidos = 0
+        self._feitos = 0
+        self._rodando = False
+        self._encerrada = False
+        self._resultado = None
+        self._versao = None         # versão do Ledger acompanhado (None: dados do SQLite)
+        self._versao_erro = None
+        self.erro = None
+        self.metricas = {"calculos": 0, "leituras": 0, "segundos": 0.0}
+
+    def acompanhar(self, ledger):
+        ledger.subscribe(lambda ledger, inicio, fim: self.agendar(ledger.versao))
+
+    def agendar(self, versao=None):
+        with self._cond:
+            if versao is not None:
+                self._versao = versao
+            self._pedidos += 1
+            if self._rodando or self._encerrada:
+                return
+            self._rodando = True
+        threading.Thread(target=self._trabalhar, daemon=True).start()
+
+    def _trabalhar(self):
+        while True:
+            with self._cond:
+                if self._feitos == self._pedidos or self._encerrada:
+                    self._rodando = False
+                    self._cond.notify_all()
+                    return
+                pedido, versao = self._pedidos, self._versao
+            try:
+                resultado, erro = self.calcular(), None
+            except Exception as e:
+                resultado, erro = None, e
+            with self._cond:
+                if resultado is not None:
+                    self._resultado = resultado
+                self.erro = erro
+                self._versao_erro = versao
+                self._feitos = pedido
+                self._cond.notify_all()
+
+    def calcular(self, hoje=None):
+        # Síncrono (benchmarks e a própria thread).
+        hoje = pd.Timestamp.today().normalize() if hoje is None else pd.Timestamp(hoje)
+        t0 = time.perf_counter()
+        with self.trava:
+            extrato = self.janela(self.dias)
+            saldo = self.saldo()
+        resultado = resumir(extrato, saldo, hoje, self.horizonte)
+        self.metricas["calculos"] += 1
+        self.metricas["segundos"] = resultado["segundos"] = time.perf_counter() - t0
+        return resultado
+
+    def obter(self):
+        """Último resultado pronto (ou None), sem calcular nem esperar.
+
+        Sem resultado, ou com um de outro dia, agenda um novo cálculo e
+        devolve o que tem até ele ficar pronto. Depois de uma falha, não
+        agenda de novo enquanto os dados forem os mesmos (veja `erro`).
+        """
+        with self._cond:
+            resultado = self._resultado
+            parado = not self._rodando
+            falhou = self.erro is not None and self._versao_erro == self._versao
+            self.metricas["leituras"] += 1
+        if parado and not falhou and (resultado is None or resultado["hoje"] != pd.Timestamp.today().normalize()):
+            self.agendar()
+        return resultado
+
+    def encerrar(self, timeout=None):
+        # Não agenda mais nada e espera o cálculo em andamento (não dá para
+        # interromper `resumir` no meio); True se a thread terminou a tempo.
+        with self._cond:
+            self._encerrada = True
+        return self.aguardar(timeout)
+
+    def aguardar(self, timeout=None):
+        # Espera os cálculos agendados terminarem; True se terminaram a tempo.
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._rodando, timeout)
@@ -0,0 +1,74 @@
+from collections import namedtuple
+
+# Regras VFP (Verdade, Fidelidade, Propósito), avaliadas localmente sem chamar
+# o modelo. Sem dependências pesadas no caminho unitário: o app_lite usa só isto.
+
+APROVADO = "APROVADO"
+CUIDADO = "CUIDADO"
+REPROVADO = "REPROVADO"
+
+LIMITE_BLOQUEIO = 30.0      # % da renda comprometida pela parcela
+LIMITE_72H = 10.0           # % da renda num supérfluo
+CATEGORIAS_SUPERFLUAS = frozenset({"Supérfluo/Desejo", "Supérfluo", "Desejo"})
+
+MENSAGENS = {
+    "bloqueio": "Parcela acima de 30% da renda: BLOQUEIO.",
+    "72h": "Supérfluo acima de 10% da renda: aplique a Regra dos 72h.",
+    "parcelar_desejo": "Supérfluo parcelado: espere e compre à vista.",
+    "ok": "Compra dentro da margem segura.",
+}
+
+Veredito = namedtuple("Veredito", ["status", "regra", "mensagem", "impacto", "impacto_parcela"])
+
+
+def avaliar(valor, renda, categoria="Essencial", parcelas=1):
+    parcelas = max(int(parcelas), 1)
+    if renda <= 0:
+        return Veredito(REPROVADO, "bloqueio", MENSAGENS["bloqueio"], float("inf"), float("inf"))
+    impacto = valor / renda * 100
+    impacto_parcela = impacto / parcelas
+    superfluo = categoria in CATEGORIAS_SUPERFLUAS
+    if impacto_parcela > LIMITE_BLOQUEIO:
+        regra, status = "bloqueio", REPROVADO
+    elif superfluo and impacto > LIMITE_72H:
+        regra, status = "72h", CUIDADO
+    elif superfluo and parcelas > 1:
+        regra, status = "parcelar_desejo", CUIDADO
+    else:
+        regra, status = "ok", APROVADO
+    return Veredito(status, regra, MENSAGENS[regra], impacto, impacto_parcela)
+
+
+def avaliar_lote(df, renda=None):
+    # Avalia um DataFrame de compras candidatas de uma vez.
+    # Colunas: Valor, Categoria (opcional), Parcelas (opcional) e Renda
+    # (opcional se `renda` for informada). Devolve um DataFrame com
+    # status, regra, impacto e impacto_parcela, alinhado ao índice de `df`.
+    import numpy as np
+    import pandas as pd
+
+    valor = df["Valor"].to_numpy(dtype=np.float64)
+    renda_arr = np.broadcast_to(
+        np.asarray(df["Renda"] if renda is None else renda, dtype=np.float64), valor.shape
+    )
+    parcelas = np.maximum(df["Parcelas"].to_numpy(dtype=np.int64), 1) if "Parcelas" in df else np.ones(len(df), dtype=np.int64)
+    superfluo = df["Categoria"].isin(CATEGORIAS_SUPERFLUAS).to_numpy() if "Categoria" in df else np.zeros(len(df), dtype=bool)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        impacto = np.where(renda_arr > 0, valor / renda_arr * 100, np.inf)
+    impacto_parcela = impacto / parcelas
+
+    condicoes = [
+        impacto_parcela > LIMITE_BLOQUEIO,
+        superfluo & (impacto > LIMITE_72H),
+        superfluo & (parcelas > 1),
+    ]
+    codigo = np.select(condicoes, [1, 2, 3], default=0).astype(np.int8)
+    regra = pd.Categorical.from_codes(codigo, categories=["ok", "bloqueio", "72h", "parcelar_desejo"])
+    status = pd.Categorical.from_codes(
+        np.array([0, 2, 1, 1], dtype=np.int8)[codigo], categories=[APROVADO, CUIDADO, REPROVADO]
+    )
+    return pd.DataFrame(
+        {"status": status, "regra": regra, "impacto": impacto, "impacto_parcela": impacto_parcela},
+        index=df.index,
+    )
@@ -0,0 +1,186 @@
+import hashlib
+import os
+import threading
+import time
+
+import pandas as pd
+
+from castelo.armazenamento import CAMINHO_PADRAO
+from castelo.categorias import Categorizador
+from castelo.faturas import Faturas
+from castelo.fluxo import FluxoMensal
+from castelo.importador import IndiceHashes
+from castelo.indices import IndicesExtrato
+from castelo.objetivos import AportesObjetivos, ProjecoesObjetivos, validar_nome
+from castelo.orcamentos import Orcamentos
+from castelo.recorrencias import Previsoes
+
+USUARIO_DEMO = "demo"
+PASTA_USUARIOS = os.environ.get("CASTELO_DADOS", "dados")
+OCIOSO_PADRAO = 30 * 60       # segundos sem acesso até o estado sair da memória
+MAXIMO_PADRAO = 500           # usuários em memória ao mesmo tempo
+
+
+def caminho_usuario(usuario, pasta=PASTA_USUARIOS):
+    # Um SQLite por cliente; o demo continua no CASTELO_DB de sempre.
+    if usuario == USUARIO_DEMO:
+        return CAMINHO_PADRAO
+    os.makedirs(pasta, exist_ok=True)
+    return os.path.join(pasta, f"castelo-{hashlib.sha256(usuario.encode()).hexdigest()[:16]}.db")
+
+
+class EstadoUsuario:
+    """Dados de um cliente, compartilhados por todas as abas/sessões dele.
+
+    Totais, série mensal, orçamentos, faturas e aportes dos objetivos vêm do
+    SQLite na criação; o extrato completo (e os índices que dependem dele) só
+    quando `ledger()` é chamado. A previsão das recorrentes começa a ser
+    calculada numa thread já na criação.
+    Escritas passam por `trava`, já que duas abas do mesmo cliente rodam em
+    threads diferentes.
+    """
+
+    def __init__(self, usuario, armazenamento):
+        self.usuario = usuario
+        self.armazenamento = armazenamento
+        self.trava = threading.RLock()
+        self.ultimo_acesso = time.monotonic()
+        self.agregados = armazenamento.carregar_agregados()
+        self.fluxo = FluxoMensal(armazenamento)
+        self.orcamentos = Orcamentos(
+            armazenamento.carregar_budgets(),
+            armazenamento.carregar_budgets_historico(),
+            self.agregados,
+            armazenamento.carregar_alertas(),
+            ao_disparar=armazenamento.salvar_alerta,
+        )
+        self.orcamentos.verificar()
+        self.cards = armazenamento.carregar_cards()
+        self.goals = armazenamento.carregar_goals()
+        self.faturas = Faturas(self.cards)
+        for conta in self.faturas.contas():
+            # Totais por dia e só as linhas parceladas: sem ler o extrato do cartão.
+            self.faturas.carregar_resumo(conta, *armazenamento.totais_dia(conta), armazenamento.parceladas(conta))
+        self.aportes = AportesObjetivos()
+        for goal in self.goals:
+            self.aportes.adicionar(goal["nome"], armazenamento.consultar(categoria=goal["nome"]))
+        self.projecoes = ProjecoesObjetivos(self.aportes)
+        self.indices = None
+        self.hashes = None
+        self.categorizador = None
+        self._ledger = None
+        # Contas e receitas recorrentes dos próximos dias, em segundo plano desde já
+        # (por último: a thread já chama `recentes`).
+        self.previsoes = Previsoes(self.recentes, self.agregados.saldo, self.trava)
+        self.previsoes.agendar()
+
+    def ledger(self):
+        with self.trava:
+            if self._ledger is None:
+                ledger = self.armazenamento.carregar_ledger()
+                self.agregados.acompanhar(ledger, contabilizado=True)
+                self.armazenamento.acompanhar(ledger)
+                self.fluxo.acompanhar(ledger)
+                self.faturas.acompanhar(ledger, contabilizado=True)
+                self.aportes.acompanhar(ledger, contabilizado=True)
+                self.orcamentos.acompanhar(ledger)
+                self.indices = IndicesExtrato(ledger)
+                self.previsoes.acompanhar(ledger)
+                self.hashes = IndiceHashes(ledger)
+                # Tabela e modelo aprendidos com as categorias que o usuário já escolheu.
+                self.categorizador = Categorizador().treinar_ledger(ledger)
+                self._ledger = ledger
+            return self._ledger
+
+    def fechar(self):
+        # Ao sair da memória: para a previsão (esperando a thread, que lê o
+        # SQLite) e fecha a conexão do cliente.
+        self.previsoes.encerrar()
+        with self.trava:
+            self.armazenamento.fechar()
+
+    def criar_goal(self, goal):
+        # ValueError se o nome estiver vazio ou já for de um objetivo ou categoria.
+        with self.trava:
+            categorias = {*self.armazenamento.categorias(), *self.orcamentos.categorias(), "Receita"}
+            goal = {**goal, "nome": validar_nome(goal["nome"], self.goals, categorias)}
+            self.armazenamento.salvar_goal(goal)
+            self.goals.append(goal)
+            self.aportes.adicionar(goal["nome"], self.armazenamento.consultar(categoria=goal["nome"]))
+        return goal
+
+    def recentes(self, dias):
+        # Extrato dos `dias` dias até o lançamento mais recente: do Ledger se já
+        # estiver em memória, senão do SQLite (sem carregar o extrato inteiro).
+        if self._ledger is not None:
+            fim = self.indices.periodo()[1]
+            if fim is None:
+                return self._ledger.to_frame()
+            return self._ledger.take(self.indices.filtrar(inicio=pd.Timestamp(fim) - pd.Timedelta(days=dias)))
+        fim = self.armazenamento.periodo()[1]
+        if fim is None:
+            return self.armazenamento.consultar(limite=0)
+        return self.armazenamento.consultar(inicio=fim - pd.Timedelta(days=dias))
+
+
+class RegistroUsuarios:
+    """Estados por id de usuário, com despejo dos ociosos.
+
+    Uma instância por processo (via `st.cache_resource`): várias sessões do
+    mesmo cliente dividem um único estado, e quem fica `ocioso` segundos sem
+    acesso (ou passa do `maximo`, pelo menos recente) sai da memória e é
+    fechado (`EstadoUsuario.fechar`), assim como um estado criado em paralelo
+    que perdeu a corrida. Nada se perde: tudo já foi gravado no SQLite do
+    cliente, que é relido no próximo acesso.
+    """
+
+    def __init__(self, criar, ocioso=OCIOSO_PADRAO, maximo=MAXIMO_PADRAO):
+        self.criar = criar
+        self.ocioso = ocioso
+        self.maximo = maximo
+        self._estados = {}
+        self._trava = threading.Lock()
+        self.metricas = {"criados": 0, "despejados": 0}
+
+    def __len__(self):
+        return len(self._estados)
+
+    def obter(self, usuario):
+        agora = time.monotonic()
+        with self._trava:
+            fechar = self._despejar(agora)
+            estado = self._estados.get(usuario)
+        if estado is None:
+            # Criado fora da trava: abrir o banco de um cliente não segura os outros.
+            novo = self.criar(usuario)
+            with self._trava:
+                estado = self._estados.get(usuario)
+                if estado is None:
+                    if len(self._estados) >= self.maximo:
+                        fechar += self._remover([min(self._estados, key=lambda u: self._estados[u].ultimo_acesso)])
+                    estado = self._estados[usuario] = novo
+                    self.metricas["criados"] += 1
+                else:
+                    # Outra sessão criou o mesmo cliente antes: o nosso é descartado.
+                    fechar.append(novo)
+        estado.ultimo_acesso = agora
+        self._fechar(fechar)
+        return estado
+
+    def despejar_ociosos(self):
+        with self._trava:
+            fechar = self._despejar(time.monotonic())
+        self._fechar(fechar)
+
+    def _despejar(self, agora):
+        return self._remover([u for u, e in self._estados.items() if agora - e.ultimo_acesso > self.ocioso])
+
+    def _remover(self, usuarios):
+        removidos = [self._estados.pop(u) for u in usuarios]
+        self.metricas["despejados"] += len(usuarios)
+        return removidos
+
+    def _fechar(self, estados):
+        # Fora da trava: esperar a previsão de um cliente não segura os outros.
+        for estado in estados:
+            estado.fechar()
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from castelo.regras import avaliar_lote
+
+MAX_PARCELAS = 12
+
+
+def mes_fechamento(data_compra, fechamento):
+    # Compras a partir do dia de fechamento caem na fatura do mês seguinte.
+    data = pd.Timestamp(data_compra)
+    mes = np.datetime64(data.strftime("%Y-%m"), "M")
+    return mes + 1 if data.day >= fechamento else mes
+
+
+def mes_vencimento(mes_fech, fechamento, vencimento):
+    # Vencimento antes (ou no dia) do fechamento cai no mês seguinte ao fechamento.
+    return mes_fech if vencimento > fechamento else mes_fech + 1
+
+
+def simular_parcelas(valor, renda, card, data_compra, despesas_mensais=0.0, saldo_inicial=0.0,
+                     categoria="Essencial", max_parcelas=MAX_PARCELAS, horizonte=None):
+    """Projeta o fluxo de caixa mês a mês para 1..max_parcelas de uma vez.
+
+    A primeira parcela vai para a fatura do ciclo em que a compra cai
+    (pelo `fechamento` do cartão) e é paga no `vencimento` correspondente; a
+    fatura atual do cartão entra no primeiro vencimento. Tudo é calculado
+    numa grade (opções x meses) com NumPy.
+    """
+    primeiro = mes_vencimento(mes_fechamento(data_compra, card["fechamento"]), card["fechamento"], card["vencimento"])
+    hoje = np.datetime64(pd.Timestamp(data_compra).strftime("%Y-%m"), "M")
+    deslocamento = int((primeiro - hoje).astype(int))
+    if horizonte is None:
+        horizonte = deslocamento + max_parcelas
+    meses = hoje + np.arange(horizonte)
+
+    opcoes = np.arange(1, max_parcelas + 1)
+    k = np.arange(horizonte)[None, :] - deslocamento            # índice da parcela em cada mês
+    em_aberto = (k >= 0) & (k < opcoes[:, None])
+    valor_parcela = valor / opcoes
+    pagamentos = em_aberto * valor_parcela[:, None]
+
+    fatura_existente = np.zeros(horizonte)
+    if 0 <= deslocamento < horizonte:
+        fatura_existente[deslocamento] = card.get("fatura_atual", 0.0)
+
+    fluxo = renda - despesas_mensais - fatura_existente[None, :] - pagamentos
+    saldo = saldo_inicial + np.cumsum(fluxo, axis=1)
+
+    vereditos = avaliar_lote(
+        pd.DataFrame({"Valor": np.full(max_parcelas, valor), "Categoria": categoria, "Parcelas": opcoes}),
+        renda=renda,
+    )
+    rotulos = [str(m) for m in meses]
+    resumo = pd.DataFrame({
+        "Parcelas": opcoes,
+        "Valor Parcela": valor_parcela,
+        "Impacto %": vereditos["impacto_parcela"].to_numpy(),
+        "Pior Mês": np.array(rotulos, dtype=object)[fluxo.argmin(axis=1)],
+        "Fluxo Mínimo": fluxo.min(axis=1),
+        "Saldo Mínimo": saldo.min(axis=1),
+        "Veredito": vereditos["status"].to_numpy(),
+    })
+    grade = pd.DataFrame(fluxo, index=pd.Index(opcoes, name="Parcelas"), columns=rotulos)
+    return {"meses": meses, "pagamentos": pagamentos, "fluxo": fluxo, "saldo": saldo,
+            "resumo": resumo, "grade": grade}
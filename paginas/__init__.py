@@ -0,0 +1,25 @@
+# Castelo Forte - páginas do app.py. Cada módulo é importado só quando o
+# cliente abre a página, e traz junto o que só ela usa (Plotly, importadores,
+# simulador...); o app.py em si fica com a moldura (tema, menu, alertas).
+import importlib
+
+# Rótulo no menu -> módulo em paginas/, na ordem do menu.
+PAGINAS = {
+    "🏰 Visão Geral": "visao_geral",
+    "💳 Lançamentos": "lancamentos",
+    "💳 Cartões de Crédito": "cartoes",
+    "🎯 Objetivos (Reservas)": "objetivos",
+    "📊 Planejamento (Metas)": "planejamento",
+    "🔮 Oráculo VFP": "oraculo",
+    "⏱️ Desempenho": "desempenho",
+}
+PAGINAS_ADMIN = ("⏱️ Desempenho",)
+
+
+def opcoes(admin=False):
+    return [p for p in PAGINAS if admin or p not in PAGINAS_ADMIN]
+
+
+def carregar(pagina):
+    # Módulo da página (import na primeira visita do processo; depois, sys.modules).
+    return importlib.import_module(f"paginas.{PAGINAS[pagina]}")
@@ -0,0 +1,170 @@
+import base64
+import io
+import os
+
+import streamlit as st
+
+from castelo.oraculo import Oraculo, backend_padrao
+from castelo.perfil import Perfilador, caminho_configurado
+
+# Só dependências leves aqui: a moldura do app (tema, menu) é pintada antes de
+# pandas, do SQLite do cliente e das bibliotecas de cada página.
+LARGURA_LOGO = 150
+
+# --- CSS PERSONALIZADO (AZUL MARINHO & DOURADO) ---
+CSS = """
+    <style>
+    /* Fundo Geral */
+    .stApp {
+        background-color: #0e1117;
+        color: #e0e0e0;
+    }
+
+    /* Sidebar */
+    [data-testid="stSidebar"] {
+        background-color: #001529;
+        border-right: 1px solid #1e293b;
+    }
+
+    /* Títulos e Destaques */
+    h1, h2, h3 {
+        color: #D4AF37 !important; /* Dourado */
+        font-family: 'Helvetica Neue', sans-serif;
+    }
+
+    /* Métricas (Cards) */
+    div[data-testid="stMetricValue"] {
+        color: #D4AF37;
+        font-weight: bold;
+    }
+    div[data-testid="stMetricLabel"] {
+        color: #a0a0a0;
+    }
+
+    /* Botões */
+    .stButton>button {
+        background-color: #D4AF37;
+        color: #001529;
+        border: none;
+        border-radius: 8px;
+        font-weight: bold;
+        transition: 0.3s;
+    }
+    .stButton>button:hover {
+        background-color: #bfa130;
+        color: #000;
+    }
+
+    /* Tabelas */
+    .stDataFrame {
+        border: 1px solid #333;
+        border-radius: 5px;
+    }
+
+    /* Inputs */
+    .stTextInput>div>div>input, .stNumberInput>div>div>input {
+        background-color: #1e293b;
+        color: #fff;
+        border: 1px solid #333;
+    }
+    .stSelectbox>div>div>div {
+        background-color: #1e293b;
+        color: #fff;
+    }
+
+    /* Progress Bar */
+    .stProgress > div > div > div > div {
+        background-color: #D4AF37;
+    }
+    </style>
+"""
+
+
+# --- RECURSOS DO PROCESSO ---
+@st.cache_resource
+def perfilador():
+    # Um por processo; desligado, cada medição abaixo é uma chamada vazia.
+    return Perfilador(caminho_configurado())
+
+@st.cache_resource
+def logo_html(largura=LARGURA_LOGO):
+    # Já na largura da sidebar e embutido no HTML: o st.image reduziria o original
+    # (1280 px) a cada execução e importa numpy antes de o menu aparecer.
+    from PIL import Image
+    with Image.open("logo.jpg") as imagem:
+        imagem.draft("RGB", (largura, largura))     # JPEG decodificado já reduzido
+        imagem.thumbnail((largura, largura))
+        saida = io.BytesIO()
+        imagem.save(saida, format="JPEG", quality=90)
+    return f'<img src="data:image/jpeg;base64,{base64.b64encode(saida.getvalue()).decode()}" width="{largura}">'
+
+@st.cache_resource
+def obter_oraculo(api_token):
+    # Um cliente por processo: o cache de veredictos é compartilhado entre sessões.
+    backend = backend_padrao(api_token)
+    return Oraculo(backend) if backend is not None else None
+
+
+# --- CONFIGURAÇÃO DE SEGURANÇA (API KEY) ---
+def chave_replicate(area):
+    # A primeira leitura de st.secrets no processo procura (e vigia) o secrets.toml
+    # e pode levar ~0,4 s sem o arquivo; por isso fica fora da moldura.
+    chave = st.secrets.get("REPLICATE_API_TOKEN") or os.environ.get("REPLICATE_API_TOKEN")
+    if not chave:
+        with area:
+            st.markdown("---")
+            chave = st.text_input("🔑 API Replicate (Temp)", type="password", help="Cole sua chave aqui para ativar a IA.")
+            if chave:
+                # Só nesta sessão: gravar no os.environ vazaria a chave para os outros clientes.
+                st.success("IA Ativada!")
+    return chave
+
+
+# --- CONTEXTO DA EXECUÇÃO ---
+class Contexto:
+    """O que o app.py resolve a cada execução e entrega à página.
+
+    `estado` (carteira e extrato do cliente) e `chave_api()` só são
+    resolvidos no primeiro acesso: até lá nada de pandas, SQLite nem
+    st.secrets, então uma página que começa por um formulário já aparece
+    enquanto os dados do cliente carregam. `area_chave` é onde o campo da
+    chave da API entra na sidebar quando ela não está configurada.
+    """
+
+    def __init__(self, execucao, area_chave):
+        self.execucao = execucao
+        self.area_chave = area_chave
+        self._estado = None
+        self._replicate_api = None
+
+    def chave_api(self):
+        # Chave do Replicate; sem configuração, o campo da sidebar (uma vez por execução).
+        if self._replicate_api is None:
+            self._replicate_api = chave_replicate(self.area_chave) or ""
+        return self._replicate_api or None
+
+    @property
+    def estado(self):
+        if self._estado is None:
+            with self.execucao.bloco("estado"):
+                from paginas.clientes import estado_atual
+                self._estado = estado_atual()
+        return self._estado
+
+    def alertas(self):
+        # Alertas do mês já disparados: leitura direta, sem recalcular gastos.
+        return self.estado.orcamentos.alertas()
+
+    def alertas_novos(self, vistos):
+        # Disparados depois dos `vistos` primeiros, só os do mês corrente.
+        from castelo.orcamentos import mes_atual
+        atual = mes_atual()
+        return [a for a in self.estado.orcamentos.eventos_desde(vistos) if a['mes'] == atual]
+
+    def texto_alerta(self, alerta):
+        # Percentual atual (o gasto continua subindo depois do disparo) e o limiar atingido.
+        orcamentos = self.estado.orcamentos
+        gasto = orcamentos.gastos(alerta['mes']).get(alerta['categoria'], 0.0)
+        limite = orcamentos.limite(alerta['categoria'], alerta['mes']) or alerta['limite']
+        return f"{alerta['categoria']}: {gasto / limite * 100:.0f}% do teto (R$ {gasto:,.2f} de R$ {limite:,.2f})"
+
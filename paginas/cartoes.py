@@ -0,0 +1,39 @@
+# Cartões de Crédito: fatura aberta, fechada e parcelas futuras de cada cartão.
+import streamlit as st
+
+from castelo.faturas import conta_do_card
+
+
+def mostrar(ctx):
+    estado = ctx.estado
+    st.title("Gestão de Cartões")
+
+    faturas = estado.faturas
+    for card in estado.cards:
+        # Fatura do ciclo aberto + fechada a vencer + parcelas futuras, pelos lançamentos da conta do cartão.
+        resumo = faturas.resumo(card['nome'])
+        with st.container():
+            st.markdown(f"### {card['nome']}")
+            c1, c2, c3 = st.columns(3)
+            with c1:
+                fechada = f"Fechada: R$ {resumo['fechada']:,.2f}" if resumo['fechada'] else None
+                st.metric("Fatura Atual", f"R$ {resumo['aberta']:,.2f}", fechada, delta_color="off")
+            with c2:
+                disponivel = card['limite'] - resumo['comprometido']
+                st.metric("Disponível", f"R$ {disponivel:,.2f}", f"Parcelas futuras: R$ {resumo['futuras']:,.2f}", delta_color="off")
+            with c3:
+                st.metric("Vencimento", f"Dia {card['vencimento']}", f"{resumo['vencimento'].item():%d/%m}", delta_color="off")
+
+            # Barra de Limite (o uso pode passar de 100%; a barra não)
+            pct_uso = resumo['comprometido'] / card['limite'] if card['limite'] else 0.0
+            st.progress(min(max(pct_uso, 0.0), 1.0), text=f"Uso do Limite: {pct_uso*100:.1f}%")
+            with st.expander(f"Faturas · conta \"{conta_do_card(card)}\""):
+                st.dataframe(
+                    faturas.faturas(card['nome']).iloc[::-1], hide_index=True, use_container_width=True,
+                    column_config={
+                        "Fechamento": st.column_config.DateColumn(format="DD/MM/YYYY"),
+                        "Vencimento": st.column_config.DateColumn(format="DD/MM/YYYY"),
+                        "Total": st.column_config.NumberColumn(format="R$ %.2f"),
+                    }
+                )
+            st.markdown("---")
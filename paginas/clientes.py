@@ -0,0 +1,84 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from castelo.armazenamento import Armazenamento
+from castelo.sessoes import USUARIO_DEMO, EstadoUsuario, RegistroUsuarios, caminho_usuario
+
+
+# --- DADOS DE REFERÊNCIA (UMA CÓPIA POR PROCESSO) ---
+@st.cache_resource
+def dados_referencia():
+    # Somente leitura: semeiam bancos novos e são compartilhados por todas as sessões.
+    return {
+        "transacoes": pd.DataFrame({
+            "Data": [datetime(2026, 2, 4), datetime(2026, 2, 5), datetime(2026, 2, 5), datetime(2026, 2, 6)],
+            "Descrição": ["Netflix", "Salário", "Uber", "Supermercado"],
+            "Categoria": ["Lazer", "Receita", "Transporte", "Alimentação"],
+            "Valor": [-55.90, 18200.00, -24.90, -450.00],
+            "Conta": ["Nubank", "Itaú", "Nubank", "Nubank"],
+            "Status": ["Pago", "Recebido", "Pago", "Pago"]
+        }),
+        "budgets": {
+            "Alimentação": 1500.00,
+            "Transporte": 500.00,
+            "Lazer": 400.00,
+            "Moradia": 3000.00
+        },
+        "cards": [
+            {"nome": "Nubank Roxinho", "limite": 15000.00, "fechamento": 5, "vencimento": 12, "conta": "Nubank"},
+            {"nome": "Itaú Black", "limite": 35000.00, "fechamento": 20, "vencimento": 28, "conta": "Itaú Black"}
+        ],
+        "goals": [
+            {"nome": "Reserva de Emergência", "alvo": 100000.00, "atual": 12450.00, "cor": "#2ecc71",
+             "prazo": "2028-12-01", "retorno": 0.10, "volatilidade": 0.0},
+            {"nome": "Viagem Europa", "alvo": 30000.00, "atual": 5000.00, "cor": "#3498db",
+             "prazo": "2027-07-01", "retorno": 0.08, "volatilidade": 0.0},
+            {"nome": "Troca de Carro", "alvo": 150000.00, "atual": 0.00, "cor": "#e74c3c",
+             "prazo": "2030-12-01", "retorno": 0.12, "volatilidade": 0.18}
+        ],
+    }
+
+
+# --- ARMAZENAMENTO POR USUÁRIO (SQLITE) ---
+def abrir_usuario(usuario):
+    # Clientes novos começam com os orçamentos padrão; o demo ganha a carteira de exemplo.
+    ref = dados_referencia()
+    arm = Armazenamento(caminho_usuario(usuario))
+    if not arm.carregar_budgets():
+        for cat, limite in ref["budgets"].items():
+            arm.salvar_budget(cat, limite)
+    if usuario == USUARIO_DEMO:
+        if arm.vazio():
+            arm.inserir(ref["transacoes"])
+        cards_salvos = {c["nome"]: c for c in arm.carregar_cards()}
+        for card in ref["cards"]:
+            # Cartões de bancos antigos ganham a conta do extrato a que estão ligados.
+            if card["nome"] not in cards_salvos or not cards_salvos[card["nome"]]["conta"]:
+                arm.salvar_card({**cards_salvos.get(card["nome"], {}), **card})
+        goals_salvos = arm.carregar_goals()
+        if not goals_salvos:
+            for goal in ref["goals"]:
+                arm.salvar_goal(goal)
+        for goal in ref["goals"]:
+            # Objetivos de bancos antigos ganham prazo e premissas de rendimento.
+            salvo = next((g for g in goals_salvos if g["nome"] == goal["nome"]), None)
+            if salvo is not None and not salvo["prazo"]:
+                arm.salvar_goal({**goal, "atual": salvo["atual"], "alvo": salvo["alvo"]})
+    return EstadoUsuario(usuario, arm)
+
+@st.cache_resource
+def registro_usuarios():
+    # Um estado por cliente no processo, compartilhado pelas abas dele e despejado quando ocioso.
+    return RegistroUsuarios(abrir_usuario)
+
+def usuario_atual():
+    # Com login (st.login), cada cliente é o seu e-mail; sem login, o usuário fixo do servidor.
+    if st.user.get("is_logged_in"):
+        return st.user.get("email") or st.user.get("sub")
+    return os.environ.get("CASTELO_USUARIO", USUARIO_DEMO)
+
+def estado_atual():
+    return registro_usuarios().obter(usuario_atual())
@@ -0,0 +1,38 @@
+# Desempenho (admin): latências por etapa e execuções recentes do perfilador.
+import pandas as pd
+import streamlit as st
+
+from castelo.perfil import agregar
+from paginas.base import perfilador
+
+
+def mostrar(ctx):
+    st.title("Desempenho por Execução")
+    perf = perfilador()
+    if not perf.ativo:
+        st.info("Medição desligada. Inicie com `CASTELO_PERFIL=perfil.jsonl` para registrar as execuções; "
+                "o log pode ser agregado com `python benchmarks/relatorio_perfil.py perfil.jsonl`.")
+    else:
+        recentes = list(perf.recentes)
+        st.caption(f"Últimas {len(recentes)} execuções de todas as sessões · log em `{perf.caminho}`")
+        resumo = agregar(recentes)
+        formato_ms = st.column_config.NumberColumn(format="%.1f ms")
+        st.subheader("Latências (p50 / p95 / p99)")
+        st.dataframe(
+            resumo, hide_index=True, use_container_width=True,
+            column_config={
+                **{c: formato_ms for c in ("p50", "p95", "p99", "max")},
+                "mem_media_mb": st.column_config.NumberColumn("Memória (Δ MB)", format="%.2f"),
+            }
+        )
+        st.subheader("Execuções Recentes")
+        st.dataframe(
+            pd.DataFrame([
+                {"Quando": r["ts"], "Sessão": r["sessao"], "Página": r["pagina"], "Total": r["total_ms"],
+                 "RSS (MB)": r["rss_mb"], "Δ Memória (MB)": r["mem_mb"], "Interrompida": r["interrompida"],
+                 "LLM": sum(c["ms"] for c in r["llm"]) or None}
+                for r in reversed(recentes)
+            ]),
+            hide_index=True, use_container_width=True,
+            column_config={"Total": formato_ms, "LLM": formato_ms},
+        )
@@ -0,0 +1,123 @@
+# Lançamentos: extrato filtrado e paginado, importação OFX/CSV e lançamento manual.
+import time
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from castelo.extrato import TAMANHO_PAGINA_PADRAO, TAMANHOS_PAGINA, PaginasExtrato, total_paginas
+from castelo.faturas import dividir_parcelas
+from castelo.importador import Importador, ler_csv, ler_ofx
+
+
+def mostrar(ctx):
+    estado = ctx.estado
+    execucao = ctx.execucao
+    st.title("Extrato Inteligente")
+
+    with execucao.bloco("lancamentos.ledger"):
+        ledger = estado.ledger()
+    indices = estado.indices
+    data_min, data_max = indices.periodo()
+    if data_max is None:
+        data_min = data_max = datetime.today()
+    data_min, data_max = pd.Timestamp(data_min).date(), pd.Timestamp(data_max).date()
+
+    c_filter1, c_filter2, c_filter3 = st.columns(3)
+    with c_filter1:
+        periodo = st.date_input("Período", (data_min, data_max))
+    with c_filter2:
+        conta_sel = st.selectbox("Conta", ["Todas"] + indices.contas())
+    with c_filter3:
+        categorias = sorted(set(estado.orcamentos.categorias()) | set(indices.categorias()))
+        cat_sel = st.selectbox("Categoria", ["Todas"] + categorias)
+
+    # Filtros servidos pelos índices (data ordenada, conta, categoria): custo proporcional ao resultado.
+    if isinstance(periodo, (tuple, list)):
+        inicio, fim = (periodo[0], periodo[-1]) if periodo else (None, None)
+    else:
+        inicio = fim = periodo
+    with execucao.bloco("lancamentos.filtros"):
+        posicoes = indices.filtrar(
+            inicio=pd.Timestamp(inicio) if inicio else None,
+            fim=pd.Timestamp(fim) + pd.Timedelta(days=1) if fim else None,
+            conta=None if conta_sel == "Todas" else conta_sel,
+            categoria=None if cat_sel == "Todas" else cat_sel,
+        )
+
+    # Extrato paginado: só a página visível é estilizada e enviada ao navegador.
+    if 'paginas_extrato' not in st.session_state:
+        st.session_state.paginas_extrato = PaginasExtrato()
+
+    c_pag1, c_pag2 = st.columns([1, 3])
+    with c_pag1:
+        tamanho = st.selectbox("Linhas por página", TAMANHOS_PAGINA, index=TAMANHOS_PAGINA.index(TAMANHO_PAGINA_PADRAO))
+    n_paginas = total_paginas(len(posicoes), tamanho)
+    with c_pag2:
+        pagina = st.number_input(f"Página (de {n_paginas})", min_value=1, max_value=n_paginas, value=1, step=1)
+
+    filtros = (str(inicio), str(fim), conta_sel, cat_sel)
+    t0 = time.perf_counter()
+    with execucao.bloco("lancamentos.pagina"):
+        pag = st.session_state.paginas_extrato.pagina(ledger, posicoes, filtros, int(pagina), tamanho)
+    st.dataframe(
+        pag["styler"],
+        use_container_width=True,
+        height=400,
+        column_config={
+            "Data": st.column_config.DatetimeColumn(format="DD/MM/YYYY"),
+            "Valor": st.column_config.NumberColumn(format="R$ %.2f")
+        }
+    )
+    ms_render = (time.perf_counter() - t0) * 1e3
+    st.caption(
+        f"{len(posicoes):,} lançamentos · página {int(pagina)} de {n_paginas} · "
+        f"payload {pag['payload'] / 1024:.1f} KB · render {ms_render:.1f} ms"
+    )
+
+    with st.expander("📥 Importar Extrato (OFX/CSV)", expanded=False):
+        arquivo = st.file_uploader("Arquivo do banco", type=["ofx", "csv"])
+        c1, c2 = st.columns(2)
+        conta_imp = c1.text_input("Conta", placeholder="Ex: Nubank (OFX usa a conta do arquivo)")
+        sep_csv = c2.selectbox("Separador (CSV)", [";", ","])
+        if arquivo is not None and st.button("Importar"):
+            # Lido em lotes, deduplicado por hash e gravado em massa.
+            if arquivo.name.lower().endswith(".ofx"):
+                lotes = ler_ofx(arquivo, conta=conta_imp or None)
+            else:
+                lotes = ler_csv(arquivo, conta=conta_imp or "Importado", sep=sep_csv)
+            try:
+                with estado.trava, execucao.bloco("lancamentos.importar"):
+                    importador = Importador(ledger, estado.hashes, estado.categorizador)
+                    stats = importador.importar(lotes)
+            except ValueError as e:
+                st.error(f"Não foi possível importar: {e}")
+            else:
+                st.toast(f"{stats['inseridas']} lançamentos importados, {stats['duplicadas']} duplicados ignorados.", icon="📥")
+                st.rerun()
+
+    with st.expander("➕ Novo Lançamento Manual", expanded=False):
+        with st.form("new_transaction"):
+            c1, c2 = st.columns(2)
+            desc = c1.text_input("Descrição")
+            val = c2.number_input("Valor", step=0.01)
+            cat = c1.selectbox("Categoria", estado.orcamentos.categorias() + ["Receita"])
+            data = c2.date_input("Data")
+            conta = c1.selectbox("Conta", ["Manual"] + estado.faturas.contas())
+            parcelas = c2.number_input("Parcelas (cartão)", min_value=1, max_value=48, value=1, step=1)
+            tipo = st.radio("Tipo", ["Despesa", "Receita"], horizontal=True)
+
+            if st.form_submit_button("Salvar Transação"):
+                valor_final = val if tipo == "Receita" else -val
+                if parcelas > 1 and (valor_final >= 0 or conta not in estado.faturas.contas()):
+                    st.error("Parcelamento só vale para despesas lançadas num cartão.")
+                else:
+                    if parcelas > 1:
+                        # Primeira parcela no extrato ("LOJA 01/10"), com os centavos que sobram da
+                        # divisão; as demais ficam projetadas nas próximas faturas.
+                        desc, valor_final = f"{desc} 01/{int(parcelas):02d}", dividir_parcelas(valor_final, int(parcelas))[0]
+                    with estado.trava:
+                        ledger.append(data, desc, cat, valor_final, conta=conta, status="Pago")
+                        estado.categorizador.aprender(desc, cat)
+                    st.toast("Transação salva com sucesso!", icon="✅")
+                    st.rerun()
@@ -0,0 +1,92 @@
+# Objetivos (Reservas): progresso, projeções e aportes de cada meta.
+import pandas as pd
+import streamlit as st
+
+from castelo.ledger import TRANSFERENCIA
+
+
+def mostrar(ctx):
+    estado = ctx.estado
+    execucao = ctx.execucao
+    st.title("Metas & Sonhos")
+    st.markdown("Acompanhe a evolução do seu patrimônio e conquistas.")
+
+    col_goals, col_add = st.columns([2, 1])
+
+    with col_goals:
+        # Projeções memorizadas no estado do cliente até o próximo aporte ou mudança de meta.
+        with execucao.bloco("objetivos.projecoes"):
+            projecoes = estado.projecoes.obter(estado.goals)
+        for goal, proj in zip(estado.goals, projecoes.itertuples()):
+            pct = min(max(proj.saldo / goal['alvo'], 0.0), 1.0)
+            st.subheader(f"{goal['nome']}")
+            c1, c2 = st.columns([3, 1])
+            with c1:
+                st.markdown(f"""
+                    <div style="background-color: #262730; border-radius: 6px; height: 12px; margin-top: 8px;">
+                        <div style="background-color: {goal['cor']}; width: {pct*100:.1f}%; height: 12px; border-radius: 6px;"></div>
+                    </div>
+                """, unsafe_allow_html=True)
+                st.caption(f"{pct*100:.1f}% Concluído")
+            with c2:
+                st.write(f"R$ {proj.saldo:,.2f} / R$ {goal['alvo']:,.2f}")
+            m1, m2, m3 = st.columns(3)
+            with m1:
+                previsao = proj.data_prevista.strftime("%m/%Y") if pd.notna(proj.data_prevista) else "Sem previsão"
+                st.metric("Previsão", previsao, f"R$ {proj.aporte_medio:,.2f}/mês (média)", delta_color="off")
+            with m2:
+                if goal.get('prazo'):
+                    st.metric("Aporte Necessário", f"R$ {proj.aporte_necessario:,.2f}/mês",
+                              f"prazo {pd.Timestamp(goal['prazo']):%m/%Y}", delta_color="off")
+            with m3:
+                if pd.notna(proj.prob_prazo):
+                    st.metric("Chance no Prazo", f"{proj.prob_prazo*100:.0f}%")
+            if goal.get('volatilidade'):
+                cenarios = [d.strftime("%m/%Y") if pd.notna(d) else "sem previsão" for d in (proj.p10, proj.p50, proj.p90)]
+                st.caption(f"Cenários de mercado: otimista {cenarios[0]} · provável {cenarios[1]} · pessimista {cenarios[2]}")
+            st.write("")
+
+    with col_add:
+        if estado.goals:
+            with st.form("aporte"):
+                st.subheader("Aportar")
+                nome_aporte = st.selectbox("Objetivo", [g['nome'] for g in estado.goals])
+                tipo_aporte = st.radio("Tipo", ["Aporte", "Resgate"], horizontal=True)
+                valor_aporte = st.number_input("Valor (R$)", min_value=0.01, value=500.0)
+                if st.form_submit_button("Registrar"):
+                    # Aportes são lançamentos com a categoria do objetivo: saem do saldo e entram na meta.
+                    # Status TRANSFERENCIA: não contam como despesa (nem o resgate como receita).
+                    sinal = -1 if tipo_aporte == "Aporte" else 1
+                    ledger = estado.ledger()
+                    with estado.trava:
+                        ledger.append(pd.Timestamp.today().normalize(), f"{tipo_aporte}: {nome_aporte}", nome_aporte,
+                                      sinal * valor_aporte, conta="Manual", status=TRANSFERENCIA)
+                    st.toast(f"{tipo_aporte} registrado!", icon="💰")
+                    st.rerun()
+
+        with st.form("new_goal"):
+            st.subheader("Novo Objetivo")
+            nome = st.text_input("Nome da Meta", placeholder="Ex: Casa Própria")
+            alvo = st.number_input("Valor Alvo (R$)", min_value=100.0)
+            inicial = st.number_input("Depósito Inicial (R$)", min_value=0.0)
+            prazo = st.date_input("Prazo", value=pd.Timestamp.today() + pd.DateOffset(years=2))
+            retorno = st.number_input("Rendimento Esperado (% a.a.)", min_value=0.0, max_value=50.0, value=10.0)
+            volatilidade = st.number_input("Volatilidade (% a.a.)", min_value=0.0, max_value=80.0, value=0.0,
+                                           help="Acima de zero para metas investidas em renda variável: a previsão passa a ter cenários.")
+            if st.form_submit_button("Criar Meta"):
+                goal = {
+                    "nome": nome,
+                    "alvo": alvo,
+                    "atual": inicial,
+                    "cor": "#D4AF37",
+                    "prazo": prazo.isoformat(),
+                    "retorno": retorno / 100,
+                    "volatilidade": volatilidade / 100,
+                }
+                try:
+                    estado.criar_goal(goal)
+                except ValueError as e:
+                    st.error(str(e))
+                else:
+                    st.toast("Objetivo criado!", icon="🚀")
+                    st.rerun()
@@ -0,0 +1,109 @@
+# Oráculo VFP: veredito das regras locais, explicação da IA e simulação de parcelas.
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from castelo.regras import APROVADO, CUIDADO, REPROVADO, avaliar
+from paginas.base import obter_oraculo
+
+
+def mostrar(ctx):
+    st.title("Oráculo VFP 2.0 (IA)")
+    st.markdown("O **Guardião do Castelo** usa Inteligência Artificial para analisar suas decisões.")
+
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        st.subheader("Simulador de Compra")
+        descricao = st.text_input("O que você quer comprar?", placeholder="Ex: iPhone 16 Pro Max")
+        val_compra = st.number_input("Valor da Compra (R$)", 0.0, step=100.0)
+        categoria = st.selectbox("Categoria", ["Essencial", "Estilo de Vida", "Supérfluo/Desejo"])
+        parcelas = st.slider("Parcelas", 1, 12, 1)
+
+        renda_mensal = 18200.00 
+
+        oraculo = obter_oraculo(ctx.chave_api())
+
+        if st.button("Consultar Guardião", type="primary"):
+            # O veredito sai das regras locais; a IA só escreve a explicação.
+            veredito = avaliar(val_compra, renda_mensal, categoria, parcelas)
+            prompt = f"""
+            Você é o 'Guardião VFP' (Verdade, Fidelidade, Propósito).
+            Compra: {descricao} | Valor: R$ {val_compra:.2f} em {parcelas}x
+            Renda: R$ {renda_mensal:.2f} | Impacto da parcela: {veredito.impacto_parcela:.1f}% | Categoria: {categoria}
+
+            Veredito já decidido pelas regras: {veredito.status} ({veredito.mensagem})
+            Explique o veredito em poucas frases. Cite Bíblia se necessário.
+            """
+
+            st.markdown("### 📜 Veredito")
+            exibir = {APROVADO: st.success, CUIDADO: st.warning, REPROVADO: st.error}[veredito.status]
+            exibir(f"**{veredito.status}** — {veredito.mensagem}")
+            if oraculo is not None:
+                with st.spinner("O Guardião está consultando a sabedoria milenar..."):
+                    try:
+                        st.write_stream(oraculo.consultar(prompt, fallback=lambda: veredito.mensagem, medir=ctx.execucao.llm))
+                    except Exception as e:
+                        st.error(f"Erro na IA: {e}")
+            else:
+                st.write("⚠️ **IA Offline:** Adicione a chave API na sidebar para ver a opinião do Guardião.")
+            st.markdown("---")
+
+            if veredito.status == REPROVADO:
+                st.progress(min(veredito.impacto_parcela/100, 1.0), text="⚠️ Risco Crítico")
+            else:
+                st.progress(veredito.impacto_parcela/100, text="✅ Margem Segura")
+
+        # Comparação de todas as parcelas, ciclo a ciclo do cartão escolhido. Os dados do
+        # cliente e o simulador (numpy/pandas) só entram aqui, depois do formulário pintado.
+        cards = ctx.estado.cards
+        if cards and st.toggle("📅 Comparar 1–12x (fluxo mês a mês)"):
+            from castelo.simulador import simular_parcelas
+            nomes_cards = [c['nome'] for c in cards]
+            card_sel = cards[nomes_cards.index(st.selectbox("Cartão", nomes_cards))]
+            card_sel = {**card_sel, "fatura_atual": ctx.estado.faturas.resumo(card_sel['nome'])['aberta']}
+            # Renda, despesas e saldo lidos da previsão das recorrentes (calculada em
+            # segundo plano); enquanto ela não fica pronta, a média dos meses.
+            previsao = ctx.estado.previsoes.obter()
+            if previsao is not None and previsao["renda_mensal"] > 0:
+                renda_sim, despesas_sim, saldo_sim = (
+                    previsao["renda_mensal"], previsao["despesas_mensais"], previsao["saldo"]
+                )
+                origem = "recorrentes previstas"
+            else:
+                agg = ctx.estado.agregados
+                despesas_mes = list(agg.despesas_mes.values())
+                renda_sim, saldo_sim = renda_mensal, agg.saldo()
+                despesas_sim = sum(despesas_mes) / len(despesas_mes) if despesas_mes else 0.0
+                origem = "média dos meses"
+            t0 = time.perf_counter()
+            sim = simular_parcelas(
+                val_compra, renda_sim, card_sel, datetime.today(),
+                despesas_mensais=despesas_sim, saldo_inicial=saldo_sim, categoria=categoria,
+            )
+            ms_sim = (time.perf_counter() - t0) * 1e3
+            st.dataframe(
+                sim["resumo"], hide_index=True, use_container_width=True,
+                column_config={
+                    "Valor Parcela": st.column_config.NumberColumn(format="R$ %.2f"),
+                    "Impacto %": st.column_config.NumberColumn(format="%.1f%%"),
+                    "Fluxo Mínimo": st.column_config.NumberColumn(format="R$ %.2f"),
+                    "Saldo Mínimo": st.column_config.NumberColumn(format="R$ %.2f"),
+                }
+            )
+            with st.expander("Fluxo líquido por mês"):
+                st.dataframe(sim["grade"].style.format("R$ {:,.0f}"), use_container_width=True)
+            st.caption(f"Simulação de {len(sim['resumo'])} opções × {len(sim['meses'])} meses em {ms_sim:.1f} ms · "
+                       f"renda R$ {renda_sim:,.2f} e despesas R$ {despesas_sim:,.2f} por mês ({origem})")
+
+        p50 = oraculo.latencia_p50() if oraculo is not None else None
+        if p50 is not None:
+            st.caption(
+                f"Oráculo: {oraculo.metricas['consultas']} consultas · acerto de cache {oraculo.taxa_acerto()*100:.0f}% · "
+                f"latência p50 {p50:.2f}s · timeouts {oraculo.metricas['timeouts']}"
+            )
+
+    with col2:
+        st.subheader("Princípios")
+        st.info("💡 **Dica:** Antes de comprar, pergunte: Eu preciso? Eu posso pagar à vista? Isso me aproxima do meu propósito?")
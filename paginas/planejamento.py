@@ -0,0 +1,55 @@
+# Planejamento (Metas): tetos de gasto por categoria e mês, com histórico de alertas.
+import pandas as pd
+import streamlit as st
+
+from castelo.fluxo import rotulo_mes
+from castelo.orcamentos import mes_atual
+
+
+def mostrar(ctx):
+    estado = ctx.estado
+    st.title("Teto de Gastos (Orçamento)")
+
+    # Gastos por mês mantidos a cada lançamento; tetos com histórico por mês.
+    orcamentos = estado.orcamentos
+    atual = mes_atual()
+    meses = sorted(set(orcamentos.meses()) | {atual}, reverse=True)
+    ultimo = max((m for m in orcamentos.meses() if m <= atual), default=atual)
+    mes = st.selectbox("Mês", meses, index=meses.index(ultimo), format_func=rotulo_mes)
+    gastos_cat = orcamentos.gastos(mes)
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.subheader("Progresso do Mês")
+        for cat, limite in orcamentos.limites(mes).items():
+            gasto_atual = gastos_cat.get(cat, 0.0)
+            pct = min(gasto_atual / limite, 1.0) if limite > 0 else 0.0
+            marca = " 🔴" if pct >= 1 else " 🟠" if pct >= orcamentos.limiares[0] else ""
+
+            st.write(f"**{cat}**{marca}")
+            st.progress(pct, text=f"{gasto_atual:.2f} de {limite:.2f} ({pct*100:.0f}%)")
+        disparados = [e for e in orcamentos.eventos if e['mes'] == mes]
+        if disparados:
+            with st.expander(f"Alertas de {rotulo_mes(mes)} ({len(disparados)})"):
+                st.dataframe(
+                    pd.DataFrame(disparados)[["quando", "categoria", "limiar", "gasto", "limite"]],
+                    use_container_width=True, hide_index=True,
+                    column_config={
+                        "limiar": st.column_config.NumberColumn("Limiar", format="percent"),
+                        "gasto": st.column_config.NumberColumn("Gasto", format="R$ %.2f"),
+                        "limite": st.column_config.NumberColumn("Teto", format="R$ %.2f"),
+                    }
+                )
+
+    with col2:
+        st.subheader("Ajustar Limites")
+        cat_edit = st.selectbox("Categoria", orcamentos.categorias())
+        new_limit = st.number_input(f"Limite para {cat_edit}", value=float(orcamentos.limite(cat_edit, mes) or 0.0))
+        vigencia = st.radio("Vale para", [f"{rotulo_mes(mes)} em diante", "Todos os meses (padrão)"])
+        if st.button("Salvar Meta"):
+            a_partir = None if vigencia.startswith("Todos") else mes
+            with estado.trava:
+                estado.armazenamento.salvar_budget(cat_edit, new_limit, a_partir)
+                orcamentos.definir(cat_edit, new_limit, a_partir)
+            st.rerun()
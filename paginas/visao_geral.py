@@ -0,0 +1,103 @@
+# Visão Geral (dashboard): resumo do mês, faturas, previsão das recorrentes e gráficos.
+import streamlit as st
+
+from castelo.graficos import (
+    TEMA_PADRAO, CacheFiguras, figura_categorias, figura_fluxo, remendar_categorias, remendar_fluxo
+)
+from castelo.recorrencias import HORIZONTE
+
+
+def mostrar(ctx):
+    estado = ctx.estado
+    execucao = ctx.execucao
+    st.title("Painel de Controle")
+    st.markdown("Bem-vindo ao seu QG Financeiro, **Maycon**.")
+
+    # 1. Cards Superiores (Resumo)
+    agg = estado.agregados
+    receitas = agg.receitas()
+    despesas = agg.despesas()
+    saldo = agg.saldo()
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Saldo Atual", f"R$ {saldo:,.2f}", "+5.2%")
+    with col2:
+        st.metric("Receitas (Mês)", f"R$ {receitas:,.2f}", "+12%")
+    with col3:
+        st.metric("Despesas (Mês)", f"R$ {despesas:,.2f}", "-2%")
+    with col4:
+        resumos = [estado.faturas.resumo(c['nome']) for c in estado.cards]
+        total_faturas = sum(r['aberta'] + r['fechada'] for r in resumos)
+        dias = min((r['dias_vencimento'] for r in resumos if r['aberta'] + r['fechada'] > 0), default=None)
+        st.metric("Faturas Abertas", f"R$ {total_faturas:,.2f}", f"Vence em {dias} dias" if dias is not None else None)
+
+    for alerta in ctx.alertas():
+        (st.error if alerta['limiar'] >= 1 else st.warning)(f"Orçamento do mês — {ctx.texto_alerta(alerta)}", icon="🚨" if alerta['limiar'] >= 1 else "⚠️")
+
+    # 2. Próximos dias: contas e receitas recorrentes, previstas em segundo plano
+    st.subheader(f"Próximos {HORIZONTE} dias")
+    with execucao.bloco("dashboard.previsao"):
+        previsao = estado.previsoes.obter()
+    if previsao is None and estado.previsoes.erro is not None:
+        st.caption(f"Previsão das contas recorrentes indisponível: {estado.previsoes.erro}")
+    elif previsao is None:
+        st.caption("Previsão das contas recorrentes: calculando…")
+    else:
+        saldos = previsao["saldos"]["Saldo"]
+        cols = st.columns(4)
+        for col, dias in zip(cols, (30, 60, HORIZONTE)):
+            col.metric(f"Saldo em {dias} dias", f"R$ {saldos.iloc[dias]:,.2f}", f"{saldos.iloc[dias] - saldos.iloc[0]:+,.2f}")
+        eventos = previsao["eventos"]
+        contas = eventos[eventos["Valor"] < 0]
+        if len(contas):
+            proxima = contas.iloc[0]
+            faltam = (proxima["Data"] - previsao["hoje"]).days
+            cols[3].metric("Próxima Conta", f"R$ {-proxima['Valor']:,.2f}",
+                           f"{proxima['Descrição']} em {faltam} dias", delta_color="off")
+        with st.expander(f"{len(previsao['series'])} recorrências · {len(eventos)} lançamentos previstos"):
+            st.dataframe(
+                eventos, hide_index=True, use_container_width=True,
+                column_config={
+                    "Data": st.column_config.DateColumn(format="DD/MM/YYYY"),
+                    "Valor": st.column_config.NumberColumn(format="R$ %.2f"),
+                }
+            )
+
+    st.markdown("---")
+
+    # 3. Gráficos Principais (figuras reaproveitadas enquanto dados e tema não mudam)
+    if 'figuras' not in st.session_state:
+        st.session_state.figuras = CacheFiguras()
+    figuras = st.session_state.figuras
+    tema = getattr(getattr(st.context, "theme", None), "type", None) or TEMA_PADRAO
+
+    c1, c2 = st.columns([2, 1])
+    with c1:
+        _fluxo(estado, execucao, figuras, tema)
+    with c2:
+        st.subheader("Por Categoria")
+        with execucao.bloco("dashboard.categorias"):
+            gastos = agg.gastos_por_categoria()
+            fig_pie = figuras.obter(
+                "categorias", agg.versao, tema,
+                lambda: figura_categorias(gastos), remendar_categorias(gastos)
+            )
+        st.plotly_chart(fig_pie, use_container_width=True)
+
+
+# Fragmento: trocar a janela reexecuta (e reserializa) só o gráfico de fluxo, sem
+# refazer cards, previsão e a pizza. Nessa reexecução parcial, `execucao` é a da
+# execução completa anterior, já gravada: os blocos dela não entram no perfil.
+@st.fragment
+def _fluxo(estado, execucao, figuras, tema):
+    st.subheader("Fluxo de Caixa (Evolução)")
+    janelas = {"6 meses": 6, "12 meses": 12, "24 meses": 24, "Tudo": None}
+    janela = st.radio("Janela", list(janelas), index=1, horizontal=True, label_visibility="collapsed")
+    with execucao.bloco("dashboard.fluxo"):
+        df_fluxo = estado.fluxo.serie(ultimos=janelas[janela])
+        fig_line = figuras.obter(
+            f"fluxo:{janela}", estado.agregados.versao, tema,
+            lambda: figura_fluxo(df_fluxo), remendar_fluxo(df_fluxo)
+        )
+    st.plotly_chart(fig_line, use_container_width=True)
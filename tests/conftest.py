@@ -0,0 +1,30 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+DESCRICOES = ["Supermercado", "Uber", "Netflix", "Salário", "MAGAZINE LUIZA 01/03"]
+CATEGORIAS = ["Alimentação", "Transporte", "Lazer", "Receita", "Casa"]
+CONTAS = ["Nubank", "Itaú", "XP"]
+
+
+def gerar_lote(n, semente=0, inicio="2026-01-01", dias=90):
+    # Lote aleatório com o esquema do extrato, em qualquer ordem de data.
+    rng = np.random.default_rng(semente)
+    return {
+        "Data": pd.Timestamp(inicio) + pd.to_timedelta(rng.integers(0, dias * 24, n), unit="h"),
+        "Descrição": np.array(DESCRICOES, dtype=object)[rng.integers(0, len(DESCRICOES), n)],
+        "Categoria": np.array(CATEGORIAS, dtype=object)[rng.integers(0, len(CATEGORIAS), n)],
+        "Valor": rng.normal(-50, 120, n).round(2),
+        "Conta": np.array(CONTAS, dtype=object)[rng.integers(0, len(CONTAS), n)],
+        "Status": np.full(n, "Pago", dtype=object),
+    }
+
+
+@pytest.fixture
+def lote():
+    return gerar_lote
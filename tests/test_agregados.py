@@ -0,0 +1,121 @@
+import pytest
+
+from castelo.agregados import Agregados
+from castelo.armazenamento import Armazenamento
+from castelo.fluxo import FonteLedger
+from castelo.indices import IndicesExtrato
+from castelo.ledger import TRANSFERENCIA, Ledger
+from castelo.orcamentos import Orcamentos
+
+OBJETIVO = {"nome": "Viagem", "alvo": 5000.0, "atual": 0.0, "cor": "#D4AF37"}
+
+
+def _somas(df, por):
+    return {chave: round(total, 2) for chave, total in df.groupby(por, observed=True)["Valor"].sum().items()}
+
+
+def test_incremental_confere_com_forca_bruta(lote):
+    # Lotes e inclusões unitárias, fora de ordem de data, contra um groupby do extrato inteiro.
+    ledger = Ledger()
+    agg = Agregados(ledger)
+    ledger.extend(lote(400, semente=5))
+    for i in range(30):
+        ledger.append("2026-02-10", "Uber", "Transporte", -12.34 - i, conta="XP")
+    ledger.extend(lote(250, semente=6, inicio="2025-11-20", dias=60))
+    ledger.append("2026-01-05", "Salário", "Receita", 8000.0, conta="Itaú", status="Recebido")
+
+    df = ledger.to_frame()
+    df["mes"] = df["Data"].dt.strftime("%Y-%m")
+    saidas = df[df["Valor"] < 0].assign(Valor=lambda d: -d["Valor"])
+    saidas["mes_categoria"] = saidas["mes"] + "|" + saidas["Categoria"].astype(str)
+    assert agg.receitas() == pytest.approx(df.loc[df["Valor"] > 0, "Valor"].sum())
+    assert agg.despesas() == pytest.approx(saidas["Valor"].sum())
+    assert agg.saldo() == pytest.approx(df["Valor"].sum())
+    assert agg.receitas_mes == pytest.approx(_somas(df[df["Valor"] > 0], "mes"))
+    assert agg.despesas_mes == pytest.approx(_somas(saidas, "mes"))
+    assert agg.despesas_categoria == pytest.approx(_somas(saidas, "Categoria"))
+    assert agg.despesas_mes_categoria == pytest.approx(_somas(saidas, "mes_categoria"))
+    assert agg.saldo_conta == pytest.approx(_somas(df, "Conta"))
+    assert agg.total_status == pytest.approx(_somas(df, "Status"))
+    assert agg.gastos_por_categoria("2026-02") == pytest.approx(_somas(saidas[saidas["mes"] == "2026-02"], "Categoria"))
+    assert agg.conferir(ledger) == []
+
+
+def test_conferir_aponta_divergencias(lote):
+    ledger = Ledger()
+    agg = Agregados(ledger)
+    ledger.extend(lote(100))
+    agg._despesas_categoria["Lazer"] += 1
+    agg._receitas -= 5
+    divergencias = agg.conferir(ledger)
+    assert {(nome, chave) for nome, chave, _, _ in divergencias} == {("despesas_categoria", "Lazer"), ("receitas", None)}
+    _, _, atual, esperado = next(d for d in divergencias if d[0] == "receitas")
+    assert atual == esperado - 5
+
+
+def _movimentar(ledger, lote, status=TRANSFERENCIA):
+    # Extrato comum com aportes e um resgate do objetivo no meio.
+    ledger.extend(lote(300, semente=3))
+    ledger.append("2026-02-15", "Aporte: Viagem", "Viagem", -700.0, conta="Itaú", status=status)
+    ledger.append("2026-02-20", "Aporte: Viagem", "Viagem", -300.0, conta="Itaú", status=status)
+    ledger.extend(lote(100, semente=4))
+    ledger.append("2026-03-01", "Resgate: Viagem", "Viagem", 250.0, conta="Itaú", status=status)
+
+
+def test_aportes_ficam_fora_de_receitas_e_despesas(lote):
+    ledger = Ledger()
+    agg = Agregados(ledger)
+    orcamentos = Orcamentos({"Viagem": 100.0})
+    orcamentos.acompanhar(ledger)
+    _movimentar(ledger, lote)
+
+    df = ledger.to_frame()
+    contabil = df[df["Status"] != TRANSFERENCIA]
+    assert agg.receitas() == pytest.approx(contabil.loc[contabil["Valor"] > 0, "Valor"].sum())
+    assert agg.despesas() == pytest.approx(-contabil.loc[contabil["Valor"] < 0, "Valor"].sum())
+    assert agg.saldo() == pytest.approx(df["Valor"].sum())
+    assert agg.saldo_conta["Itaú"] == pytest.approx(df.loc[df["Conta"] == "Itaú", "Valor"].sum())
+    assert "Viagem" not in agg.despesas_categoria
+    assert "Viagem" not in orcamentos.gastos("2026-02")
+    assert orcamentos.eventos == []
+    assert agg.conferir(ledger) == []
+
+
+def test_sqlite_e_ledger_concordam_sem_transferencias(tmp_path, lote):
+    arm = Armazenamento(str(tmp_path / "castelo.db"))
+    ledger = Ledger()
+    agg = Agregados(ledger)
+    arm.acompanhar(ledger)
+    _movimentar(ledger, lote)
+
+    assert arm.carregar_agregados().conferir(ledger) == []
+    assert arm.gastos_categoria("2026-02") == pytest.approx(agg.gastos_por_categoria("2026-02"))
+    assert "Viagem" not in arm.gastos_categoria("2026-02")
+    sqlite, memoria = arm.fluxo_mensal(), FonteLedger(ledger, IndicesExtrato(ledger)).fluxo_mensal()
+    assert sqlite.keys() == memoria.keys()
+    for mes in sqlite:
+        assert sqlite[mes] == pytest.approx(memoria[mes])
+    arm.fechar()
+
+
+def test_migracao_marca_aportes_antigos(tmp_path, lote):
+    # Banco da versão 2: aportes gravados como "Pago" contavam como despesa.
+    caminho = str(tmp_path / "castelo.db")
+    arm = Armazenamento(caminho)
+    arm.salvar_goal(OBJETIVO)
+    ledger = Ledger()
+    arm.acompanhar(ledger)
+    _movimentar(ledger, lote, status="Pago")
+    ledger.append("2026-02-18", "Hotel", "Viagem", -900.0, conta="Itaú")
+    arm.conn.execute("PRAGMA user_version = 2")
+    arm.conn.commit()
+    arm.fechar()
+
+    arm = Armazenamento(caminho)
+    assert arm.conn.execute(
+        "SELECT COUNT(*) FROM transactions WHERE categoria = ? AND status = ?", ("Viagem", TRANSFERENCIA)
+    ).fetchone()[0] == 3
+    agg = arm.carregar_agregados()
+    assert agg.despesas_categoria["Viagem"] == pytest.approx(900.0)
+    assert agg.conferir(arm.carregar_ledger()) == []
+    arm.fechar()
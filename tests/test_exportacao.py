@@ -0,0 +1,46 @@
+import hashlib
+import pandas as pd
+import pytest
+
+from castelo.armazenamento import Armazenamento
+from castelo.exportacao import exportar_cliente
+from castelo.ledger import Ledger
+
+
+def _conteudo(caminho):
+    # O leitor em WAL pode deixar -wal/-shm vazios ao lado; o banco em si não muda.
+    with open(caminho, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@pytest.fixture
+def banco(tmp_path, lote):
+    pasta = tmp_path / "clientes"
+    pasta.mkdir()
+    caminho = str(pasta / "castelo-a.db")
+    arm = Armazenamento(caminho)
+    ledger = Ledger()
+    arm.acompanhar(ledger)
+    ledger.extend(lote(200, semente=1))
+    arm.fechar()
+    return caminho
+
+
+def test_exportacao_nao_altera_o_banco(tmp_path, banco):
+    antes = _conteudo(banco)
+    r = exportar_cliente(banco, str(tmp_path / "saida"), todos=True, formatos=("csv",))
+    assert r["linhas"] == 200 and r["erro"] is None
+    csvs = (tmp_path / "saida" / "castelo-a").glob("extrato-*.csv")
+    assert sum(len(pd.read_csv(c, sep=";")) for c in csvs) == 200
+    assert _conteudo(banco) == antes
+
+
+def test_banco_antigo_e_recusado_sem_migrar(tmp_path, banco):
+    arm = Armazenamento(banco)
+    arm.conn.execute("PRAGMA user_version = 2")
+    arm.conn.commit()
+    arm.fechar()
+    antes = _conteudo(banco)
+    with pytest.raises(ValueError, match="versão 2"):
+        exportar_cliente(banco, str(tmp_path / "saida"), formatos=("csv",))
+    assert _conteudo(banco) == antes
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from castelo.faturas import Faturas, dividir_parcelas
+from castelo.ledger import Ledger
+
+CARD = {"nome": "Nubank", "limite": 10000.0, "fechamento": 25, "vencimento": 5, "fatura_atual": 0.0}
+
+
+def _compras(semente, n_compras=40):
+    # Compras parceladas explícitas (inclusive iguais no mesmo ciclo) e as parcelas
+    # que já chegaram (1..recebidas), mais compras avulsas; dia 10 cai no ciclo do mês.
+    rng = np.random.default_rng(semente)
+    compras, linhas = [], []
+    for i in range(n_compras):
+        inicio = np.datetime64("2025-01", "M") + int(rng.integers(0, 12))
+        base, total = ["LOJA A", "LOJA B"][i % 2], int(rng.choice([3, 6, 10]))
+        valor = float(rng.choice([100.0, 250.5]))
+        recebidas = int(rng.integers(1, total + 1))
+        compras.append((inicio, total, valor, recebidas))
+        for k in range(1, recebidas + 1):
+            data = (inicio + (k - 1)).astype("datetime64[D]") + 9
+            linhas.append((data, f"{base} {k:02d}/{total:02d}", -valor))
+    for _ in range(200):
+        data = np.datetime64("2025-01-01") + int(rng.integers(0, 540))
+        linhas.append((data, "Supermercado", -round(float(rng.uniform(5, 300)), 2)))
+    return compras, linhas
+
+
+def _esperado(compras, linhas):
+    # Força bruta: valores reais por ciclo mais as parcelas ainda não chegadas.
+    totais = {}
+    for data, _, valor in linhas:
+        dia = int(str(data)[8:10])
+        ciclo = np.datetime64(str(data)[:7], "M") + (1 if dia >= CARD["fechamento"] else 0)
+        totais[ciclo] = totais.get(ciclo, 0.0) - valor
+    for inicio, total, valor, recebidas in compras:
+        for j in range(recebidas + 1, total + 1):
+            ciclo = inicio + (j - 1)
+            totais[ciclo] = totais.get(ciclo, 0.0) + valor
+    return totais
+
+
+def _frame(linhas):
+    return pd.DataFrame({
+        "Data": pd.to_datetime([str(d) for d, _, _ in linhas]),
+        "Descrição": [d for _, d, _ in linhas], "Categoria": "Compras",
+        "Valor": [v for _, _, v in linhas], "Conta": CARD["nome"], "Status": "Pago",
+    })
+
+
+@pytest.mark.parametrize("semente", [0, 1, 2])
+@pytest.mark.parametrize("ordem", ["data", "aleatoria"])
+def test_totais_por_ciclo_conferem_com_forca_bruta(semente, ordem):
+    compras, linhas = _compras(semente)
+    df = _frame(linhas)
+    df = df.sort_values("Data", kind="stable") if ordem == "data" else df.sample(frac=1, random_state=semente)
+    ledger = Ledger()
+    faturas = Faturas([CARD], ledger)
+    for parte in np.array_split(np.arange(len(df)), 7):
+        ledger.extend(df.iloc[parte])
+    for ciclo, total in _esperado(compras, linhas).items():
+        assert faturas.total(CARD["nome"], ciclo) == pytest.approx(total, abs=1e-6), str(ciclo)
+
+
+def test_compras_iguais_no_mesmo_ciclo_somam_as_duas():
+    ledger = Ledger()
+    faturas = Faturas([CARD], ledger)
+    for _ in range(2):
+        ledger.append("2026-01-10", "LOJA X 01/10", "Casa", -100.0, CARD["nome"])
+    assert faturas.total(CARD["nome"], "2026-02") == pytest.approx(200.0)
+    ledger.append("2026-02-10", "LOJA X 02/10", "Casa", -100.0, CARD["nome"])
+    # Uma das compras pagou a 2ª parcela; a outra continua projetada.
+    assert faturas.total(CARD["nome"], "2026-02") == pytest.approx(200.0)
+    assert faturas.total(CARD["nome"], "2026-10") == pytest.approx(200.0)
+    resumo = faturas.resumo(CARD["nome"], hoje="2026-01-12")
+    assert resumo["futuras"] == pytest.approx(2 * 9 * 100.0)
+
+
+@pytest.mark.parametrize("migrado", [False, True])
+def test_partida_a_frio_confere_com_ledger(tmp_path, migrado):
+    # Totais por dia + linhas parceladas do SQLite dão as mesmas faturas que o extrato inteiro.
+    from castelo.armazenamento import Armazenamento
+
+    compras, linhas = _compras(5)
+    df = _frame(linhas)
+    caminho = str(tmp_path / "castelo.db")
+    arm = Armazenamento(caminho)
+    for parte in np.array_split(np.arange(len(df)), 3):
+        arm.inserir(df.iloc[parte])
+    arm.inserir({"Data": [pd.Timestamp("2025-03-10")], "Descrição": ["Pix"], "Categoria": ["Outros"],
+                 "Valor": [50.0], "Conta": ["Itaú"], "Status": ["Recebido"]})
+    if migrado:
+        # Banco da versão 1: sem `totais_dia`; reaberto, a tabela é refeita.
+        arm.conn.execute("DELETE FROM totais_dia")
+        arm.conn.execute("PRAGMA user_version = 1")
+        arm.conn.commit()
+        arm.fechar()
+        arm = Armazenamento(caminho)
+
+    fria = Faturas([CARD])
+    fria.carregar_resumo(CARD["nome"], *arm.totais_dia(CARD["nome"]), arm.parceladas(CARD["nome"]))
+    completa = Faturas([CARD], arm.carregar_ledger())
+    arm.fechar()
+    for ciclo, total in _esperado(compras, linhas).items():
+        assert fria.total(CARD["nome"], ciclo) == pytest.approx(total, abs=1e-6)
+        assert fria.total(CARD["nome"], ciclo) == pytest.approx(completa.total(CARD["nome"], ciclo), abs=1e-6)
+    a, b = fria.resumo(CARD["nome"], "2025-06-01"), completa.resumo(CARD["nome"], "2025-06-01")
+    for campo in ("aberta", "fechada", "futuras", "comprometido"):
+        assert a[campo] == pytest.approx(b[campo], abs=1e-6)
+    assert (a["ciclo"], a["vencimento"]) == (b["ciclo"], b["vencimento"])
+
+
+@pytest.mark.parametrize("valor,n", [(-1000.0, 3), (1000.0, 3), (-0.05, 3), (-99.99, 12), (-1234.56, 7), (-10.0, 2)])
+def test_parcelas_somam_o_total_no_centavo(valor, n):
+    parcelas = dividir_parcelas(valor, n)
+    assert len(parcelas) == n
+    assert round(sum(parcelas) * 100) == round(valor * 100)
+    assert all(round(p * 100) == round(parcelas[1] * 100) for p in parcelas[1:])
+    assert abs(round((parcelas[0] - parcelas[-1]) * 100)) < n
+    if valor == -1000.0:
+        assert parcelas == [-333.34, -333.33, -333.33]
@@ -0,0 +1,44 @@
+from collections import Counter
+
+import numpy as np
+
+from castelo.importador import IndiceHashes, Importador
+from castelo.ledger import Ledger
+
+
+def _linhas(colunas):
+    return Counter(zip(np.asarray(colunas["Data"], dtype="datetime64[ns]").tolist(), list(colunas["Descrição"]),
+                       np.round(np.asarray(colunas["Valor"], dtype=float), 2).tolist(), list(colunas["Conta"])))
+
+
+def _fatia(lote, posicoes):
+    return {c: np.asarray(v)[posicoes] for c, v in lote.items()}
+
+
+def test_importacao_deduplica_contra_o_extrato(lote):
+    ledger = Ledger()
+    ledger.extend(lote(300, semente=1))
+    indice = IndiceHashes(ledger)
+    # Inclusões manuais depois do índice criado também contam.
+    for _ in range(2):
+        ledger.append("2026-02-10 08:00", "Uber", "Transporte", -23.5, conta="Nubank")
+
+    antes = _linhas({c: ledger.column(c) for c in ("Data", "Descrição", "Valor", "Conta")})
+    extrato = {c: ledger.column(c) for c in ("Data", "Descrição", "Categoria", "Valor", "Conta", "Status")}
+    novos = lote(50, semente=2)
+    arquivo = [
+        _fatia(extrato, np.r_[0:40, 0:5, len(ledger) - 2:len(ledger), len(ledger) - 1]),
+        _fatia(novos, np.r_[0:50, 0:10]),
+    ]
+    no_arquivo = sum((_linhas(parte) for parte in arquivo), Counter())
+
+    stats = Importador(ledger, indice).importar(arquivo)
+
+    esperado = sum(max(0, k - antes[linha]) for linha, k in no_arquivo.items())
+    assert stats["inseridas"] == esperado
+    assert stats["duplicadas"] == sum(no_arquivo.values()) - esperado
+    depois = _linhas({c: ledger.column(c) for c in ("Data", "Descrição", "Valor", "Conta")})
+    assert depois == antes | no_arquivo
+    # Reimportar o mesmo arquivo não muda nada.
+    assert Importador(ledger, indice).importar(arquivo)["inseridas"] == 0
+    assert len(indice) == len(depois)
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from castelo.indices import LIMITE_FORA, IndicesExtrato
+from castelo.ledger import Ledger
+
+
+def _esperado(df, inicio=None, fim=None, conta=None, categoria=None):
+    # Força bruta: máscara sobre o extrato inteiro, mais recentes primeiro.
+    m = np.ones(len(df), dtype=bool)
+    if inicio is not None:
+        m &= df["Data"] >= inicio
+    if fim is not None:
+        m &= df["Data"] < fim
+    if conta is not None:
+        m &= df["Conta"] == conta
+    if categoria is not None:
+        m &= df["Categoria"] == categoria
+    sel = df[m].sort_values("Data", kind="stable")
+    return sel.index.to_numpy()[::-1]
+
+
+@pytest.fixture
+def extrato(lote):
+    # Lote inicial, inclusões unitárias e um lote fora de ordem de data.
+    ledger = Ledger()
+    indices = IndicesExtrato(ledger)
+    ledger.extend(lote(500, semente=1))
+    for i in range(50):
+        ledger.append(pd.Timestamp("2026-04-01") + pd.Timedelta(hours=i), "Uber", "Transporte", -20.0, "Nubank")
+    ledger.extend(lote(200, semente=2, inicio="2025-12-15", dias=30))
+    ledger.append("2026-01-10", "Netflix", "Lazer", -55.9, "Itaú")
+    return ledger, indices
+
+
+FILTROS = [
+    {},
+    {"conta": "Nubank"},
+    {"categoria": "Lazer"},
+    {"conta": "Itaú", "categoria": "Receita"},
+    {"inicio": pd.Timestamp("2026-01-15"), "fim": pd.Timestamp("2026-02-01")},
+    {"inicio": pd.Timestamp("2026-02-01"), "conta": "XP", "categoria": "Alimentação"},
+]
+
+
+@pytest.mark.parametrize("filtros", FILTROS)
+def test_filtrar_confere_com_forca_bruta(extrato, filtros):
+    ledger, indices = extrato
+    df = ledger.to_frame().astype({"Conta": object, "Categoria": object})
+    pos = indices.filtrar(**filtros)
+    esperado = _esperado(df, **filtros)
+    assert sorted(pos.tolist()) == sorted(esperado.tolist())
+    datas = ledger.column("Data")[pos]
+    assert (np.diff(datas.astype(np.int64)) <= 0).all()
+
+
+@pytest.mark.parametrize("filtros", [
+    {"conta": "Inexistente"},
+    {"categoria": "Moradia"},
+    {"conta": "Nubank", "categoria": "Moradia"},
+    {"inicio": pd.Timestamp("2030-01-01")},
+    {"inicio": pd.Timestamp("2026-02-01"), "fim": pd.Timestamp("2026-02-01")},
+])
+def test_filtrar_sem_resultado(extrato, filtros):
+    _, indices = extrato
+    pos = indices.filtrar(**filtros)
+    assert pos.dtype == np.int64
+    assert len(pos) == 0
+
+
+def test_periodo_e_listas(extrato):
+    ledger, indices = extrato
+    datas = ledger.column("Data")
+    assert indices.periodo() == (datas.min(), datas.max())
+    assert indices.contas() == sorted(set(ledger.column("Conta")))
+    assert indices.categorias() == sorted(set(ledger.column("Categoria")))
+
+
+def test_inclusoes_atrasadas_alem_do_limite(lote):
+    # Mais atrasadas que LIMITE_FORA, intercaladas com leituras e inclusões em ordem.
+    ledger = Ledger()
+    indices = IndicesExtrato(ledger)
+    ledger.extend(lote(1000, semente=3))
+    rng = np.random.default_rng(4)
+    for i in range(LIMITE_FORA + 100):
+        data = pd.Timestamp("2026-01-01") + pd.Timedelta(hours=int(rng.integers(0, 90 * 24)))
+        ledger.append(data, "Uber", "Transporte", -10.0, "Nubank")
+        if i % 97 == 0:
+            indices.filtrar(conta="Nubank")
+        if i % 50 == 0:
+            ledger.append(pd.Timestamp("2027-01-01") + pd.Timedelta(hours=i), "Netflix", "Lazer", -55.9, "Itaú")
+    df = ledger.to_frame().astype({"Conta": object, "Categoria": object})
+    for filtros in FILTROS:
+        assert sorted(indices.filtrar(**filtros).tolist()) == sorted(_esperado(df, **filtros).tolist())
+
+
+def test_leituras_nao_intercalam_a_lista_lateral(extrato):
+    # Um lançamento atrasado não pode custar O(n) na próxima leitura.
+    ledger, indices = extrato
+    ledger.append("2025-11-01", "Padaria", "Alimentação", -9.5, "XP")
+    principal, fora = len(indices._datas), len(indices._fora_datas)
+    assert 0 < fora <= LIMITE_FORA
+    datas = ledger.column("Data")
+    assert indices.periodo() == (datas.min(), datas.max())
+    df = ledger.to_frame().astype({"Conta": object, "Categoria": object})
+    for filtros in FILTROS + [{"fim": pd.Timestamp("2025-12-01")}]:
+        pos = indices.filtrar(**filtros)
+        assert sorted(pos.tolist()) == sorted(_esperado(df, **filtros).tolist())
+        assert (np.diff(ledger.column("Data")[pos].astype(np.int64)) <= 0).all()
+    assert (len(indices._datas), len(indices._fora_datas)) == (principal, fora)
@@ -0,0 +1,38 @@
+import pytest
+
+from castelo.oraculo import FakeBackend, Oraculo
+
+
+class _Falha:
+    def stream(self, prompt):
+        raise RuntimeError("sem rede")
+        yield
+
+
+def _oraculo(backend, **kwargs):
+    origens = []
+    oraculo = Oraculo(backend, **kwargs)
+    return oraculo, origens, lambda segundos, origem: origens.append(origem)
+
+
+def test_stream_interrompido_registra_latencia():
+    oraculo, origens, medir = _oraculo(FakeBackend())
+    g = oraculo.consultar("comprar um sofá?", medir=medir)
+    next(g)
+    g.close()
+    assert oraculo.metricas["consultas"] == 1
+    assert origens == ["interrompida"]
+    assert oraculo.latencia_p50() is not None
+
+
+def test_toda_consulta_deixa_uma_latencia():
+    oraculo, origens, medir = _oraculo(FakeBackend(atraso=0.05), timeout=0.02)
+    assert "Veredito local" in "".join(oraculo.consultar("a", fallback=lambda: "ok", medir=medir))
+    oraculo.backend = FakeBackend()
+    "".join(oraculo.consultar("b", medir=medir))
+    "".join(oraculo.consultar("b", medir=medir))
+    oraculo.backend = _Falha()
+    with pytest.raises(RuntimeError):
+        "".join(oraculo.consultar("c", medir=medir))
+    assert origens == ["timeout", "modelo", "cache", "erro"]
+    assert len(oraculo.latencias) == oraculo.metricas["consultas"] == 4
@@ -0,0 +1,95 @@
+import pytest
+
+from castelo import orcamentos as modulo
+from castelo.agregados import Agregados
+from castelo.ledger import Ledger
+from castelo.orcamentos import LOTE_PEQUENO, Orcamentos
+
+TETOS = {"Alimentação": 900.0, "Transporte": 1500.0, "Lazer": 400.0, "Casa": 5000.0, "Viagem": 500.0}
+
+
+def _esperado(ledger, tetos, limiares=(0.8, 1.0)):
+    # Força bruta: gasto final de cada (mês, categoria) contra cada limiar.
+    df = ledger.to_frame()
+    saidas = df[df["Valor"] < 0]
+    gastos = (-saidas["Valor"]).groupby([saidas["Data"].dt.strftime("%Y-%m"), saidas["Categoria"].astype(str)]).sum()
+    return {
+        (mes, categoria, limiar)
+        for (mes, categoria), gasto in gastos.items() if categoria in tetos
+        for limiar in limiares if round(gasto, 2) >= limiar * tetos[categoria]
+    }, gastos
+
+
+def _alimentar(ledger, lote):
+    # Inclusões unitárias (laço curto), um lote grande (groupby) e outro fora de ordem.
+    for i in range(40):
+        ledger.append(f"2026-01-{1 + i % 28:02d}", "Cinema", "Lazer", -15.0, conta="Nubank")
+    ledger.extend(lote(LOTE_PEQUENO * 3, semente=7))
+    ledger.extend(lote(120, semente=8, inicio="2025-12-01", dias=45))
+    ledger.append("2026-02-27", "Hotel", "Viagem", -499.99, conta="Itaú")
+
+
+def test_cada_limiar_dispara_uma_vez_por_mes(lote):
+    ledger = Ledger()
+    disparados = []
+    orcamentos = Orcamentos(TETOS, ao_disparar=disparados.append)
+    orcamentos.acompanhar(ledger)
+    _alimentar(ledger, lote)
+
+    esperado, gastos = _esperado(ledger, TETOS)
+    chaves = [(e["mes"], e["categoria"], e["limiar"]) for e in orcamentos.eventos]
+    assert len(chaves) == len(set(chaves))
+    assert set(chaves) == esperado
+    assert orcamentos.eventos == disparados
+    for (mes, categoria), gasto in gastos.items():
+        assert orcamentos.gastos(mes)[categoria] == pytest.approx(gasto)
+
+    # Viagem fica a 1 centavo do teto; mais 1 centavo dispara o 100% uma vez só.
+    assert ("2026-02", "Viagem", 1.0) not in esperado
+    ledger.append("2026-02-28", "Taxa", "Viagem", -0.01, conta="Itaú")
+    ledger.append("2026-02-28", "Passeio", "Viagem", -80.0, conta="Itaú")
+    novos = orcamentos.eventos_desde(len(chaves))
+    assert [(e["mes"], e["categoria"], e["limiar"]) for e in novos] == [("2026-02", "Viagem", 1.0)]
+
+
+def test_estado_recriado_nao_repete_alertas(lote):
+    # Novo estado: gastos vêm dos agregados e os disparados do armazenamento.
+    ledger = Ledger()
+    agg = Agregados(ledger)
+    gravados = []
+    Orcamentos(TETOS, ao_disparar=gravados.append).acompanhar(ledger)
+    _alimentar(ledger, lote)
+
+    novos = []
+    orcamentos = Orcamentos(TETOS, agregados=agg, disparados=gravados, ao_disparar=novos.append)
+    for mes in orcamentos.meses():
+        orcamentos.verificar(mes)
+    assert novos == []
+    assert {(e["mes"], e["categoria"], e["limiar"]) for e in orcamentos.eventos} == _esperado(ledger, TETOS)[0]
+
+
+def test_teto_alterado_so_confere_o_mes_atual(lote, monkeypatch):
+    monkeypatch.setattr(modulo, "mes_atual", lambda hoje=None: "2026-02")
+    ledger = Ledger()
+    orcamentos = Orcamentos(TETOS)
+    orcamentos.acompanhar(ledger)
+    _alimentar(ledger, lote)
+    antes = {(e["mes"], e["categoria"], e["limiar"]) for e in orcamentos.eventos}
+
+    # Teto maior: nada dispara, e o alerta de Lazer some da tela.
+    orcamentos.definir("Lazer", 10_000.0)
+    assert len(orcamentos.eventos) == len(antes)
+    assert all(e["categoria"] != "Lazer" for e in orcamentos.alertas("2026-01"))
+
+    # Teto menor (padrão ou a partir de um mês passado): só o mês atual dispara,
+    # e só os limiares que faltavam; janeiro, já fechado, e março ficam como estavam.
+    orcamentos.definir("Casa", 1.0)
+    orcamentos.definir("Casa", 1.0, mes="2026-01")
+    esperado = {("2026-02", "Casa", limiar) for limiar in (0.8, 1.0)} - antes
+    novos = orcamentos.eventos_desde(len(antes))
+    assert esperado and {(e["mes"], e["categoria"], e["limiar"]) for e in novos} == esperado
+    assert len(novos) == len(esperado)
+
+    # Teto que só vale a partir de um mês futuro não confere nada agora.
+    orcamentos.definir("Transporte", 1.0, mes="2026-03")
+    assert len(orcamentos.eventos) == len(antes) + len(esperado)
@@ -0,0 +1,47 @@
+import threading
+import time
+
+from castelo.ledger import Ledger
+from castelo.recorrencias import Previsoes
+
+
+def test_obter_nao_espera_o_calculo(lote):
+    liberar = threading.Event()
+    extrato = Ledger.from_frame(lote(200)).to_frame()
+
+    def janela(dias):
+        liberar.wait()
+        return extrato
+
+    previsoes = Previsoes(janela, lambda: 0.0)
+    t0 = time.perf_counter()
+    assert previsoes.obter() is None
+    assert time.perf_counter() - t0 < 0.1
+    liberar.set()
+    assert previsoes.aguardar(5)
+    assert previsoes.obter() is not None
+
+
+def test_falha_so_tenta_de_novo_com_dados_novos(lote):
+    tentativas = []
+
+    def janela(dias):
+        tentativas.append(dias)
+        raise RuntimeError("banco indisponível")
+
+    ledger = Ledger()
+    previsoes = Previsoes(janela, lambda: 0.0)
+    previsoes.acompanhar(ledger)
+    previsoes.obter()
+    assert previsoes.aguardar(5)
+    for _ in range(5):
+        assert previsoes.obter() is None
+        assert previsoes.aguardar(5)
+    assert len(tentativas) == 1
+    assert isinstance(previsoes.erro, RuntimeError)
+
+    ledger.extend(lote(10))
+    assert previsoes.aguardar(5)
+    previsoes.obter()
+    assert previsoes.aguardar(5)
+    assert len(tentativas) == 2
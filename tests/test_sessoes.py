@@ -0,0 +1,165 @@
+import sqlite3
+import types
+
+import pandas as pd
+import pytest
+
+from castelo import sessoes
+from castelo.armazenamento import Armazenamento
+from castelo.extrato import PaginasExtrato
+from castelo.ledger import TRANSFERENCIA
+from castelo.sessoes import EstadoUsuario, RegistroUsuarios
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    # Relógio manual no lugar do time.monotonic do módulo.
+    agora = [0.0]
+    monkeypatch.setattr(sessoes, "time", types.SimpleNamespace(monotonic=lambda: agora[0]))
+    return agora
+
+
+def _registro(**kwargs):
+    criados = []
+
+    def criar(usuario):
+        estado = types.SimpleNamespace(usuario=usuario, ultimo_acesso=0.0, fechado=False)
+        estado.fechar = lambda: setattr(estado, "fechado", True)
+        criados.append(estado)
+        return estado
+
+    return RegistroUsuarios(criar, **kwargs), criados
+
+
+def test_registro_despeja_ociosos(relogio):
+    registro, criados = _registro(ocioso=60)
+    a = registro.obter("a")
+    relogio[0] = 30
+    b = registro.obter("b")
+    relogio[0] = 60
+    registro.despejar_ociosos()
+    assert len(registro) == 2
+    relogio[0] = 70
+    registro.despejar_ociosos()
+    assert len(registro) == 1
+    assert registro.obter("b") is b
+    novo = registro.obter("a")
+    assert novo is not a and len(criados) == 3
+    assert a.fechado and not b.fechado and not novo.fechado
+    assert registro.metricas == {"criados": 3, "despejados": 1}
+
+
+def test_registro_despeja_o_menos_recente_no_maximo(relogio):
+    registro, criados = _registro(maximo=2)
+    a = registro.obter("a")
+    relogio[0] = 1
+    registro.obter("b")
+    relogio[0] = 2
+    registro.obter("a")
+    relogio[0] = 3
+    registro.obter("c")
+    assert len(registro) == 2
+    assert registro.obter("a") is a
+    assert registro.metricas["despejados"] == 1
+    assert [e.usuario for e in criados if e.fechado] == ["b"]
+    relogio[0] = 4
+    registro.obter("b")
+    assert registro.metricas == {"criados": 4, "despejados": 2}
+
+
+def test_estado_que_perde_a_corrida_e_fechado(relogio):
+    # Duas sessões abrindo o mesmo cliente: a segunda termina primeiro (chamada
+    # aninhada), e o estado da primeira, que chega depois, é descartado e fechado.
+    registro, criados = _registro()
+    criar = registro.criar
+
+    def criar_em_paralelo(usuario):
+        estado = criar(usuario)
+        if len(criados) == 1:
+            registro.obter(usuario)
+        return estado
+
+    registro.criar = criar_em_paralelo
+    estado = registro.obter("a")
+    assert estado is criados[1]
+    assert criados[0].fechado and not estado.fechado
+    assert registro.metricas == {"criados": 1, "despejados": 0}
+
+
+def test_estado_despejado_fecha_previsao_e_banco(tmp_path):
+    def criar(usuario):
+        return EstadoUsuario(usuario, Armazenamento(str(tmp_path / f"{usuario}.db")))
+
+    registro = RegistroUsuarios(criar, maximo=1)
+    antigo = registro.obter("a")
+    registro.obter("b")
+    assert antigo.previsoes.aguardar(0)
+    with pytest.raises(sqlite3.ProgrammingError):
+        antigo.armazenamento.total_transacoes()
+    antigo.previsoes.agendar()
+    assert antigo.previsoes.aguardar(0)
+    registro.obter("b").previsoes.aguardar(5)
+
+
+def test_estado_recriado_nao_serve_pagina_antiga(tmp_path, lote):
+    # Depois do despejo, o estado relido do SQLite não pode repetir versões
+    # do anterior: os caches da sessão (páginas, figuras) seriam servidos velhos.
+    def criar(usuario):
+        return EstadoUsuario(usuario, Armazenamento(str(tmp_path / f"{usuario}.db")))
+
+    registro = RegistroUsuarios(criar, maximo=1)
+    paginas = PaginasExtrato()
+    filtros = ("Todas",)
+
+    antigo = registro.obter("a")
+    ledger = antigo.ledger()
+    ledger.extend(lote(30, semente=1))
+    assert paginas.pagina(ledger, antigo.indices.filtrar(), filtros, 1, 50)["linhas"] == 30
+    ledger.extend(lote(5, semente=2))
+    versoes = {ledger.versao, antigo.agregados.versao, antigo.faturas.versao, antigo.orcamentos.versao}
+    antigo.previsoes.aguardar()
+
+    registro.obter("b").previsoes.aguardar()
+    novo = registro.obter("a")
+    assert novo is not antigo
+    ledger = novo.ledger()
+    assert paginas.pagina(ledger, novo.indices.filtrar(), filtros, 1, 50)["linhas"] == 35
+    assert min(ledger.versao, novo.agregados.versao, novo.faturas.versao, novo.orcamentos.versao) > max(versoes)
+    assert novo.previsoes.aguardar(5) and novo.previsoes.erro is None
+
+
+@pytest.fixture
+def estado(tmp_path):
+    arm = Armazenamento(str(tmp_path / "castelo.db"))
+    arm.salvar_budget("Moradia", 2000.0)
+    arm.inserir({"Data": [pd.Timestamp("2026-01-10")], "Descrição": ["Cinema"], "Categoria": ["Lazer"],
+                 "Valor": [-40.0], "Conta": ["Nubank"], "Status": ["Pago"]})
+    estado = EstadoUsuario("a", arm)
+    yield estado
+    estado.previsoes.aguardar(5)
+    arm.fechar()
+
+
+def _goal(nome):
+    return {"nome": nome, "alvo": 10_000.0, "atual": 0.0, "cor": "#D4AF37"}
+
+
+def test_objetivo_novo_conta_aportes_uma_vez(estado):
+    estado.criar_goal(_goal("  Viagem "))
+    ledger = estado.ledger()
+    ledger.append("2026-02-01", "Aporte: Viagem", "Viagem", -500.0, conta="Manual", status=TRANSFERENCIA)
+    assert [g["nome"] for g in estado.goals] == ["Viagem"]
+    assert estado.aportes.total("Viagem") == pytest.approx(500.0)
+    assert estado.armazenamento.carregar_goals()[0]["nome"] == "Viagem"
+
+
+@pytest.mark.parametrize("nome", ["", "   ", "Viagem", "viagem ", "Lazer", "Moradia", "Receita"])
+def test_objetivo_com_nome_invalido_e_recusado(estado, nome):
+    # Vazio, repetido (mesmo com outra caixa), categoria do extrato, do orçamento ou de receita.
+    estado.criar_goal(_goal("Viagem"))
+    estado.ledger().append("2026-02-01", "Aporte: Viagem", "Viagem", -500.0, conta="Manual", status=TRANSFERENCIA)
+    with pytest.raises(ValueError):
+        estado.criar_goal(_goal(nome))
+    assert [g["nome"] for g in estado.goals] == ["Viagem"]
+    assert [g["nome"] for g in estado.armazenamento.carregar_goals()] == ["Viagem"]
+    assert estado.aportes.total("Viagem") == pytest.approx(500.0)